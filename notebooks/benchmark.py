@@ -0,0 +1,489 @@
+import os
+import io
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import multiprocessing
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+import polars as pl
+
+# Filas del SpotifyFeatures.csv original: escala 1x
+BASE_ROWS = 232_725
+# Cardinalidades aproximadas del dataset original a escala 1x
+BASE_ARTISTS = 14_564
+# Catálogo de tracks / filas: con 1.8 ~76% de track_id son únicos, como en el original
+# (un mismo track aparece en varios géneros)
+TRACK_POOL = 1.8
+
+GENRES = [
+    "Movie", "R&B", "A Capella", "Alternative", "Country", "Dance", "Electronic", "Anime",
+    "Folk", "Blues", "Opera", "Hip-Hop", "Children's Music", "Children’s Music", "Rap",
+    "Indie", "Classical", "Pop", "Reggae", "Reggaeton", "Jazz", "Rock", "Ska", "Comedy",
+    "Soul", "Soundtrack", "World",
+]
+# Casi uniforme salvo los géneros pequeños del original (A Capella, Children's Music)
+GENRE_WEIGHTS = np.array([9.6 if g not in ("A Capella", "Children's Music") else 0.0 for g in GENRES])
+GENRE_WEIGHTS[GENRES.index("A Capella")] = 0.12
+GENRE_WEIGHTS[GENRES.index("Children's Music")] = 5.4
+KEYS = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+KEY_WEIGHTS = np.array([27, 23, 24, 7, 17, 20, 15, 26, 15, 22, 15, 17], dtype=float)
+MODES = ["Major", "Minor"]
+MODE_WEIGHTS = np.array([151, 81], dtype=float)
+TIME_SIGNATURES = ["4/4", "3/4", "5/4", "1/4", "0/4"]
+TIME_SIGNATURE_WEIGHTS = np.array([200_760, 24_111, 5_238, 2_608, 8], dtype=float)
+BASE62 = np.array(list("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"))
+
+PIPELINE_STAGES = ["load_bronze", "transform_silver", "aggregate_gold"]
+PIPELINE_MODES = ["run_pipeline_eager", "run_pipeline_streaming"]
+
+# Arranque en frío: cada punto de entrada (módulo, función) se importa en un intérprete nuevo
+STARTUP_ENTRY_POINTS = {
+    "run_pipeline": ("medallion.pipeline", "run_pipeline"),
+    "show_gold_tables": ("show_table_gold", "show_gold_tables"),
+    "launch_dashboard": ("spotify_dashboard", "launch_dashboard"),
+}
+# Dependencias pesadas cuya carga se reporta por punto de entrada
+STARTUP_HEAVY_MODULES = ["polars", "pyarrow", "numpy", "psutil", "prometheus_client", "kagglehub",
+                         "streamlit", "plotly"]
+STARTUP_REPEAT = 5
+# Script del proceso hijo: mide el import hasta tener la función y lo reporta como JSON
+STARTUP_SCRIPT = """
+import sys, json, time, importlib
+start = time.perf_counter()
+getattr(importlib.import_module(sys.argv[1]), sys.argv[2])
+seconds = time.perf_counter() - start
+modules = len(sys.modules)
+heavy = [m for m in sys.argv[3:] if m in sys.modules]
+import psutil
+print(json.dumps({"import_seconds": seconds, "modules": modules, "heavy_modules": heavy,
+                  "rss_bytes": psutil.Process().memory_info().rss}))
+"""
+
+
+def mix64(x: np.ndarray) -> np.ndarray:
+    """Hash entero (splitmix64) para derivar atributos estables de cada track."""
+    x = x.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def synthetic_chunk(start: int, rows: int, n_tracks: int, n_artists: int, seed: int) -> pl.DataFrame:
+    """
+    Genera un bloque de filas sintéticas con el esquema de SpotifyFeatures.csv.
+
+    El artista, el nombre y el id de cada track se derivan del índice del track
+    con un hash, así que un track repetido en varios géneros conserva sus
+    atributos. La popularidad de los artistas sigue una ley de potencia.
+
+    Args:
+        start (int): Índice de la primera fila del bloque (define la semilla del bloque).
+        rows (int): Número de filas del bloque.
+        n_tracks (int): Número de track_id distintos.
+        n_artists (int): Número de artistas distintos.
+        seed (int): Semilla global.
+
+    Returns:
+        pl.DataFrame: Bloque con las mismas columnas y formatos que el CSV de Kaggle.
+    """
+    rng = np.random.default_rng([seed, start])
+    track = rng.integers(0, n_tracks, rows)
+    h = mix64(track + np.uint64(seed) * np.uint64(1_000_003))
+
+    # Artistas con sesgo: u^2 concentra los tracks en los primeros artistas
+    u = (h >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+    artist = np.minimum((u ** 2 * n_artists).astype(np.int64), n_artists - 1)
+
+    # track_id de 22 caracteres base62, estable por track
+    digits = np.empty((rows, 22), dtype=np.int64)
+    x = h.copy()
+    for i in range(22):
+        if i == 11:
+            x = mix64(h)
+        digits[:, i] = (x % np.uint64(62)).astype(np.int64)
+        x //= np.uint64(62)
+    track_id = BASE62[digits].view("<U22").ravel()
+
+    popularity = np.clip(rng.normal(41, 18, rows), 0, 100).astype(np.int64)
+    instrumentalness = np.where(rng.random(rows) < 0.6, 0.0, rng.beta(0.5, 2, rows))
+
+    return pl.DataFrame({
+        "genre": np.array(GENRES)[rng.choice(len(GENRES), rows, p=GENRE_WEIGHTS / GENRE_WEIGHTS.sum())],
+        "artist_name": "Artist " + pl.Series(artist).cast(pl.String),
+        "track_name": "Track " + pl.Series(track).cast(pl.String),
+        "track_id": track_id,
+        "popularity": popularity,
+        "acousticness": rng.beta(0.5, 0.9, rows),
+        "danceability": rng.beta(5, 4, rows),
+        "duration_ms": np.clip(rng.lognormal(12.3, 0.45, rows), 15_000, 5_500_000).astype(np.int64),
+        "energy": rng.beta(2, 1.5, rows),
+        "instrumentalness": instrumentalness,
+        "key": np.array(KEYS)[rng.choice(len(KEYS), rows, p=KEY_WEIGHTS / KEY_WEIGHTS.sum())],
+        "liveness": rng.beta(1.5, 6, rows),
+        "loudness": -np.clip(rng.gamma(2, 4, rows), 0, 52),
+        "mode": np.array(MODES)[rng.choice(len(MODES), rows, p=MODE_WEIGHTS / MODE_WEIGHTS.sum())],
+        "speechiness": rng.beta(1, 10, rows),
+        "tempo": np.clip(rng.normal(118, 30, rows), 30, 243),
+        "time_signature": np.array(TIME_SIGNATURES)[
+            rng.choice(len(TIME_SIGNATURES), rows, p=TIME_SIGNATURE_WEIGHTS / TIME_SIGNATURE_WEIGHTS.sum())
+        ],
+        "valence": rng.beta(2, 2, rows),
+    })
+
+
+def generate_dataset(out_dir: str, scale: float = 1.0, seed: int = 42, chunk_rows: int = 1_000_000) -> str:
+    """
+    Escribe un SpotifyFeatures.csv sintético de `scale` veces el tamaño original.
+
+    Se genera por bloques para que la memoria no crezca con la escala. Si ya
+    existe un CSV con la misma escala y semilla, se reutiliza.
+
+    Args:
+        out_dir (str): Carpeta de salida.
+        scale (float): Múltiplo de las 232.725 filas originales (1 = 1x, 100 = ~23M filas).
+        seed (int): Semilla; misma semilla y escala producen el mismo archivo.
+        chunk_rows (int): Filas por bloque.
+
+    Returns:
+        str: Ruta del CSV generado.
+    """
+    rows = int(BASE_ROWS * scale)
+    spec = {"rows": rows, "seed": seed, "scale": scale, "track_pool": TRACK_POOL}
+    csv_file = os.path.join(out_dir, "SpotifyFeatures.csv")
+    spec_file = os.path.join(out_dir, "dataset.json")
+    if os.path.exists(csv_file) and os.path.exists(spec_file):
+        with open(spec_file, encoding="utf-8") as f:
+            if json.load(f) == spec:
+                print(f"✅ Dataset sintético reutilizado: {csv_file}")
+                return csv_file
+
+    os.makedirs(out_dir, exist_ok=True)
+    n_tracks = max(1, int(rows * TRACK_POOL))
+    n_artists = max(1, int(BASE_ARTISTS * scale))
+    start_time = time.perf_counter()
+    with open(csv_file, "wb") as f:
+        for start in range(0, rows, chunk_rows):
+            chunk = synthetic_chunk(start, min(chunk_rows, rows - start), n_tracks, n_artists, seed)
+            chunk.write_csv(f, include_header=start == 0)
+    with open(spec_file, "w", encoding="utf-8") as f:
+        json.dump(spec, f)
+
+    print(f"✅ Dataset sintético {scale}x ({rows:,} filas) generado en "
+          f"{time.perf_counter() - start_time:.1f}s: {csv_file}")
+    return csv_file
+
+
+def run_case(case: str, workdir: str, csv_file: str, verbose: bool = False) -> dict:
+    """
+    Ejecuta y mide un caso del benchmark. Pensado para correr en un proceso nuevo.
+
+    Args:
+        case (str): Una de PIPELINE_STAGES o PIPELINE_MODES.
+        workdir (str): Raíz de trabajo (contiene data/bronze, data/silver, data/gold).
+        csv_file (str): CSV de entrada.
+        verbose (bool): Si es False, se oculta la salida del pipeline.
+
+    Returns:
+        dict: seconds, peak_rss_bytes y baseline_rss_bytes (RSS antes de empezar).
+    """
+    from medallion.bronze import load_bronze
+    from medallion.silver import transform_silver
+    from medallion.gold import aggregate_gold
+    from medallion.metrics import RssSampler
+    from medallion.pipeline import run_pipeline
+
+    data_path = os.path.join(workdir, "data")
+    bronze_path = os.path.join(data_path, "bronze")
+    silver_path = os.path.join(data_path, "silver")
+    gold_path = os.path.join(data_path, "gold")
+    cases = {
+        "load_bronze": lambda: load_bronze(csv_file, bronze_path),
+        "transform_silver": lambda: transform_silver(silver_path=silver_path, bronze_path=bronze_path),
+        "aggregate_gold": lambda: aggregate_gold(os.path.join(silver_path, "SpotifyFeatures_silver"), gold_path),
+        "run_pipeline_eager": lambda: run_pipeline(eager=True, base_path=workdir, csv_files=[csv_file]),
+        "run_pipeline_streaming": lambda: run_pipeline(eager=False, base_path=workdir, csv_files=[csv_file]),
+    }
+
+    sampler = RssSampler().start()
+    baseline = sampler.peak
+    start = time.perf_counter()
+    with redirect_stdout(sys.stdout if verbose else io.StringIO()):
+        cases[case]()
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "peak_rss_bytes": sampler.stop(), "baseline_rss_bytes": baseline}
+
+
+def run_isolated(case: str, workdir: str, csv_file: str, verbose: bool = False) -> dict:
+    """Ejecuta run_case en un proceso 'spawn' nuevo para que el RSS no arrastre casos anteriores."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return pool.submit(run_case, case, workdir, csv_file, verbose).result()
+
+
+def environment_info() -> dict:
+    """Datos de la máquina y versiones para poder comparar corridas."""
+    import psutil
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "total_memory_bytes": psutil.virtual_memory().total,
+        "polars": pl.__version__,
+        "numpy": np.__version__,
+        "git_commit": commit,
+    }
+
+
+def run_benchmarks(scales: list[float], cases: list[str], repeat: int = 1, seed: int = 42,
+                   bench_path: str | None = None, verbose: bool = False) -> dict:
+    """
+    Ejecuta el benchmark completo y guarda el resultado en bench_path/results.
+
+    Las etapas (load_bronze -> transform_silver -> aggregate_gold) se ejecutan
+    encadenadas sobre un directorio limpio; cada modo de run_pipeline parte de
+    otro directorio limpio. Cada caso corre en su propio proceso.
+
+    Args:
+        scales (list[float]): Escalas a medir (1 = 232.725 filas).
+        cases (list[str]): Casos a medir (PIPELINE_STAGES y/o PIPELINE_MODES).
+        repeat (int): Repeticiones por caso; se reporta la mediana.
+        seed (int): Semilla del generador.
+        bench_path (str | None): Carpeta del benchmark. Si None, data/benchmarks.
+        verbose (bool): Muestra la salida del pipeline.
+
+    Returns:
+        dict: Resultado de la corrida (también guardado como JSON).
+    """
+    if bench_path is None:
+        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        bench_path = os.path.join(base_path, "data", "benchmarks")
+
+    run = {
+        "run_id": datetime.now().strftime("%Y%m%dT%H%M%S"),
+        "environment": environment_info(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": [],
+    }
+    for scale in scales:
+        csv_file = generate_dataset(os.path.join(bench_path, "datasets", f"{scale}x-seed{seed}"), scale, seed)
+        for i in range(repeat):
+            stage_dir = os.path.join(bench_path, "work", "stages")
+            shutil.rmtree(stage_dir, ignore_errors=True)
+            for case in cases:
+                workdir = stage_dir if case in PIPELINE_STAGES else os.path.join(bench_path, "work", case)
+                if case not in PIPELINE_STAGES:
+                    shutil.rmtree(workdir, ignore_errors=True)
+                result = run_isolated(case, workdir, csv_file, verbose)
+                result.update({"scale": scale, "rows": int(BASE_ROWS * scale), "case": case, "repeat": i})
+                run["results"].append(result)
+                print(f"⏱️ {scale}x {case} #{i + 1}: {result['seconds']:.2f}s, "
+                      f"pico RSS {result['peak_rss_bytes'] / 2**20:.0f} MiB")
+        shutil.rmtree(os.path.join(bench_path, "work"), ignore_errors=True)
+
+    run["summary"] = summarize(run)
+    results_path = os.path.join(bench_path, "results")
+    os.makedirs(results_path, exist_ok=True)
+    results_file = os.path.join(results_path, f"bench-{run['run_id']}.json")
+    with open(results_file, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+    print(f"✅ Resultados guardados en: {results_file}")
+    return run
+
+
+def summarize(run: dict) -> list[dict]:
+    """Mediana de tiempo y máximo pico de RSS por (escala, caso)."""
+    groups = {}
+    for r in run["results"]:
+        groups.setdefault((r["scale"], r["case"]), []).append(r)
+    return [
+        {
+            "scale": scale,
+            "case": case,
+            "rows": rs[0]["rows"],
+            "median_seconds": statistics.median(r["seconds"] for r in rs),
+            "max_peak_rss_bytes": max(r["peak_rss_bytes"] for r in rs),
+        }
+        for (scale, case), rs in groups.items()
+    ]
+
+
+def compare_runs(current: dict, baseline: dict) -> None:
+    """
+    Imprime la comparación de dos corridas: tiempo y pico de RSS por caso.
+
+    Args:
+        current (dict): Corrida nueva (ver run_benchmarks).
+        baseline (dict): Corrida de referencia.
+    """
+    base = {(s["scale"], s["case"]): s for s in baseline["summary"]}
+    print(f"\n📊 Comparación contra {baseline['run_id']} (commit {baseline['environment'].get('git_commit')}):")
+    print(f"{'escala':>7} {'caso':<24} {'seg':>9} {'base':>9} {'x':>6} {'RSS MiB':>9} {'base':>9}")
+    for s in current["summary"]:
+        b = base.get((s["scale"], s["case"]))
+        if b is None:
+            continue
+        print(f"{s['scale']:>6}x {s['case']:<24} {s['median_seconds']:>9.2f} {b['median_seconds']:>9.2f} "
+              f"{s['median_seconds'] / b['median_seconds']:>6.2f} "
+              f"{s['max_peak_rss_bytes'] / 2**20:>9.0f} {b['max_peak_rss_bytes'] / 2**20:>9.0f}")
+
+
+def latest_result(results_path: str, exclude: str | None = None, prefix: str = "bench-") -> dict | None:
+    """Devuelve la corrida más reciente guardada en results_path (sin contar `exclude`)."""
+    files = sorted(f for f in os.listdir(results_path) if f.startswith(prefix) and f != exclude) \
+        if os.path.isdir(results_path) else []
+    if not files:
+        return None
+    with open(os.path.join(results_path, files[-1]), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def run_startup(entry: str) -> dict:
+    """
+    Mide el arranque en frío de un punto de entrada en un intérprete nuevo.
+
+    Args:
+        entry (str): Una de STARTUP_ENTRY_POINTS.
+
+    Returns:
+        dict: seconds (proceso completo, incluye el arranque de Python), import_seconds
+            (import del módulo hasta tener la función), modules (módulos cargados),
+            heavy_modules (de STARTUP_HEAVY_MODULES) y rss_bytes (RSS al terminar el import).
+    """
+    module, attr = STARTUP_ENTRY_POINTS[entry]
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, module, attr, *STARTUP_HEAVY_MODULES],
+                          capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    seconds = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"No se pudo importar {module}.{attr}:\n{proc.stderr}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["seconds"] = seconds
+    return result
+
+
+def run_startup_benchmarks(entries: list[str], repeat: int = STARTUP_REPEAT, bench_path: str | None = None) -> dict:
+    """
+    Mide el arranque en frío de cada punto de entrada y guarda el resultado en bench_path/results.
+
+    Las repeticiones se intercalan entre puntos de entrada para repartir el ruido
+    de la máquina; la primera repetición de cada uno suele pagar además el cache
+    de disco frío.
+
+    Args:
+        entries (list[str]): Puntos de entrada a medir (STARTUP_ENTRY_POINTS).
+        repeat (int): Repeticiones por punto de entrada; se reporta la mediana.
+        bench_path (str | None): Carpeta del benchmark. Si None, data/benchmarks.
+
+    Returns:
+        dict: Resultado de la corrida (también guardado como JSON).
+    """
+    if bench_path is None:
+        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+        bench_path = os.path.join(base_path, "data", "benchmarks")
+
+    run = {
+        "run_id": datetime.now().strftime("%Y%m%dT%H%M%S"),
+        "environment": environment_info(),
+        "repeat": repeat,
+        "results": [],
+    }
+    for i in range(repeat):
+        for entry in entries:
+            result = run_startup(entry)
+            result.update({"case": entry, "repeat": i})
+            run["results"].append(result)
+            print(f"⏱️ {entry} #{i + 1}: {result['seconds'] * 1e3:.0f} ms "
+                  f"(import {result['import_seconds'] * 1e3:.0f} ms, {result['modules']} módulos)")
+
+    groups = {}
+    for r in run["results"]:
+        groups.setdefault(r["case"], []).append(r)
+    run["summary"] = [
+        {
+            "case": case,
+            "median_seconds": statistics.median(r["seconds"] for r in rs),
+            "median_import_seconds": statistics.median(r["import_seconds"] for r in rs),
+            "modules": rs[-1]["modules"],
+            "heavy_modules": rs[-1]["heavy_modules"],
+            "max_rss_bytes": max(r["rss_bytes"] for r in rs),
+        }
+        for case, rs in groups.items()
+    ]
+    results_path = os.path.join(bench_path, "results")
+    os.makedirs(results_path, exist_ok=True)
+    results_file = os.path.join(results_path, f"startup-{run['run_id']}.json")
+    with open(results_file, "w", encoding="utf-8") as f:
+        json.dump(run, f, indent=2)
+
+    print(f"\n{'punto de entrada':<18} {'ms':>7} {'import':>7} {'RSS MiB':>8}  dependencias cargadas")
+    for s in run["summary"]:
+        print(f"{s['case']:<18} {s['median_seconds'] * 1e3:>7.0f} {s['median_import_seconds'] * 1e3:>7.0f} "
+              f"{s['max_rss_bytes'] / 2**20:>8.0f}  {', '.join(s['heavy_modules']) or '-'}")
+    print(f"✅ Resultados guardados en: {results_file}")
+    return run
+
+
+def compare_startup(current: dict, baseline: dict) -> None:
+    """Imprime la comparación de dos corridas de arranque en frío (mediana y RSS por punto de entrada)."""
+    base = {s["case"]: s for s in baseline["summary"]}
+    print(f"\n📊 Comparación contra {baseline['run_id']} (commit {baseline['environment'].get('git_commit')}):")
+    print(f"{'punto de entrada':<18} {'ms':>7} {'base':>7} {'x':>6} {'RSS MiB':>8} {'base':>7}")
+    for s in current["summary"]:
+        b = base.get(s["case"])
+        if b is None:
+            continue
+        print(f"{s['case']:<18} {s['median_seconds'] * 1e3:>7.0f} {b['median_seconds'] * 1e3:>7.0f} "
+              f"{s['median_seconds'] / b['median_seconds']:>6.2f} "
+              f"{s['max_rss_bytes'] / 2**20:>8.0f} {b['max_rss_bytes'] / 2**20:>7.0f}")
+
+
+# Ejecutar si se corre como script
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark offline del pipeline con datos sintéticos.")
+    parser.add_argument("--scales", type=float, nargs="+", default=[1.0],
+                        help="Escalas respecto a las 232.725 filas originales (p. ej. 1 10 100).")
+    parser.add_argument("--cases", nargs="+", default=PIPELINE_STAGES + PIPELINE_MODES,
+                        choices=PIPELINE_STAGES + PIPELINE_MODES)
+    parser.add_argument("--repeat", type=int, default=None,
+                        help=f"Repeticiones por caso (por defecto 1, o {STARTUP_REPEAT} con --startup).")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--bench-path", default=None, help="Carpeta del benchmark (por defecto data/benchmarks).")
+    parser.add_argument("--compare", default=None,
+                        help="JSON de una corrida anterior; por defecto, la más reciente en results/.")
+    parser.add_argument("--verbose", action="store_true")
+    parser.add_argument("--startup", action="store_true",
+                        help="Medir el arranque en frío de los puntos de entrada en lugar del pipeline.")
+    parser.add_argument("--entry-points", nargs="+", default=list(STARTUP_ENTRY_POINTS),
+                        choices=list(STARTUP_ENTRY_POINTS))
+    args = parser.parse_args()
+
+    if args.startup:
+        run = run_startup_benchmarks(args.entry_points, args.repeat or STARTUP_REPEAT, args.bench_path)
+        prefix, compare = "startup-", compare_startup
+    else:
+        run = run_benchmarks(args.scales, args.cases, args.repeat or 1, args.seed, args.bench_path, args.verbose)
+        prefix, compare = "bench-", compare_runs
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        bench_path = args.bench_path or os.path.join(os.path.dirname(os.path.abspath(__file__)), "..",
+                                                     "data", "benchmarks")
+        baseline = latest_result(os.path.join(bench_path, "results"), exclude=f"{prefix}{run['run_id']}.json",
+                                 prefix=prefix)
+    if baseline is not None:
+        compare(run, baseline)
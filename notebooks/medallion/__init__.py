@@ -0,0 +1,20 @@
+"""
+Pipeline ETL de Spotify (raw -> bronze -> silver -> gold) separado en módulos por etapa.
+
+    extract     descarga o referencia de los CSV raw (Kaggle, carpeta local o espejo)
+    bronze      conversión CSV -> Parquet por lotes y manifiesto de particiones
+    silver      limpieza, calidad y merge incremental particionado por género
+    sketches    sketches mergeables (HyperLogLog, cuantiles, heavy hitters)
+    gold        agregación incremental desde estados mergeables
+    similarity  índice kNN de artistas similares
+    metrics     métricas por etapa y exportación a Prometheus
+    streaming   plan lazy único de raw a Gold
+    dag         orquestación de etapas con cache por hash de contenido
+    pipeline    run_pipeline
+    tables      ubicación y versión de las tablas para los lectores (consulta y dashboard)
+    cli         línea de comandos (python -m medallion)
+
+El paquete no importa nada al cargarse: cada módulo importa solo las librerías
+que usa, y las pesadas que no siempre hacen falta (pyarrow, prometheus_client,
+kagglehub, streamlit) se importan dentro de las funciones que las necesitan.
+"""
@@ -0,0 +1,709 @@
+import os
+import json
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import TYPE_CHECKING
+import polars as pl
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+# ------------------------------
+# Load Bronze: leer CSV tal cual y agregar timestamp
+# ------------------------------
+BRONZE_MANIFEST = "_manifest.json"
+# Conversión CSV -> Parquet por lotes: el CSV se lee en bloques de BRONZE_BLOCK_BYTES y cada
+# lote se escribe como un row group, así la memoria no depende del tamaño del archivo
+BRONZE_BLOCK_BYTES = 16 * 2**20
+# Muestra del inicio del CSV con la que se infiere (y se congela) el esquema
+BRONZE_SAMPLE_BYTES = 4 * 2**20
+# Columnas que Silver necesita numéricas además de las numéricas de SILVER_SCHEMA (duration_s sale de duration_ms)
+BRONZE_NUMERIC_COLUMNS = ["duration_ms"]
+BRONZE_COMPRESSION = "zstd"
+# Solo las columnas de texto con pocos valores distintos en la muestra (≤ 1% de sus filas)
+# se escriben con codificación diccionario: en las de alta cardinalidad solo agrega costo
+BRONZE_DICTIONARY_RATIO = 0.01
+# Filas que no se pueden parsear con el esquema congelado: <bronze>/_rejects/<partición>
+BRONZE_REJECTS_DIR = "_rejects"
+# Valores que pyarrow lee como nulos en columnas no string (pyarrow.csv.ConvertOptions().null_values)
+BRONZE_NULL_VALUES = ["", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND",
+                      "1.#QNAN", "N/A", "NA", "NULL", "NaN", "n/a", "nan", "null"]
+BRONZE_BOOL_VALUES = {"1": True, "True": True, "TRUE": True, "true": True,
+                      "0": False, "False": False, "FALSE": False, "false": False}
+
+
+def file_fingerprint(path: str) -> dict:
+    """
+    Calcula la huella de un archivo: tamaño, mtime y hash SHA-256 del contenido.
+
+    Args:
+        path (str): Ruta del archivo.
+
+    Returns:
+        dict: Diccionario con size, mtime_ns y sha256.
+    """
+    stat = os.stat(path)
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha.hexdigest()}
+
+
+def load_manifest(bronze_path: str) -> dict:
+    """
+    Lee el manifiesto de Bronze (una entrada por archivo raw ingerido).
+
+    Args:
+        bronze_path (str): Carpeta Bronze.
+
+    Returns:
+        dict: Manifiesto {clave_csv: entrada} (ver bronze_key). Vacío si todavía no existe.
+    """
+    manifest_file = os.path.join(bronze_path, BRONZE_MANIFEST)
+    if not os.path.exists(manifest_file):
+        return {}
+    with open(manifest_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(bronze_path: str, manifest: dict) -> None:
+    """
+    Guarda el manifiesto de Bronze de forma atómica (archivo temporal + replace).
+
+    Args:
+        bronze_path (str): Carpeta Bronze.
+        manifest (dict): Manifiesto a guardar.
+    """
+    manifest_file = os.path.join(bronze_path, BRONZE_MANIFEST)
+    tmp_file = manifest_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, manifest_file)
+
+
+def current_bronze_parts(bronze_path: str, dataset: str = "SpotifyFeatures_bronze") -> list[str]:
+    """
+    Devuelve la partición vigente (la última ingerida) de cada archivo raw de un dataset.
+
+    Args:
+        bronze_path (str): Carpeta Bronze.
+        dataset (str): Nombre del dataset Bronze.
+
+    Returns:
+        list[str]: Rutas completas de los Parquet vigentes.
+    """
+    manifest = load_manifest(bronze_path)
+    return [
+        os.path.join(bronze_path, entry["parts"][-1])
+        for entry in manifest.values()
+        if entry["dataset"] == dataset and entry["parts"]
+    ]
+
+
+def bronze_key(csv_path: str, root: str | None = None) -> str:
+    """
+    Clave de un CSV en el manifiesto de Bronze: su ruta relativa a la raíz de la fuente.
+
+    Así dos shards con el mismo nombre en carpetas distintas (a/part.csv y
+    b/part.csv) no comparten entrada. Sin raíz, o si el archivo no está dentro
+    de ella, la clave es el nombre del archivo.
+
+    Args:
+        csv_path (str): Ruta del CSV raw.
+        root (str | None): Carpeta raíz de la fuente (ver extract.raw_root).
+
+    Returns:
+        str: Clave con separadores '/'.
+    """
+    if root is not None:
+        rel = os.path.relpath(os.path.abspath(csv_path), os.path.abspath(root))
+        if rel != os.pardir and not rel.startswith(os.pardir + os.sep):
+            return rel.replace(os.sep, "/")
+    return os.path.basename(csv_path)
+
+
+def bronze_changes(csv_path: str, manifest: dict, root: str | None = None) -> dict | None:
+    """
+    Compara un CSV raw contra el manifiesto de Bronze.
+
+    Si tamaño y mtime coinciden no se lee el archivo. Si difieren, se calcula
+    el hash: un contenido idéntico (p. ej. un archivo solo "tocado") tampoco
+    se vuelve a ingerir.
+
+    Args:
+        csv_path (str): Ruta del CSV raw.
+        manifest (dict): Manifiesto de Bronze.
+        root (str | None): Carpeta raíz de la fuente (ver bronze_key).
+
+    Returns:
+        dict | None: Huella del archivo si es nuevo o cambió; None si no cambió.
+    """
+    entry = manifest.get(bronze_key(csv_path, root))
+    stat = os.stat(csv_path)
+    if entry is not None and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+        return None
+
+    fingerprint = file_fingerprint(csv_path)
+    if entry is not None and entry["sha256"] == fingerprint["sha256"]:
+        entry["mtime_ns"] = fingerprint["mtime_ns"]
+        return None
+    return fingerprint
+
+
+def bronze_part_name(dataset: str, ingest_timestamp: datetime, fingerprint: dict, key: str) -> str:
+    """
+    Construye la ruta relativa de una partición Bronze.
+
+    El nombre combina el hash del contenido, el de la clave del CSV en el
+    manifiesto y la hora de ingesta: dos shards con el mismo contenido
+    (a/part.csv y b/part.csv) o un CSV que vuelve a una versión anterior en el
+    mismo día nunca escriben el mismo archivo.
+
+    Args:
+        dataset (str): Nombre del dataset Bronze.
+        ingest_timestamp (datetime): Momento de la ingesta.
+        fingerprint (dict): Huella del CSV (ver file_fingerprint).
+        key (str): Clave del CSV en el manifiesto (ver bronze_key).
+
+    Returns:
+        str: Ruta relativa a la carpeta Bronze.
+    """
+    key_hash = hashlib.sha256(key.encode()).hexdigest()[:8]
+    return os.path.join(
+        dataset,
+        f"ingest_date={ingest_timestamp.date().isoformat()}",
+        f"part-{fingerprint['sha256'][:16]}-{key_hash}-{ingest_timestamp:%H%M%S%f}.parquet",
+    )
+
+
+def record_bronze_part(manifest: dict, csv_path: str, dataset: str, part: str,
+                       fingerprint: dict, ingest_timestamp: datetime, rows: int, rejected: int = 0,
+                       root: str | None = None) -> None:
+    """
+    Registra en el manifiesto una nueva partición Bronze de un CSV.
+
+    Args:
+        manifest (dict): Manifiesto de Bronze (se modifica en sitio).
+        csv_path (str): Ruta del CSV raw.
+        dataset (str): Nombre del dataset Bronze.
+        part (str): Ruta relativa de la partición escrita.
+        fingerprint (dict): Huella del CSV.
+        ingest_timestamp (datetime): Momento de la ingesta.
+        rows (int): Filas escritas.
+        rejected (int): Filas rechazadas (ver write_bronze_part).
+        root (str | None): Carpeta raíz de la fuente (ver bronze_key).
+    """
+    key = bronze_key(csv_path, root)
+    entry = manifest.get(key, {"parts": []})
+    entry.update(fingerprint)
+    entry.update({
+        "dataset": dataset,
+        "ingest_timestamp": ingest_timestamp.isoformat(),
+        "rows": rows,
+        "rejected": rejected,
+    })
+    entry["parts"].append(part)
+    manifest[key] = entry
+
+
+def record_end(data: bytes) -> int:
+    """
+    Posición siguiente al último fin de registro completo de un bloque CSV.
+
+    Un salto de línea dentro de un campo entre comillas no termina el registro:
+    solo cuentan los que tienen una cantidad par de comillas antes (el bloque
+    debe empezar en un inicio de registro; "" dentro de un campo suma dos).
+
+    Args:
+        data (bytes): Bloque CSV que empieza en un inicio de registro.
+
+    Returns:
+        int: Bytes de data que forman registros completos (0 si no hay ninguno).
+    """
+    quotes = data.count(b'"')
+    end = len(data)
+    while (pos := data.rfind(b"\n", 0, end)) >= 0:
+        quotes -= data.count(b'"', pos, end)
+        if quotes % 2 == 0:
+            return pos + 1
+        end = pos
+    return 0
+
+
+def infer_bronze_schema(csv_path: str) -> tuple["pa.Schema", list[str]]:
+    """
+    Infiere el esquema de un CSV a partir de sus primeros BRONZE_SAMPLE_BYTES (con pyarrow,
+    las mismas reglas que read_csv) para congelarlo durante toda la conversión.
+
+    Las columnas que Silver espera numéricas (SILVER_SCHEMA y BRONZE_NUMERIC_COLUMNS)
+    no se ensanchan a texto por un valor inválido en la muestra: quedan Float64 y
+    esas filas van a rechazos al convertir.
+
+    Args:
+        csv_path (str): Ruta del CSV raw.
+
+    Returns:
+        tuple[pa.Schema, list[str]]: Esquema de las columnas del CSV y columnas de texto
+            a escribir con diccionario (ver BRONZE_DICTIONARY_RATIO).
+    """
+    # pyarrow solo se importa al convertir un CSV (no al importar el módulo)
+    import pyarrow as pa
+    import pyarrow.compute
+    import pyarrow.csv as pa_csv
+    # Import diferido: silver importa este módulo
+    from .silver import SILVER_SCHEMA
+
+    with open(csv_path, "rb") as f:
+        sample = f.read(BRONZE_SAMPLE_BYTES)
+        if f.read(1):
+            # La muestra se corta en el último fin de registro completo
+            sample = sample[:record_end(sample)]
+    table = pa_csv.read_csv(
+        pa.py_buffer(sample),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=lambda row: "skip"),
+    )
+    numeric = {col for col, rule in SILVER_SCHEMA.items() if rule["dtype"].is_numeric()} | set(BRONZE_NUMERIC_COLUMNS)
+    schema = pa.schema([
+        field.with_type(pa.float64())
+        if field.name in numeric and not (pa.types.is_integer(field.type) or pa.types.is_floating(field.type))
+        else field
+        for field in table.schema
+    ])
+    dictionary = [
+        field.name for field in schema
+        if pa.types.is_string(field.type)
+        and pa.compute.count_distinct(table[field.name]).as_py() <= BRONZE_DICTIONARY_RATIO * table.num_rows
+    ]
+    return schema, dictionary
+
+
+def bronze_cast(col: str, dtype: pl.DataType) -> pl.Expr:
+    """
+    Convierte una columna leída como texto al tipo del esquema congelado.
+
+    Los valores que no se pueden convertir quedan nulos (luego se detectan como rechazos).
+    """
+    if dtype == pl.String:
+        return pl.col(col)
+    value = pl.when(pl.col(col).is_in(BRONZE_NULL_VALUES)).then(None).otherwise(pl.col(col))
+    if dtype == pl.Boolean:
+        return value.replace_strict(BRONZE_BOOL_VALUES, default=None, return_dtype=pl.Boolean).alias(col)
+    if dtype == pl.Date:
+        return value.str.to_date(strict=False).alias(col)
+    if isinstance(dtype, pl.Datetime):
+        return value.str.to_datetime(time_unit=dtype.time_unit, strict=False).alias(col)
+    return value.cast(dtype, strict=False).alias(col)
+
+
+def iter_csv_blocks(csv_path: str, block_size: int):
+    """
+    Recorre un CSV en bloques de ~block_size bytes cortados en fin de registro (ver record_end),
+    cada uno con el encabezado.
+
+    Args:
+        csv_path (str): Ruta del CSV.
+        block_size (int): Bytes a leer por bloque.
+
+    Yields:
+        bytes: Encabezado más las filas completas del bloque.
+    """
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        rest = b""
+        while chunk := f.read(block_size):
+            chunk = rest + chunk
+            cut = record_end(chunk)
+            block, rest = chunk[:cut], chunk[cut:]
+            if block:
+                yield header + block
+        if rest.strip():
+            yield header + rest
+
+
+def write_bronze_part(csv_path: str, bronze_file: str, ingest_timestamp: datetime,
+                      rejects_file: str | None = None, keep_frame: bool = False) -> dict:
+    """
+    Convierte un CSV raw en una partición Bronze por lotes, con memoria acotada.
+
+    El esquema se infiere de una muestra y queda congelado (infer_bronze_schema).
+    El CSV se lee en bloques de BRONZE_BLOCK_BYTES (iter_csv_blocks) que pyarrow
+    parsea en paralelo con ese esquema; cada lote se escribe como un row group de
+    un ParquetWriter en un hilo aparte mientras se parsea el siguiente, así en
+    memoria hay a lo sumo dos bloques. Las filas con otra cantidad de columnas o
+    con valores que no respetan el esquema no abortan la carga: se guardan en
+    rejects_file (motivo y texto original). Un bloque con valores inválidos se
+    vuelve a parsear como texto para separar solo esas filas.
+
+    El Parquet se escribe en un archivo temporal y se publica al terminar.
+
+    Args:
+        csv_path (str): Ruta del CSV original (raw).
+        bronze_file (str): Parquet Bronze a escribir.
+        ingest_timestamp (datetime): Timestamp de ingesta.
+        rejects_file (str | None): Parquet de rechazos. Si None, junto a bronze_file (.rejects.parquet).
+        keep_frame (bool): Si es True, además devuelve el DataFrame escrito (frame); en ese
+            caso la partición completa queda en memoria.
+
+    Returns:
+        dict: rows (filas escritas), rejected (filas rechazadas), rejects_file (o None) y,
+            si keep_frame, frame.
+    """
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+
+    arrow_schema, dictionary = infer_bronze_schema(csv_path)
+    schema = pl.from_arrow(arrow_schema.empty_table()).schema
+    typed = [c for c, dtype in schema.items() if dtype != pl.String]
+    # Un valor no nulo en el texto que queda nulo al convertir es un rechazo
+    failed = [
+        (pl.col(c).is_not_null() & ~pl.col(c).is_in(BRONZE_NULL_VALUES) & bronze_cast(c, schema[c]).is_null()).alias(c)
+        for c in typed
+    ]
+    rejects = []
+    block_rejects = []
+
+    def invalid_row(row) -> str:
+        block_rejects.append({"reason": f"{row.actual_columns} columnas, se esperaban {row.expected_columns}",
+                              "text": row.text})
+        return "skip"
+
+    def parse(block: bytes, column_types: dict) -> pl.DataFrame:
+        block_rejects.clear()
+        parse_options = pa_csv.ParseOptions(newlines_in_values=True, invalid_row_handler=invalid_row)
+        table = pa_csv.read_csv(pa.py_buffer(block), parse_options=parse_options,
+                                convert_options=pa_csv.ConvertOptions(column_types=column_types))
+        rejects.extend(block_rejects)
+        return pl.from_arrow(table)
+
+    def convert(block: bytes) -> pl.DataFrame:
+        try:
+            df = parse(block, {field.name: field.type for field in arrow_schema})
+        except pa.ArrowInvalid:
+            # Algún valor no respeta el esquema: se parsea como texto y se separan esas filas
+            raw = parse(block, {col: pa.string() for col in schema})
+            checks = raw.select(failed)
+            bad = checks.select(pl.any_horizontal(pl.all())).to_series()
+            reasons = checks.filter(bad).select(
+                pl.concat_str([pl.when(pl.col(c)).then(pl.lit(c)) for c in typed], separator=", ", ignore_nulls=True)
+            ).to_series()
+            texts = raw.filter(bad).select(pl.struct(pl.all()).struct.json_encode()).to_series()
+            rejects.extend({"reason": f"tipo inválido en: {r}", "text": t} for r, t in zip(reasons, texts))
+            df = raw.filter(~bad).select(bronze_cast(c, dtype) for c, dtype in schema.items())
+        return df.with_columns(pl.lit(ingest_timestamp).cast(pl.Datetime("us")).alias("ingest_timestamp"))
+
+    os.makedirs(os.path.dirname(bronze_file), exist_ok=True)
+    tmp_file = bronze_file + ".tmp"
+    empty = pl.DataFrame(schema=schema).with_columns(
+        pl.lit(ingest_timestamp).cast(pl.Datetime("us")).alias("ingest_timestamp"))
+    writer = None
+    frames = [empty]
+    rows = 0
+    with ThreadPoolExecutor(max_workers=1) as write_pool:
+        pending = None
+        try:
+            for block in iter_csv_blocks(csv_path, BRONZE_BLOCK_BYTES):
+                table = convert(block).to_arrow()
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_file, table.schema, compression=BRONZE_COMPRESSION,
+                                              use_dictionary=dictionary)
+                if pending is not None:
+                    pending.result()
+                pending = write_pool.submit(writer.write_table, table, row_group_size=max(len(table), 1))
+                rows += len(table)
+                if keep_frame:
+                    frames.append(pl.from_arrow(table))
+            if pending is not None:
+                pending.result()
+            if writer is None:
+                # CSV sin filas: Parquet vacío con el esquema congelado
+                writer = pq.ParquetWriter(tmp_file, empty.to_arrow().schema, compression=BRONZE_COMPRESSION,
+                                          use_dictionary=dictionary)
+        finally:
+            if writer is not None:
+                writer.close()
+    os.replace(tmp_file, bronze_file)
+
+    result = {"rows": rows, "rejected": len(rejects), "rejects_file": None}
+    if rejects:
+        result["rejects_file"] = rejects_file or bronze_file.removesuffix(".parquet") + ".rejects.parquet"
+        os.makedirs(os.path.dirname(result["rejects_file"]), exist_ok=True)
+        pl.DataFrame(rejects, schema={"reason": pl.String, "text": pl.String}).write_parquet(result["rejects_file"])
+        print(f"⚠️ {len(rejects)} filas rechazadas de {os.path.basename(csv_path)}: {result['rejects_file']}")
+    if keep_frame:
+        result["frame"] = pl.concat(frames)
+    return result
+
+
+def load_bronze(csv_path: str | None = None,
+                bronze_path: str | None = None,
+                dataset: str | None = None,
+                root: str | None = None) -> pl.DataFrame | None:
+    """
+    Lee un CSV desde raw, agrega timestamp de ingesta y guarda en bronze
+    sin hacer ninguna transformación.
+
+    La ingesta es incremental: el manifiesto de Bronze guarda tamaño, mtime y
+    hash de cada CSV. Si el archivo no cambió se omite; si es nuevo o cambió,
+    se agrega una nueva partición `<dataset>/ingest_date=YYYY-MM-DD/part-<hash>-<clave>-<hora>.parquet`
+    sin sobrescribir las anteriores. La conversión se hace por lotes con el
+    esquema congelado (ver write_bronze_part); las filas inválidas van a
+    `_rejects/` en vez de abortar la carga.
+
+    Args:
+        csv_path (str | None): Ruta del CSV original (raw). Si None, se determina automáticamente.
+        bronze_path (str | None): Carpeta donde se guardará el Parquet bronze. Si None, se determina automáticamente.
+        dataset (str | None): Nombre del dataset Bronze. Si None, se usa '<nombre_csv>_bronze'.
+        root (str | None): Carpeta raíz de la fuente: la clave del CSV en el manifiesto es
+            su ruta relativa a ella (ver bronze_key). Si None, el nombre del archivo.
+
+    Returns:
+        pl.DataFrame | None: DataFrame cargado con columna de timestamp, o None si el CSV no cambió.
+    """
+    # Determinar base_path si es necesario
+    if csv_path is None or bronze_path is None:
+        try:
+            base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        except NameError:
+            # Modo notebook
+            base_path = os.path.abspath(os.path.join(os.getcwd(), ".."))
+
+        if csv_path is None:
+            csv_path = os.path.join(base_path, "data", "raw", "SpotifyFeatures.csv")
+        if bronze_path is None:
+            bronze_path = os.path.join(base_path, "data", "bronze")
+    if dataset is None:
+        dataset = os.path.basename(csv_path).replace(".csv", "_bronze")
+
+    os.makedirs(bronze_path, exist_ok=True)
+
+    # Comparar contra el manifiesto: si no cambió, no se reingiere
+    manifest = load_manifest(bronze_path)
+    fingerprint = bronze_changes(csv_path, manifest, root)
+    if fingerprint is None:
+        save_manifest(bronze_path, manifest)
+        print(f"✅ Bronze sin cambios, se omite: {os.path.basename(csv_path)}")
+        return None
+
+    # Convertir el CSV por lotes a una nueva partición Parquet (con timestamp de ingesta)
+    ingest_timestamp = datetime.now()
+    part = bronze_part_name(dataset, ingest_timestamp, fingerprint, bronze_key(csv_path, root))
+    bronze_file = os.path.join(bronze_path, part)
+    written = write_bronze_part(csv_path, bronze_file, ingest_timestamp,
+                                os.path.join(bronze_path, BRONZE_REJECTS_DIR, part), keep_frame=True)
+    df = written["frame"]
+
+    record_bronze_part(manifest, csv_path, dataset, part, fingerprint, ingest_timestamp, len(df), written["rejected"], root)
+    save_manifest(bronze_path, manifest)
+
+    print(f"✅ Guardado en bronze completado: {bronze_file} con {len(df)} filas")
+    return df
+
+
+def ingest_bronze_file(csv_path: str, bronze_path: str, dataset: str, entry: dict | None,
+                       keep_frame: bool = False, key: str | None = None) -> dict:
+    """
+    Ingiere un CSV en Bronze sin tocar el manifiesto (se ejecuta dentro de un worker).
+
+    El worker hace todo el trabajo pesado (hash, parseo y escritura del
+    Parquet); el proceso principal es el único que actualiza el manifiesto.
+
+    Args:
+        csv_path (str): Ruta del CSV raw.
+        bronze_path (str): Carpeta Bronze.
+        dataset (str): Nombre del dataset Bronze.
+        entry (dict | None): Entrada actual del CSV en el manifiesto (copia).
+        keep_frame (bool): Si es True, el resultado incluye el DataFrame escrito (frame)
+            para pasarlo a Silver sin releer el Parquet.
+        key (str | None): Clave del CSV en el manifiesto (ver bronze_key). Si None, el nombre del archivo.
+
+    Returns:
+        dict: Resultado con status ('skipped' o 'ingested'), seconds y, si se
+            ingirió, part, rows, fingerprint e ingest_timestamp.
+    """
+    start = time.perf_counter()
+    name = os.path.basename(csv_path)
+    manifest = {name: dict(entry)} if entry is not None else {}
+    fingerprint = bronze_changes(csv_path, manifest)
+    if fingerprint is None:
+        return {"file": csv_path, "status": "skipped", "seconds": time.perf_counter() - start,
+                "mtime_ns": manifest[name]["mtime_ns"]}
+
+    ingest_timestamp = datetime.now()
+    part = bronze_part_name(dataset, ingest_timestamp, fingerprint, key or name)
+    written = write_bronze_part(csv_path, os.path.join(bronze_path, part), ingest_timestamp,
+                                os.path.join(bronze_path, BRONZE_REJECTS_DIR, part), keep_frame)
+    result = {"file": csv_path, "status": "ingested", "seconds": time.perf_counter() - start,
+              "part": part, "rows": written["rows"], "rejected": written["rejected"],
+              "fingerprint": fingerprint, "ingest_timestamp": ingest_timestamp}
+    if keep_frame:
+        result["frame"] = written["frame"]
+    return result
+
+
+def duplicate_of(csv_path: str, key: str, seen: dict) -> str | None:
+    """
+    Busca otro CSV con el mismo contenido antes de enviar uno a los workers.
+
+    Solo se calcula el hash cuando el tamaño coincide con el de otro CSV (del
+    manifiesto o ya enviado), así el caso habitual no lee el archivo dos veces.
+
+    Args:
+        csv_path (str): Ruta del CSV.
+        key (str): Clave del CSV en el manifiesto.
+        seen (dict): Tamaño -> {clave: [ruta, sha256 o None]}; se actualiza con el CSV.
+
+    Returns:
+        str | None: Clave del otro CSV con el mismo contenido, o None.
+    """
+    try:
+        size = os.path.getsize(csv_path)
+    except OSError:
+        return None  # El worker reporta el error
+    same_size = seen.setdefault(size, {})
+    if not any(other != key for other in same_size):
+        same_size[key] = [csv_path, None]
+        return None
+    sha256 = file_fingerprint(csv_path)["sha256"]
+    same_as = None
+    for other, known in same_size.items():
+        if other == key:
+            continue
+        if known[1] is None:
+            known[1] = file_fingerprint(known[0])["sha256"]
+        if known[1] == sha256:
+            same_as = other
+            break
+    same_size[key] = [csv_path, sha256]
+    return same_as
+
+
+def ingest_bronze_parallel(csv_files,
+                           bronze_path: str,
+                           dataset: str = "SpotifyFeatures_bronze",
+                           max_workers: int | None = None,
+                           executor: str = "thread",
+                           handoff: dict | None = None,
+                           root: str | None = None) -> dict:
+    """
+    Ingiere en paralelo todos los CSV de raw en un único dataset Bronze.
+
+    Cada CSV se procesa en un worker de un pool acotado; los resultados se
+    registran en el manifiesto al terminar, de modo que todos los archivos
+    (shards) quedan como particiones del mismo dataset. Un archivo que falla no
+    detiene al resto.
+
+    `csv_files` puede ser un iterador (p. ej. iter_raw_files): cada archivo se
+    envía al pool en cuanto el extractor lo produce.
+
+    Args:
+        csv_files (Iterable[str]): CSV disponibles en raw.
+        bronze_path (str): Carpeta Bronze.
+        dataset (str): Nombre del dataset Bronze donde se unifican los archivos.
+        max_workers (int | None): Cantidad de workers. Si None, min(archivos, núcleos)
+            (o núcleos, si csv_files es un iterador).
+        executor (str): 'thread' (por defecto; Polars libera el GIL al parsear y
+            escribir) o 'process' (procesos con start method 'spawn').
+        handoff (dict | None): Si se indica (solo con executor='thread'), cada partición
+            ingerida queda también en memoria, {ruta: DataFrame}, para las etapas siguientes.
+        root (str | None): Carpeta raíz de la fuente: cada CSV se registra con su ruta
+            relativa a ella (ver bronze_key). Si None, con el nombre del archivo.
+
+    Returns:
+        dict: Reporte con files (status, seconds, rows o error por archivo),
+            wall_seconds, las listas ingested, skipped y failed y duplicates (CSV
+            ingeridos con el mismo contenido que otro vigente).
+    """
+    os.makedirs(bronze_path, exist_ok=True)
+    if max_workers is None:
+        n_files = len(csv_files) if hasattr(csv_files, "__len__") else os.cpu_count() or 1
+        max_workers = max(1, min(n_files, os.cpu_count() or 1))
+
+    if executor == "process":
+        pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"))
+    elif executor == "thread":
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+    else:
+        raise ValueError(f"executor debe ser 'thread' o 'process', no {executor!r}")
+
+    manifest = load_manifest(bronze_path)
+    results = []
+    futures = {}
+    duplicates = []
+    seen = {}
+    for key, entry in manifest.items():
+        if entry["dataset"] == dataset:
+            seen.setdefault(entry["size"], {})[key] = [None, entry["sha256"]]
+    start = time.perf_counter()
+    with pool:
+        for csv_file in csv_files:
+            key = bronze_key(csv_file, root)
+            if key in (k for _, k in futures.values()):
+                # Sin root, dos shards con el mismo nombre pisarían la misma entrada
+                error = f"otro CSV ya usa la clave {key!r} en el manifiesto de Bronze"
+                results.append({"file": csv_file, "status": "failed", "seconds": None, "error": error})
+                print(f"❌ Error cargando Bronze desde {csv_file}: {error}")
+                continue
+            legacy = os.path.basename(csv_file)
+            if root is not None and key not in manifest and legacy in manifest \
+                    and not os.path.exists(os.path.join(root, legacy)):
+                # Manifiesto anterior a las claves relativas (por nombre de archivo): la entrada
+                # pasa a la nueva clave, salvo que sea la de un CSV que está en la raíz
+                manifest[key] = manifest.pop(legacy)
+            entry = manifest.get(key)
+            stat = os.stat(csv_file) if os.path.exists(csv_file) else None
+            unchanged = entry is not None and stat is not None \
+                and (entry["size"], entry["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns)
+            same_as = None if unchanged else duplicate_of(csv_file, key, seen)
+            if same_as is not None:
+                # Son fuentes distintas: cada una conserva su partición, pero sus filas
+                # aparecen dos veces en Bronze
+                duplicates.append({"file": csv_file, "same_as": same_as})
+                print(f"⚠️ {key} tiene el mismo contenido que {same_as} (se ingieren ambos)")
+            future = pool.submit(ingest_bronze_file, csv_file, bronze_path, dataset,
+                                 manifest.get(key), handoff is not None and executor == "thread", key)
+            futures[future] = (csv_file, key)
+        for future in as_completed(futures):
+            csv_file, _ = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"file": csv_file, "status": "failed", "seconds": None, "error": repr(e)}
+                print(f"❌ Error cargando Bronze desde {csv_file}: {e}")
+            results.append(result)
+
+    # Solo el proceso principal actualiza el manifiesto
+    for result in results:
+        key = bronze_key(result["file"], root)
+        if result["status"] == "skipped" and key in manifest:
+            manifest[key]["mtime_ns"] = result["mtime_ns"]
+        elif result["status"] == "ingested":
+            record_bronze_part(manifest, result["file"], dataset, result["part"], result["fingerprint"],
+                               result["ingest_timestamp"], result["rows"], result["rejected"], root)
+            if "frame" in result:
+                handoff[os.path.abspath(os.path.join(bronze_path, result["part"]))] = result.pop("frame")
+    save_manifest(bronze_path, manifest)
+
+    report = {
+        "wall_seconds": time.perf_counter() - start,
+        "max_workers": max_workers,
+        "executor": executor,
+        "files": sorted(results, key=lambda r: r["file"]),
+        "ingested": [r["part"] for r in results if r["status"] == "ingested"],
+        "skipped": [r["file"] for r in results if r["status"] == "skipped"],
+        "failed": [r["file"] for r in results if r["status"] == "failed"],
+        "duplicates": duplicates,
+    }
+
+    for r in report["files"]:
+        seconds = f"{r['seconds']:.2f}s" if r["seconds"] is not None else "-"
+        detail = f"{r['rows']} filas ({r['rejected']} rechazadas)" if r["status"] == "ingested" else r.get("error", "")
+        print(f"   [{r['status']:>8}] {os.path.basename(r['file'])} {seconds} {detail}")
+    print(f"✅ Bronze paralelo: {len(report['ingested'])} ingeridos, {len(report['skipped'])} sin cambios, "
+          f"{len(report['failed'])} con error en {report['wall_seconds']:.2f}s ({max_workers} workers {executor})")
+    return report
@@ -0,0 +1,88 @@
+import os
+import sys
+import argparse
+import subprocess
+
+# ------------------------------
+# 🚀 CLI: cada subcomando importa solo lo que usa, así `show` o `query` no cargan
+# pyarrow ni el resto del pipeline, y `run` no carga streamlit ni plotly
+# ------------------------------
+from .tables import NOTEBOOKS_DIR, default_base_path
+
+DASHBOARD_SCRIPT = os.path.join(NOTEBOOKS_DIR, "spotify_dashboard.py")
+
+
+def import_script(name: str):
+    """Importa uno de los scripts de notebooks/ (show_table_gold, query_medallion)."""
+    if NOTEBOOKS_DIR not in sys.path:
+        sys.path.insert(0, NOTEBOOKS_DIR)
+    return __import__(name)
+
+
+def cmd_run(args) -> int:
+    from .pipeline import run_pipeline
+
+    run_pipeline(eager=not args.streaming, max_workers=args.max_workers, pushgateway=args.pushgateway,
+                 base_path=args.base_path, csv_files=args.csv_files, source=args.source)
+    return 0
+
+
+def cmd_show(args) -> int:
+    show_table_gold = import_script("show_table_gold")
+    gold_path = os.path.join(args.base_path, "data", "gold") if args.base_path else None
+    show_table_gold.show_gold_tables(gold_path, genre=args.genre, artist=args.artist)
+    return 0
+
+
+def cmd_dashboard(args) -> int:
+    # Streamlit ejecuta el script en su propio proceso; la ruta base se pasa después de "--"
+    command = [sys.executable, "-m", "streamlit", "run", DASHBOARD_SCRIPT, "--", args.base_path or default_base_path()]
+    return subprocess.call(command)
+
+
+def cmd_query(args) -> int:
+    query_medallion = import_script("query_medallion")
+    service = query_medallion.MedallionQuery(args.base_path)
+    if args.tables or not args.query:
+        for name, schema in service.tables().items():
+            print(f"🗂️ {name}: {', '.join(schema.names())}")
+    else:
+        query_medallion.run_query(service, args.query, args.output)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m medallion",
+                                     description="Pipeline medallón de Spotify: ETL, consulta y visualización.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Ejecutar el pipeline raw -> bronze -> silver -> gold.")
+    run.add_argument("--streaming", action="store_true", help="Modo streaming (memoria acotada) en lugar de eager.")
+    run.add_argument("--max-workers", type=int, default=None, help="Workers de la ingesta Bronze en modo eager.")
+    run.add_argument("--source", default=None, help="Fuente del extract: 'kaggle', 'local:<carpeta>' o 'mirror:<carpeta>'.")
+    run.add_argument("--csv-files", nargs="+", default=None, help="CSVs de entrada (omite la extracción).")
+    run.add_argument("--pushgateway", default=None, help="Pushgateway de Prometheus (p. ej. localhost:9091).")
+    run.set_defaults(func=cmd_run)
+
+    show = commands.add_parser("show", help="Mostrar las tablas Gold en consola.")
+    show.add_argument("--genre", default=None, help="Mostrar solo este género.")
+    show.add_argument("--artist", default=None, help="Mostrar solo este artista.")
+    show.set_defaults(func=cmd_show)
+
+    dashboard = commands.add_parser("dashboard", help="Abrir el dashboard de Streamlit.")
+    dashboard.set_defaults(func=cmd_dashboard)
+
+    query = commands.add_parser("query", help="Consulta SQL sobre Bronze, Silver y Gold (ver query_medallion.py).")
+    query.add_argument("query", nargs="?", default=None, help="Consulta SQL. Si se omite, lista las tablas.")
+    query.add_argument("--output", "-o", default=None, help="Exportar el resultado a un .parquet o .csv.")
+    query.add_argument("--tables", action="store_true", help="Listar las tablas disponibles y sus columnas.")
+    query.set_defaults(func=cmd_query)
+
+    for sub in (run, show, dashboard, query):
+        sub.add_argument("--base-path", default=None, help="Raíz del proyecto (por defecto, la carpeta padre de notebooks/).")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
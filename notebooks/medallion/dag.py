@@ -0,0 +1,192 @@
+import os
+import glob
+import json
+import hashlib
+import time
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from .bronze import file_fingerprint
+from .metrics import record_skipped_stage, track_stage
+
+
+# ------------------------------
+# 🧭 Orquestación: DAG de etapas con cache por hash de contenido
+# ------------------------------
+DAG_STATE_FILE = "_dag_state.json"
+
+
+class Stage:
+    """
+    Etapa del DAG del pipeline.
+
+    Args:
+        name (str): Nombre de la etapa (también en las métricas).
+        run: Función run(record, results, previous) que ejecuta la etapa. record es
+            el registro de track_stage, results los valores devueltos por las
+            dependencias y previous la ejecución anterior registrada (o None).
+        inputs (list[str] | callable): Archivos o carpetas que lee; puede ser una
+            función de results si dependen de una etapa anterior.
+        outputs (list[str]): Archivos o carpetas que escribe.
+        deps (list[str]): Etapas que deben terminar antes.
+        params (dict | None): Parámetros que forman parte de la clave de cache.
+        cache (bool): Si es False la etapa se ejecuta siempre (p. ej. extracción,
+            que tiene su propio control de cambios).
+    """
+
+    def __init__(self, name: str, run, inputs=(), outputs=(), deps=(), params: dict | None = None,
+                 cache: bool = True):
+        self.name = name
+        self.run = run
+        self.inputs = inputs
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.params = params or {}
+        self.cache = cache
+
+
+def content_hash(paths: list[str], memo: dict, base_path: str | None = None) -> str:
+    """
+    Hash del contenido de archivos y carpetas (recursivo).
+
+    El SHA-256 de cada archivo se memoriza por (tamaño, mtime), así que solo se
+    relee un archivo cuando cambió. Los archivos dentro de base_path entran al
+    hash (y al memo) por su ruta relativa a ella: mover o volver a clonar el
+    proyecto no invalida el cache.
+
+    Args:
+        paths (list[str]): Archivos o carpetas.
+        memo (dict): Memo {ruta: [size, mtime_ns, sha256]} (se actualiza en sitio).
+        base_path (str | None): Raíz del proyecto. Si None, las rutas entran tal cual.
+
+    Returns:
+        str: Hash combinado (las rutas inexistentes cuentan como vacías).
+    """
+    digest = hashlib.sha256()
+    for path in sorted(paths):
+        files = sorted(glob.glob(os.path.join(path, "**", "*"), recursive=True)) if os.path.isdir(path) else [path]
+        for f in files:
+            if not os.path.isfile(f) or f.endswith(".tmp"):
+                continue
+            name = f
+            if base_path is not None:
+                relative = os.path.relpath(os.path.abspath(f), base_path)
+                if not relative.startswith(os.pardir):
+                    name = relative.replace(os.sep, "/")
+            stat = os.stat(f)
+            entry = memo.get(name)
+            if entry is None or entry[:2] != [stat.st_size, stat.st_mtime_ns]:
+                entry = [stat.st_size, stat.st_mtime_ns, file_fingerprint(f)["sha256"]]
+                memo[name] = entry
+            digest.update(f"{name}\0{entry[2]}\n".encode())
+    return digest.hexdigest()
+
+
+def load_dag_state(state_file: str) -> dict:
+    """Lee el estado del DAG: última ejecución exitosa de cada etapa y memo de hashes."""
+    if not os.path.exists(state_file):
+        return {"stages": {}, "hashes": {}}
+    with open(state_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_dag_state(state_file: str, state: dict) -> None:
+    """Guarda el estado del DAG de forma atómica."""
+    tmp_file = state_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, state_file)
+
+
+def run_dag(stages: list[Stage], state_file: str, run_metrics: dict, max_workers: int | None = None,
+            base_path: str | None = None) -> dict:
+    """
+    Ejecuta un DAG de etapas: las independientes en paralelo y cada una una sola vez.
+
+    La clave de cache de una etapa es el hash de su nombre, sus parámetros y el
+    contenido de sus entradas. Si coincide con la última ejecución exitosa y
+    las salidas no cambiaron desde entonces, la etapa se omite. El estado se
+    guarda después de cada etapa exitosa: si una etapa falla, la siguiente
+    ejecución retoma desde ahí sin recalcular las anteriores. Las etapas que
+    dependen de una fallida no se ejecutan.
+
+    Args:
+        stages (list[Stage]): Etapas, en cualquier orden.
+        state_file (str): Archivo de estado del DAG.
+        run_metrics (dict): Registro de la ejecución (cada etapa se mide con track_stage; las
+            cacheadas o bloqueadas se registran con su status, ver record_skipped_stage).
+        max_workers (int | None): Etapas simultáneas como máximo. Si None, tantas como etapas.
+        base_path (str | None): Raíz del proyecto; las rutas dentro de ella entran a la clave de
+            cache como relativas (ver content_hash). Si None, la carpeta del archivo de estado.
+
+    Returns:
+        dict: {etapa: {"status": 'ok' | 'cached' | 'failed' | 'blocked', "value": resultado}}.
+    """
+    state = load_dag_state(state_file)
+    base_path = os.path.abspath(base_path or os.path.dirname(os.path.abspath(state_file)))
+    lock = threading.Lock()
+    outcome = {}
+
+    def execute(stage: Stage):
+        start = time.perf_counter()
+        results = {dep: outcome[dep]["value"] for dep in stage.deps}
+        inputs = stage.inputs(results) if callable(stage.inputs) else list(stage.inputs)
+        previous = state["stages"].get(stage.name)
+        with lock:
+            hashes = dict(state["hashes"])
+        key = hashlib.sha256(json.dumps(
+            {"stage": stage.name, "params": stage.params, "inputs": content_hash(inputs, hashes, base_path)},
+            sort_keys=True, default=str,
+        ).encode()).hexdigest()
+        if (stage.cache and previous is not None and previous["key"] == key
+                and all(os.path.exists(p) for p in stage.outputs)
+                and previous["outputs"] == content_hash(stage.outputs, hashes, base_path)):
+            print(f"✅ [{stage.name}] sin cambios en sus entradas, se usa la salida anterior.")
+            with lock:
+                state["hashes"].update(hashes)
+            record_skipped_stage(run_metrics, stage.name, "cached", time.perf_counter() - start)
+            return "cached", previous.get("value")
+
+        print(f"🚀 [{stage.name}] ejecutando...")
+        with track_stage(run_metrics, stage.name, inputs, stage.outputs) as record:
+            value = stage.run(record, results, previous)
+        record_value = value if isinstance(value, (str, int, float, list, dict, type(None))) else None
+        with lock:
+            state["hashes"].update(hashes)
+            state["stages"][stage.name] = {
+                "key": key,
+                "outputs": content_hash(stage.outputs, state["hashes"], base_path),
+                "value": record_value,
+                "finished_at": datetime.now().isoformat(),
+            }
+            save_dag_state(state_file, state)
+        return "ok", value
+
+    pending = {stage.name: stage for stage in stages}
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(stages), 1)) as pool:
+        running = {}
+        while pending or running:
+            for name, stage in list(pending.items()):
+                if any(outcome.get(dep, {}).get("status") in ("failed", "blocked") for dep in stage.deps):
+                    outcome[name] = {"status": "blocked", "value": None}
+                    record_skipped_stage(run_metrics, name, "blocked")
+                    print(f"⚠️ [{name}] no se ejecuta: falló una etapa anterior.")
+                    del pending[name]
+                elif all(outcome.get(dep, {}).get("status") in ("ok", "cached") for dep in stage.deps):
+                    running[pool.submit(execute, stage)] = name
+                    del pending[name]
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                try:
+                    status, value = future.result()
+                    outcome[name] = {"status": status, "value": value}
+                except Exception as e:
+                    print(f"❌ Error en la etapa {name}: {e}")
+                    outcome[name] = {"status": "failed", "value": None}
+    for name in pending:
+        outcome[name] = {"status": "blocked", "value": None}
+        record_skipped_stage(run_metrics, name, "blocked")
+    return outcome
@@ -0,0 +1,249 @@
+import os
+import glob
+import shutil
+
+
+# ------------------------------
+# Extract único: descargar CSV a raw
+# ------------------------------
+KAGGLE_DATASET = "zaheenhamidani/ultimate-spotify-tracks-db"
+
+
+class LocalDirSource:
+    """
+    CSV que ya están en una carpeta local. Por defecto se usan en su lugar
+    (sin copiarlos a raw).
+
+    Args:
+        path (str): Carpeta con los CSV (se busca de forma recursiva).
+        pattern (str): Patrón de archivos a tomar.
+    """
+
+    materialize = "reference"
+
+    def __init__(self, path: str, pattern: str = "*.csv"):
+        self.path = path
+        self.pattern = pattern
+
+    def iter_files(self):
+        """Produce la ruta de cada CSV de la fuente en cuanto está disponible."""
+        if not os.path.isdir(self.path):
+            raise FileNotFoundError(f"La carpeta fuente no existe: {self.path}")
+        yield from sorted(glob.glob(os.path.join(self.path, "**", self.pattern), recursive=True))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.path!r})"
+
+
+class LocalMirrorSource(LocalDirSource):
+    """
+    Espejo local del dataset de Kaggle (p. ej. una copia de la cache de
+    kagglehub en un disco compartido). Los archivos se enlazan en raw con hard links.
+
+    Acepta la raíz de la cache (`datasets/<owner>/<dataset>/versions/<n>`, se
+    toma la versión más alta), la carpeta `<owner>/<dataset>` o directamente
+    la carpeta con los CSV.
+
+    Args:
+        mirror_path (str): Raíz del espejo.
+        handle (str): Dataset de Kaggle '<owner>/<dataset>'.
+    """
+
+    materialize = "hardlink"
+
+    def __init__(self, mirror_path: str, handle: str = KAGGLE_DATASET):
+        super().__init__(self.resolve(mirror_path, handle))
+
+    @staticmethod
+    def resolve(mirror_path: str, handle: str) -> str:
+        for root in (os.path.join(mirror_path, "datasets", *handle.split("/")),
+                     os.path.join(mirror_path, *handle.split("/"))):
+            versions = os.path.join(root, "versions")
+            if os.path.isdir(versions):
+                numbered = [v for v in os.listdir(versions) if v.isdigit()]
+                if numbered:
+                    return os.path.join(versions, max(numbered, key=int))
+            if os.path.isdir(root):
+                return root
+        return mirror_path
+
+
+class KaggleSource:
+    """
+    Dataset descargado con kagglehub (usa su cache local). Los archivos se
+    enlazan en raw con hard links desde la cache.
+
+    Args:
+        handle (str): Dataset de Kaggle '<owner>/<dataset>'.
+    """
+
+    materialize = "hardlink"
+
+    def __init__(self, handle: str = KAGGLE_DATASET):
+        self.handle = handle
+        # Carpeta de la versión en la cache (se conoce al descargar)
+        self.path = None
+
+    def iter_files(self):
+        """Descarga (o reutiliza la cache) y produce la ruta de cada CSV."""
+        import kagglehub  # solo se necesita si la fuente es Kaggle
+
+        cache_path = kagglehub.dataset_download(self.handle)
+        self.path = cache_path
+        print(f"[extract_to_raw] Dataset descargado en cache: {cache_path}")
+        for root, dirs, files in os.walk(cache_path):
+            for file_name in sorted(files):
+                if file_name.endswith(".csv"):
+                    yield os.path.join(root, file_name)
+
+    def __repr__(self) -> str:
+        return f"KaggleSource({self.handle!r})"
+
+
+def resolve_source(spec=None):
+    """
+    Construye la fuente de datos a partir de una especificación.
+
+    Args:
+        spec (str | objeto fuente | None): 'kaggle', 'kaggle:<owner>/<dataset>',
+            'local:<carpeta>' o 'mirror:<carpeta>'. Si None, se usa la variable
+            de entorno SPOTIFY_SOURCE y, si no existe, 'kaggle'. Un objeto con
+            iter_files() se devuelve tal cual.
+
+    Returns:
+        Fuente con iter_files() y atributo materialize.
+    """
+    if spec is not None and not isinstance(spec, str):
+        return spec
+    spec = spec or os.environ.get("SPOTIFY_SOURCE", "kaggle")
+    kind, _, arg = spec.partition(":")
+    if kind == "kaggle":
+        return KaggleSource(arg or KAGGLE_DATASET)
+    if kind == "local" and arg:
+        return LocalDirSource(arg)
+    if kind == "mirror" and arg:
+        return LocalMirrorSource(arg)
+    raise ValueError(f"Fuente no reconocida: {spec!r} (usa 'kaggle', 'local:<carpeta>' o 'mirror:<carpeta>')")
+
+
+def raw_root(raw_path: str, source=None, materialize: str | None = None) -> str:
+    """
+    Carpeta respecto de la cual se nombran los CSV en el manifiesto de Bronze (ver bronze_key).
+
+    Args:
+        raw_path (str): Carpeta raw.
+        source: Fuente o especificación (ver resolve_source).
+        materialize (str | None): 'reference', 'hardlink' o 'copy'. Si None, el de la fuente.
+
+    Returns:
+        str: La carpeta de la fuente si sus CSV se usan en su lugar; si no, raw.
+    """
+    source = resolve_source(source)
+    if (materialize or source.materialize) == "reference" and getattr(source, "path", None):
+        return source.path
+    return raw_path
+
+
+def materialize_file(src: str, raw_path: str, mode: str, root: str | None = None) -> str:
+    """
+    Deja un CSV de la fuente disponible para Bronze.
+
+    Args:
+        src (str): Ruta del CSV en la fuente.
+        raw_path (str): Carpeta raw.
+        mode (str): 'reference' (se usa src en su lugar), 'hardlink' (enlace en
+            raw; si el enlace no es posible, p. ej. entre discos, se copia) o 'copy'.
+        root (str | None): Carpeta raíz de la fuente: en raw se conserva la ruta relativa
+            a ella (a/part.csv y b/part.csv no se pisan). Si None, solo el nombre del archivo.
+
+    Returns:
+        str: Ruta que debe leer Bronze.
+    """
+    if mode == "reference":
+        return src
+    if mode not in ("hardlink", "copy"):
+        raise ValueError(f"materialize debe ser 'reference', 'hardlink' o 'copy', no {mode!r}")
+
+    file_name = os.path.basename(src)
+    if root is not None:
+        rel = os.path.relpath(src, root)
+        if not rel.startswith(os.pardir):
+            file_name = rel
+    dst = os.path.join(raw_path, file_name)
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    # Si raw ya tiene la misma versión (mismo inodo o tamaño + mtime), no se vuelve a escribir
+    if os.path.exists(dst):
+        src_stat, dst_stat = os.stat(src), os.stat(dst)
+        if os.path.samestat(src_stat, dst_stat) or \
+                (src_stat.st_size, src_stat.st_mtime_ns) == (dst_stat.st_size, dst_stat.st_mtime_ns):
+            print(f"[extract_to_raw] Sin cambios, se omite: {file_name}")
+            return dst
+        os.remove(dst)
+
+    if mode == "hardlink":
+        try:
+            os.link(src, dst)
+            print(f"[extract_to_raw] Enlazado en raw: {file_name}")
+            return dst
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    print(f"[extract_to_raw] Copiado a raw: {file_name}")
+    return dst
+
+
+def iter_raw_files(raw_path: str, source=None, materialize: str | None = None):
+    """
+    Produce cada CSV de la fuente en cuanto queda disponible en raw, para que
+    Bronze pueda empezar a convertirlo sin esperar al resto.
+
+    Args:
+        raw_path (str): Carpeta raw.
+        source: Fuente o especificación (ver resolve_source).
+        materialize (str | None): 'reference', 'hardlink' o 'copy'. Si None, el de la fuente.
+
+    Yields:
+        str: Ruta del CSV listo para leer.
+    """
+    source = resolve_source(source)
+    mode = materialize or source.materialize
+    os.makedirs(raw_path, exist_ok=True)
+    for src in source.iter_files():
+        yield materialize_file(src, raw_path, mode, getattr(source, "path", None))
+
+
+def extract_to_raw(base_path: str | None = None, source=None, materialize: str | None = None) -> list[str]:
+    """
+    Obtiene los CSV del dataset 'Ultimate Spotify Tracks DB' desde la fuente
+    configurada y los deja disponibles en la carpeta 'data/raw' dentro de base_path.
+
+    Las fuentes locales no requieren red: una carpeta local se usa en su lugar
+    y un espejo o la cache de Kaggle se enlazan con hard links, sin duplicar bytes.
+
+    Args:
+        base_path (str | None): Ruta raíz del proyecto. Si es None, se determina automáticamente.
+            - En script (.py): usa __file__.
+            - En notebook: usa el directorio de trabajo actual.
+        source: Fuente o especificación ('kaggle', 'local:<carpeta>', 'mirror:<carpeta>').
+            Si None, SPOTIFY_SOURCE o Kaggle.
+        materialize (str | None): 'reference', 'hardlink' o 'copy'. Si None, el de la fuente.
+
+    Returns:
+        list[str]: Rutas completas de los CSV listos para Bronze.
+    """
+    # Determinar base_path si no se pasa
+    if base_path is None:
+        try:
+            base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        except NameError:
+            # Estamos en un notebook
+            base_path = os.path.abspath(os.path.join(os.getcwd(), ".."))
+
+    raw_path = os.path.join(base_path, "data", "raw")  # <-- aquí se corrige
+    os.makedirs(raw_path, exist_ok=True)
+    print(f"[extract_to_raw] Carpeta raw lista en: {raw_path}")
+
+    csv_files = list(iter_raw_files(raw_path, source, materialize))
+
+    print(f"[extract_to_raw] CSV disponibles: {[os.path.basename(f) for f in csv_files]}")
+    return csv_files
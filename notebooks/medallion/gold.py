@@ -0,0 +1,760 @@
+import os
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+import polars as pl
+from .silver import load_silver_state, parquet_options, scan_handoff
+from .sketches import (
+    merge_sketch_state,
+    replace_sketch,
+    sketch_distinct,
+    sketch_plans,
+    sketch_quantiles,
+    sketch_state,
+    sketch_top,
+)
+
+
+# ------------------------------
+# Aggregate Gold: agregación incremental
+# ------------------------------
+FEATURES_COLS = ["acousticness", "danceability", "energy", "instrumentalness",
+                 "liveness", "loudness", "speechiness", "valence"]
+GOLD_STATE_DIR = "_state"
+# Manifiesto de lotes Silver aplicados, uno por estado de GOLD_STATES: el de genre y el de
+# artist se calculan en etapas independientes del DAG
+GOLD_MANIFEST = "_manifest_{}.json"
+# Copias Arrow IPC (Feather v2, sin compresión) de las tablas publicadas: se abren con
+# memory map desde el dashboard y show_gold_tables, sin deserializar ni copiar
+GOLD_IPC_DIR = "_ipc"
+# Layout físico de Gold: cada tabla se ordena por su clave primaria
+GOLD_LAYOUT = {
+    "compression": "zstd",
+    "compression_level": 3,
+    "row_group_size": 50_000,
+    "statistics": "full",
+}
+# Versión del estado mergeable: si cambian sus columnas, Gold se recalcula completo
+GOLD_STATE_VERSION = 4
+GOLD_INSTRUMENTAL_THRESHOLD = 0.8
+# Estados mergeables de Gold: clave de agrupación, métricas (sum, sum of squares y NaN)
+# y conteos de filas que cumplen una condición (un NaN no la cumple: en Polars NaN > x es True).
+# Se calculan todos en un solo scan de Silver.
+GOLD_STATES = {
+    "genre": {
+        "key": "genre",
+        "metrics": ["popularity", "tempo", "loudness"],
+        "counts": {"instrumental_count": (
+            pl.col("instrumentalness").fill_nan(None) > GOLD_INSTRUMENTAL_THRESHOLD
+        ).fill_null(False)},
+    },
+    "artist": {"key": "artist_name", "metrics": FEATURES_COLS},
+}
+# Tablas Gold publicadas (incluye un mart por gráfico del dashboard). Cada una se deriva
+# de un estado: ("mean" | "std", métrica), ("count",) o ("sum", conteo). Agregar una
+# tabla no agrega lecturas de Silver, solo una proyección sobre el estado ya calculado.
+GOLD_SPECS = {
+    "genre_popularity.parquet": {"state": "genre", "columns": {
+        "avg_popularity": ("mean", "popularity"),
+        "track_count": ("count",),
+        "std_popularity": ("std", "popularity"),
+    }},
+    "artist_features.parquet": {"state": "artist", "columns": {
+        f"avg_{col}": ("mean", col) for col in FEATURES_COLS
+    }},
+    "genre_tempo_loudness.parquet": {"state": "genre", "columns": {
+        "avg_tempo": ("mean", "tempo"),
+        "avg_loudness": ("mean", "loudness"),
+    }},
+    "genre_instrumental.parquet": {"state": "genre", "columns": {
+        "instrumental_count": ("sum", "instrumental_count"),
+    }},
+}
+# Muestras estratificadas para los scatter: GOLD_SAMPLE_SIZE tracks por género,
+# elegidos por hash de la clave (misma muestra en cada ejecución)
+GOLD_SAMPLES = {
+    "sample_danceability_energy.parquet": ["danceability", "energy"],
+    "sample_valence_mode.parquet": ["valence", "mode"],
+}
+GOLD_SAMPLE_SIZE = 1000
+GOLD_SAMPLE_SEED = 42
+# Grillas de densidad por género para los scatter grandes: conteo por celda de
+# GOLD_DENSITY_BINS x GOLD_DENSITY_BINS (las columnas no numéricas, como mode, no se agrupan en bins)
+GOLD_DENSITY = {
+    "density_danceability_energy.parquet": ("danceability", "energy"),
+    "density_valence_mode.parquet": ("valence", "mode"),
+}
+GOLD_DENSITY_BINS = 40
+# Tier opcional de sketches por género (ver sketch_plans): su estado mergeable (columnas
+# binarias) vive en _state y se publica una tabla con tracks distintos, percentiles y top de artistas
+GOLD_SKETCHES = True
+GOLD_SKETCH_STATE = "sketch_genre.parquet"
+GOLD_SKETCH_TABLE = "genre_sketches.parquet"
+GOLD_SKETCH_QUANTILES = [0.25, 0.5, 0.75, 0.9]
+GOLD_SKETCH_TOP_N = 5
+
+
+def metric_state(col: str, sign: pl.Expr) -> list[pl.Expr]:
+    """
+    Expresiones de estado mergeable de una métrica: suma, suma de cuadrados y cantidad de NaN.
+
+    Los NaN se cuentan aparte (y no se suman) para que, al retractar una fila
+    con NaN, el promedio vuelva a ser el mismo que daría un recálculo completo.
+
+    Args:
+        col (str): Columna numérica de Silver.
+        sign (pl.Expr): Peso de cada fila (+1 inserción, -1 retracción).
+
+    Returns:
+        list[pl.Expr]: Agregaciones <col>_sum, <col>_sumsq y <col>_nan.
+    """
+    is_nan = pl.col(col).cast(pl.Float64).is_nan()
+    value = pl.when(is_nan).then(0.0).otherwise(pl.col(col).cast(pl.Float64))
+    return [
+        (sign * value).sum().alias(f"{col}_sum"),
+        (sign * value * value).sum().alias(f"{col}_sumsq"),
+        (sign * is_nan.cast(pl.Int64)).sum().alias(f"{col}_nan"),
+    ]
+
+
+def gold_state_plans(lf: pl.LazyFrame, sign: pl.Expr | None = None) -> dict[str, pl.LazyFrame]:
+    """
+    Construye los planes del estado mergeable de cada entrada de GOLD_STATES.
+
+    Todos parten del mismo plan, así que ejecutados juntos con pl.collect_all
+    comparten un único scan de Silver (eliminación de subplanes comunes).
+
+    Args:
+        lf (pl.LazyFrame): Plan con filas Silver (o un changelog Silver).
+        sign (pl.Expr | None): Peso de cada fila. Si None, todas suman +1.
+
+    Returns:
+        dict[str, pl.LazyFrame]: Estado por nombre de GOLD_STATES, ordenado por su clave.
+    """
+    # El peso se materializa como columna: un literal no se expande dentro de agg()
+    lf = lf.with_columns((pl.lit(1) if sign is None else sign).cast(pl.Int64).alias("_weight"))
+    sign = pl.col("_weight")
+    plans = {}
+    for name, spec in GOLD_STATES.items():
+        # genre es Categorical en Silver; el estado y las tablas Gold lo publican como String
+        key = pl.col(spec["key"]).cast(pl.String) if spec["key"] == "genre" else pl.col(spec["key"])
+        plans[name] = lf.group_by(key).agg([
+            sign.sum().alias("count"),
+            *[expr for col in spec["metrics"] for expr in metric_state(col, sign)],
+            *[(sign * cond.cast(pl.Int64)).sum().alias(count) for count, cond in spec.get("counts", {}).items()],
+        ]).sort(spec["key"])
+    return plans
+
+
+def merge_gold_state(old: pl.DataFrame, delta: pl.DataFrame, key: str | list[str]) -> pl.DataFrame:
+    """
+    Combina dos estados Gold sumando sus componentes; los grupos que quedan vacíos se eliminan.
+
+    Args:
+        old (pl.DataFrame): Estado actual.
+        delta (pl.DataFrame): Estado del delta (puede tener cantidades negativas).
+        key (str | list[str]): Columna(s) de agrupación.
+
+    Returns:
+        pl.DataFrame: Estado combinado.
+    """
+    return (
+        pl.concat([old, delta], how="vertical_relaxed")
+          .group_by(key)
+          .agg(pl.all().sum())
+          .filter(pl.col("count") > 0)
+          .sort(key)
+    )
+
+
+def state_mean(col: str) -> pl.Expr:
+    """Promedio a partir del estado mergeable (NaN si algún valor era NaN, igual que mean())."""
+    return pl.when(pl.col(f"{col}_nan") > 0).then(float("nan")).otherwise(pl.col(f"{col}_sum") / pl.col("count"))
+
+
+def state_std(col: str) -> pl.Expr:
+    """Desviación estándar muestral a partir del estado mergeable (ddof=1, igual que std())."""
+    n = pl.col("count")
+    variance = (pl.col(f"{col}_sumsq") - pl.col(f"{col}_sum") ** 2 / n) / (n - 1)
+    return (
+        pl.when(pl.col(f"{col}_nan") > 0).then(float("nan"))
+          .when(n > 1).then(variance.clip(lower_bound=0.0).sqrt())
+    )
+
+
+def gold_column(name: str, op: tuple) -> pl.Expr:
+    """
+    Compila una columna de GOLD_SPECS a una expresión sobre el estado mergeable.
+
+    Args:
+        name (str): Nombre de la columna publicada.
+        op (tuple): ("mean", métrica), ("std", métrica), ("count",) o ("sum", conteo).
+
+    Returns:
+        pl.Expr: Expresión de la columna.
+    """
+    kind, *args = op
+    if kind == "mean":
+        return state_mean(args[0]).alias(name)
+    if kind == "std":
+        return state_std(args[0]).alias(name)
+    if kind == "count":
+        return pl.col("count").cast(pl.UInt32).alias(name)
+    if kind == "sum":
+        return pl.col(args[0]).cast(pl.UInt32).alias(name)
+    raise ValueError(f"Operación Gold desconocida en {name}: {kind}")
+
+
+def gold_table_plans(states: dict[str, pl.LazyFrame], specs: dict | None = None) -> dict[str, pl.LazyFrame]:
+    """
+    Deriva las tablas Gold publicadas a partir de los estados mergeables.
+
+    Args:
+        states (dict[str, pl.LazyFrame]): Estados por nombre (ver gold_state_plans).
+        specs (dict | None): Tablas a publicar. Si None, GOLD_SPECS.
+
+    Returns:
+        dict[str, pl.LazyFrame]: Plan de cada tabla por nombre de archivo, ordenado por su clave.
+    """
+    plans = {}
+    for file_name, spec in (specs or GOLD_SPECS).items():
+        key = GOLD_STATES[spec["state"]]["key"]
+        columns = [gold_column(name, op) for name, op in spec["columns"].items()]
+        plans[file_name] = states[spec["state"]].select(key, *columns).sort(key)
+    return plans
+
+
+def gold_specs(genre_file_name: str = "genre_popularity.parquet",
+               artist_file_name: str = "artist_features.parquet") -> dict:
+    """GOLD_SPECS con los nombres de archivo elegidos para las dos tablas principales."""
+    renames = {"genre_popularity.parquet": genre_file_name, "artist_features.parquet": artist_file_name}
+    return {renames.get(file_name, file_name): spec for file_name, spec in GOLD_SPECS.items()}
+
+
+def sample_plan(lf: pl.LazyFrame, columns: list[str]) -> pl.LazyFrame:
+    """
+    Muestra estratificada de tamaño fijo: los GOLD_SAMPLE_SIZE tracks de cada
+    género con menor hash de (track_id, genre).
+
+    Como depende solo de la clave, la muestra no cambia entre ejecuciones y un
+    género se puede volver a muestrear sin tocar los demás.
+
+    Args:
+        lf (pl.LazyFrame): Filas Silver.
+        columns (list[str]): Columnas que dibuja el gráfico.
+
+    Returns:
+        pl.LazyFrame: Plan de la muestra (genre, track_name y columns).
+    """
+    return (
+        lf.select(
+            pl.col("genre").cast(pl.String),
+            "track_name",
+            *columns,
+            # genre es Categorical: se hashea como String para no depender de los códigos físicos
+            pl.struct("track_id", pl.col("genre").cast(pl.String)).hash(GOLD_SAMPLE_SEED).alias("_sample_hash"),
+        )
+        .group_by("genre")
+        .agg(pl.all().bottom_k_by("_sample_hash", GOLD_SAMPLE_SIZE))
+        .explode(pl.all().exclude("genre"))
+        .sort("genre", "_sample_hash")
+        .drop("_sample_hash")
+    )
+
+
+def density_axis(col: str, dtype: pl.DataType) -> pl.Expr:
+    """Eje de una grilla de densidad: inicio del bin para features en [0, 1]; el valor tal cual para categorías."""
+    if not dtype.is_numeric():
+        return pl.col(col).cast(pl.String)
+    width = 1 / GOLD_DENSITY_BINS
+    bin_index = (pl.col(col).cast(pl.Float64).clip(0.0, 1.0) * GOLD_DENSITY_BINS).floor().clip(0, GOLD_DENSITY_BINS - 1)
+    return (bin_index * width).cast(pl.Float32).alias(col)
+
+
+def density_plan(lf: pl.LazyFrame, x: str, y: str, sign: pl.Expr | None = None) -> pl.LazyFrame:
+    """
+    Grilla de densidad por género: cantidad de tracks en cada celda (x, y).
+
+    Es mergeable: el plan sobre un changelog (sign = _sign) da el delta de
+    conteos que se suma a la grilla existente con merge_gold_state.
+
+    Args:
+        lf (pl.LazyFrame): Filas Silver (o un changelog Silver).
+        x (str): Columna del eje x.
+        y (str): Columna del eje y.
+        sign (pl.Expr | None): Peso de cada fila. Si None, todas suman +1.
+
+    Returns:
+        pl.LazyFrame: Plan con genre, x, y y count, ordenado por celda.
+    """
+    schema = lf.collect_schema()
+    numeric = [c for c in (x, y) if schema[c].is_numeric()]
+    return (
+        lf.filter(*[pl.col(c).cast(pl.Float64).is_not_nan() for c in numeric])
+          .select(
+              pl.col("genre").cast(pl.String),
+              density_axis(x, schema[x]),
+              density_axis(y, schema[y]),
+              (pl.lit(1) if sign is None else sign).cast(pl.Int64).alias("count"),
+          )
+          .group_by("genre", x, y)
+          .agg(pl.col("count").sum())
+          .sort("genre", x, y)
+    )
+
+
+def gold_parquet_options(file_name: str, key: str, layout: dict | None = None) -> dict:
+    """
+    Opciones de escritura de una tabla Gold (ver parquet_options).
+
+    Args:
+        file_name (str): Archivo de la tabla.
+        key (str): Clave primaria por la que está ordenada.
+        layout (dict | None): Cambios sobre GOLD_LAYOUT.
+
+    Returns:
+        dict: Argumentos para write_parquet / sink_parquet.
+    """
+    return parquet_options({**GOLD_LAYOUT, **(layout or {})}, file_name.removesuffix(".parquet"), [key])
+
+
+def gold_state_files(gold_path: str) -> dict[str, str]:
+    """
+    Rutas del estado mergeable de cada entrada de GOLD_STATES (carpeta _state dentro de Gold).
+
+    Args:
+        gold_path (str): Carpeta Gold.
+
+    Returns:
+        dict[str, str]: Ruta del estado por nombre.
+    """
+    state_path = os.path.join(gold_path, GOLD_STATE_DIR)
+    return {name: os.path.join(state_path, f"{name}.parquet") for name in GOLD_STATES}
+
+
+def gold_sketch_table(state: pl.DataFrame) -> pl.DataFrame:
+    """
+    Tabla publicada del tier de sketches: por género, tracks, tracks distintos (HyperLogLog),
+    percentiles de popularity (GOLD_SKETCH_QUANTILES), medianas de tempo y loudness y
+    los GOLD_SKETCH_TOP_N artistas con más tracks.
+
+    Args:
+        state (pl.DataFrame): Estado de sketches (ver sketch_state).
+
+    Returns:
+        pl.DataFrame: Una fila por género, ordenada por género.
+    """
+    top = sketch_top(state, GOLD_SKETCH_TOP_N).group_by("genre", maintain_order=True).agg(
+        pl.col("artist_name").alias("top_artists")
+    )
+    return (
+        state.select("genre", pl.col("count").cast(pl.UInt32).alias("track_count"))
+          .join(sketch_distinct(state), on="genre", how="left")
+          .join(sketch_quantiles(state, "popularity", GOLD_SKETCH_QUANTILES), on="genre", how="left")
+          .join(sketch_quantiles(state, "tempo", [0.5]), on="genre", how="left")
+          .join(sketch_quantiles(state, "loudness", [0.5]), on="genre", how="left")
+          .join(top, on="genre", how="left")
+          .sort("genre")
+    )
+
+
+def gold_sketch_outputs(gold_path: str, state: pl.DataFrame, layout: dict | None = None) -> dict:
+    """
+    Archivos del tier de sketches para write_gold_outputs: el estado, la tabla publicada y su copia IPC.
+
+    Args:
+        gold_path (str): Carpeta Gold.
+        state (pl.DataFrame): Estado de sketches.
+        layout (dict | None): Cambios sobre GOLD_LAYOUT.
+
+    Returns:
+        dict: Ruta -> (DataFrame, opciones de escritura).
+    """
+    table = gold_sketch_table(state)
+    return {
+        os.path.join(gold_path, GOLD_STATE_DIR, GOLD_SKETCH_STATE): (state, gold_parquet_options(GOLD_SKETCH_STATE, "genre", layout)),
+        os.path.join(gold_path, GOLD_SKETCH_TABLE): (table, gold_parquet_options(GOLD_SKETCH_TABLE, "genre", layout)),
+        gold_ipc_file(gold_path, GOLD_SKETCH_TABLE): (table, {"compression": "uncompressed"}),
+    }
+
+
+def load_gold_sketches(gold_path: str) -> pl.DataFrame:
+    """
+    Lee el estado de sketches de Gold para consultas ad hoc (sketch_quantiles, sketch_top, sketch_distinct).
+
+    Args:
+        gold_path (str): Carpeta Gold.
+
+    Returns:
+        pl.DataFrame: Estado de sketches por género.
+    """
+    return pl.read_parquet(os.path.join(gold_path, GOLD_STATE_DIR, GOLD_SKETCH_STATE))
+
+
+def gold_ipc_file(gold_path: str, file_name: str) -> str:
+    """Ruta de la copia Arrow IPC de una tabla Gold publicada (carpeta GOLD_IPC_DIR)."""
+    return os.path.join(gold_path, GOLD_IPC_DIR, file_name.removesuffix(".parquet") + ".arrow")
+
+
+def gold_read_file(gold_path: str, file_name: str) -> str:
+    """
+    Archivo a leer para una tabla Gold: su copia Arrow IPC si existe y no es más vieja
+    que el Parquet (p. ej. si una ejecución se cortó entre ambas escrituras), si no el Parquet.
+
+    Args:
+        gold_path (str): Carpeta Gold.
+        file_name (str): Tabla publicada (nombre del Parquet).
+
+    Returns:
+        str: Ruta .arrow o .parquet.
+    """
+    parquet = os.path.join(gold_path, file_name)
+    ipc = gold_ipc_file(gold_path, file_name)
+    if os.path.exists(ipc) and (not os.path.exists(parquet) or os.path.getmtime(ipc) >= os.path.getmtime(parquet)):
+        return ipc
+    return parquet
+
+
+def write_gold_outputs(outputs: dict[str, tuple[pl.DataFrame, dict]], max_workers: int | None = None) -> None:
+    """
+    Escribe en paralelo los archivos Gold ya calculados (Polars libera el GIL al escribir).
+
+    Las rutas .arrow se escriben como Arrow IPC sin compresión y después de los
+    Parquet, así una copia IPC nunca es más vieja que su tabla.
+
+    Args:
+        outputs (dict[str, tuple[pl.DataFrame, dict]]): Ruta -> (DataFrame, opciones de write_parquet).
+        max_workers (int | None): Escrituras simultáneas. Si None, una por núcleo.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+        for ipc in (False, True):
+            futures = []
+            for path, (df, options) in outputs.items():
+                if path.endswith(".arrow") != ipc:
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                write = df.write_ipc if ipc else df.write_parquet
+                futures.append(pool.submit(write, path, **options))
+            for future in as_completed(futures):
+                future.result()
+
+
+def write_gold_ipc(gold_path: str, file_names: list[str]) -> None:
+    """
+    Genera las copias Arrow IPC de tablas Gold ya escritas en Parquet (modo streaming).
+
+    Args:
+        gold_path (str): Carpeta Gold.
+        file_names (list[str]): Tablas publicadas.
+    """
+    write_gold_outputs({
+        gold_ipc_file(gold_path, file_name): (pl.read_parquet(os.path.join(gold_path, file_name)), {"compression": "uncompressed"})
+        for file_name in file_names
+    })
+
+
+def gold_manifest_file(gold_path: str, name: str) -> str:
+    """Ruta del manifiesto de un estado de GOLD_STATES."""
+    return os.path.join(gold_path, GOLD_STATE_DIR, GOLD_MANIFEST.format(name))
+
+
+def gold_outputs(gold_path: str, states: list[str] | None = None, sketches: bool | None = None,
+                 genre_file_name: str = "genre_popularity.parquet",
+                 artist_file_name: str = "artist_features.parquet") -> list[str]:
+    """
+    Archivos que escribe aggregate_gold para algunos estados de GOLD_STATES.
+
+    Las muestras, las grillas de densidad y los sketches son por género: se
+    escriben junto con el estado genre.
+
+    Args:
+        gold_path (str): Carpeta Gold.
+        states (list[str] | None): Estados de GOLD_STATES. Si None, todos.
+        sketches (bool | None): Con el tier de sketches. Si None, GOLD_SKETCHES.
+        genre_file_name (str): Nombre del archivo de popularidad por género.
+        artist_file_name (str): Nombre del archivo de características por artista.
+
+    Returns:
+        list[str]: Estados, manifiestos, tablas publicadas y sus copias Arrow IPC.
+    """
+    states = list(GOLD_STATES) if states is None else states
+    sketches = GOLD_SKETCHES if sketches is None else sketches
+    state_files = gold_state_files(gold_path)
+    published = [file_name for file_name, spec in gold_specs(genre_file_name, artist_file_name).items()
+                 if spec["state"] in states]
+    if "genre" in states:
+        published += [*GOLD_SAMPLES, *GOLD_DENSITY]
+    outputs = [*(state_files[name] for name in states), *(gold_manifest_file(gold_path, name) for name in states)]
+    if "genre" in states and sketches:
+        outputs.append(os.path.join(gold_path, GOLD_STATE_DIR, GOLD_SKETCH_STATE))
+        published.append(GOLD_SKETCH_TABLE)
+    return [
+        *outputs,
+        *(os.path.join(gold_path, file_name) for file_name in published),
+        *(gold_ipc_file(gold_path, file_name) for file_name in published),
+    ]
+
+
+def load_gold_manifest(gold_path: str, name: str) -> dict:
+    """
+    Lee el manifiesto de un estado de Gold: tabla Silver de origen y lotes Silver ya aplicados.
+
+    Args:
+        gold_path (str): Carpeta Gold.
+        name (str): Estado de GOLD_STATES.
+
+    Returns:
+        dict: Manifiesto del estado. Vacío si todavía no existe.
+    """
+    manifest_file = gold_manifest_file(gold_path, name)
+    if not os.path.exists(manifest_file):
+        return {}
+    with open(manifest_file, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_gold_manifest(gold_path: str, name: str, silver_file: str, applied_batches: list[str]) -> None:
+    """
+    Guarda el manifiesto de un estado de Gold de forma atómica.
+
+    Args:
+        gold_path (str): Carpeta Gold.
+        name (str): Estado de GOLD_STATES.
+        silver_file (str): Tabla Silver de origen.
+        applied_batches (list[str]): Lotes Silver reflejados en el estado.
+    """
+    manifest_file = gold_manifest_file(gold_path, name)
+    os.makedirs(os.path.dirname(manifest_file), exist_ok=True)
+    manifest = {
+        "silver": os.path.abspath(silver_file),
+        "state_version": GOLD_STATE_VERSION,
+        # Los hashes de las muestras y los sketches dependen de la versión de Polars
+        "polars": pl.__version__,
+        "applied_batches": applied_batches,
+        "updated_at": datetime.now().isoformat(),
+    }
+    tmp_file = manifest_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, manifest_file)
+
+
+def aggregate_gold(silver_file: str | None = None,
+                   gold_path: str | None = None,
+                   genre_file_name: str = "genre_popularity.parquet",
+                   artist_file_name: str = "artist_features.parquet",
+                   layout: dict | None = None,
+                   full: bool = False,
+                   handoff: dict | None = None,
+                   sketches: bool | None = None,
+                   engine: str = "auto",
+                   state_names: list[str] | None = None) -> dict:
+    """
+    Genera las tablas Gold a partir de Silver.
+
+    Gold guarda su estado mergeable (count, sum y sum of squares por cada
+    entrada de GOLD_STATES) y la lista de lotes Silver ya aplicados. En cada ejecución:
+      - si no hay lotes Silver nuevos, no se recalcula nada;
+      - si los lotes nuevos tienen changelog, se pliegan sobre el estado en O(delta);
+      - en cualquier otro caso (primera vez, Silver reconstruido, changelog
+        vencido) se recalcula el estado completo desde Silver.
+
+    Los estados, las muestras de GOLD_SAMPLES y las grillas de GOLD_DENSITY se
+    calculan juntos con pl.collect_all sobre un único scan; las tablas de
+    GOLD_SPECS (las principales y un mart por gráfico del dashboard) se derivan
+    de los estados y todos los archivos se escriben en paralelo. En modo
+    incremental las grillas se pliegan con el changelog y las muestras solo se
+    recalculan para los géneros afectados. Cada tabla publicada tiene además
+    una copia Arrow IPC en GOLD_IPC_DIR para lectura con memory map.
+
+    Cada estado de GOLD_STATES lleva su propio manifiesto, así genre (con las
+    muestras, grillas y sketches, que son por género) y artist se pueden
+    calcular en etapas separadas con state_names.
+
+    Con el tier de sketches activo, los sketches por género (HyperLogLog,
+    histogramas y Count-Min, ver sketch_plans) se calculan en el mismo scan y
+    se combinan con su estado anterior con merge_sketch_state (el HyperLogLog de
+    los géneros con filas eliminadas se recalcula desde Silver).
+
+    Args:
+        silver_file (str | None): Ruta a la tabla Silver (carpeta particionada por género). Si None, se determina automáticamente.
+        gold_path (str | None): Carpeta donde se guardará Gold. Si None, se determina automáticamente.
+        genre_file_name (str): Nombre del archivo de popularidad por género.
+        artist_file_name (str): Nombre del archivo de características por artista.
+        layout (dict | None): Cambios sobre GOLD_LAYOUT (compresión, row groups, estadísticas).
+        full (bool): Si es True, recalcula desde Silver aunque el manifiesto diga que
+            Gold está al día (p. ej. si Silver cambió fuera de los lotes registrados).
+        handoff (dict | None): Datos en memoria de transform_silver (ver scan_handoff):
+            el changelog o la tabla Silver recién escrita se usan sin releerlos.
+        sketches (bool | None): Calcular el tier de sketches. Si None, GOLD_SKETCHES.
+        engine (str): Motor de Polars para los scans de Silver ('streaming' en el modo
+            streaming de run_pipeline: los group_by mantienen solo el estado por grupo).
+        state_names (list[str] | None): Estados de GOLD_STATES a calcular (y sus tablas). Si None, todos.
+
+    Returns:
+        dict: Resumen con mode ('skipped', 'incremental' o 'full'), inputs
+            (archivos leídos), rows_in y rows_out.
+    """
+
+    # 1️⃣ Determinar base_path según script o notebook
+    try:
+        base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+    except NameError:
+        # Notebook
+        base_path = os.path.abspath(os.path.join(os.getcwd(), ".."))
+
+    # 2️⃣ Definir rutas por defecto si no se pasan
+    if silver_file is None:
+        silver_file = os.path.join(base_path, "data", "silver", "SpotifyFeatures_silver")
+    if gold_path is None:
+        gold_path = os.path.join(base_path, "data", "gold")
+
+    # 3️⃣ Crear carpeta Gold si no existe
+    os.makedirs(os.path.join(gold_path, GOLD_STATE_DIR), exist_ok=True)
+
+    # Las muestras, las grillas y los sketches son por género: van con el estado genre
+    state_names = list(GOLD_STATES) if state_names is None else state_names
+    by_genre = "genre" in state_names
+    sketches = (GOLD_SKETCHES if sketches is None else sketches) and by_genre
+    specs = {file_name: spec for file_name, spec in gold_specs(genre_file_name, artist_file_name).items()
+             if spec["state"] in state_names}
+    state_files = {name: f for name, f in gold_state_files(gold_path).items() if name in state_names}
+    table_files = {file_name: os.path.join(gold_path, file_name) for file_name in specs}
+    sample_files = {os.path.join(gold_path, file_name): columns for file_name, columns in GOLD_SAMPLES.items()} if by_genre else {}
+    density_files = {os.path.join(gold_path, file_name): axes for file_name, axes in GOLD_DENSITY.items()} if by_genre else {}
+
+    # 4️⃣ Chequeo de dependencias: ¿qué lotes Silver faltan aplicar? (el mismo conjunto en cada estado)
+    silver_path, output_name = os.path.split(os.path.normpath(silver_file))
+    batches = load_silver_state(silver_path, output_name)["batches"]
+    batch_ids = [batch["batch_id"] for batch in batches]
+    manifests = [load_gold_manifest(gold_path, name) for name in state_names]
+    applied = manifests[0].get("applied_batches", [])
+    outputs = gold_outputs(gold_path, state_names, sketches, genre_file_name, artist_file_name)
+    sketch_file = os.path.join(gold_path, GOLD_STATE_DIR, GOLD_SKETCH_STATE)
+    has_state = (
+        not full
+        and all(os.path.exists(f) for f in outputs)
+        and all(
+            manifest.get("silver") == os.path.abspath(silver_file)
+            and manifest.get("state_version") == GOLD_STATE_VERSION
+            and manifest.get("polars") == pl.__version__
+            and manifest.get("applied_batches") == applied
+            for manifest in manifests
+        )
+        and set(applied) <= set(batch_ids)
+    )
+    pending = [batch for batch in batches if batch["batch_id"] not in applied]
+
+    if has_state and not pending:
+        print("✅ Gold al día, no hay lotes Silver nuevos.")
+        return {"mode": "skipped", "inputs": [], "rows_in": 0, "rows_out": 0}
+
+    changes = [os.path.join(silver_path, batch["changes"]) for batch in pending if batch.get("changes")]
+    incremental = has_state and len(changes) == len(pending) and all(os.path.exists(f) for f in changes)
+
+    if incremental:
+        # 5️⃣ Plegar solo los changelogs pendientes sobre el estado existente (un scan del delta)
+        inputs = changes
+        changes_lf = scan_handoff(changes, handoff)
+        state_plans = {name: plan for name, plan in gold_state_plans(changes_lf, sign=pl.col("_sign")).items()
+                       if name in state_files}
+        sketch = sketch_plans(changes_lf, sign=pl.col("_sign")) if sketches else {}
+        genre_plans = [
+            changes_lf.select(pl.col("genre").cast(pl.String).unique()),
+            # Géneros con claves eliminadas (retracción sin inserción de la misma clave)
+            changes_lf.group_by("track_id", pl.col("genre").cast(pl.String))
+                      .agg(pl.col("_sign").sum())
+                      .filter(pl.col("_sign") < 0)
+                      .select(pl.col("genre").unique()),
+        ] if by_genre else []
+        frames = pl.collect_all([
+            *genre_plans,
+            *state_plans.values(),
+            *(density_plan(changes_lf, x, y, sign=pl.col("_sign")) for x, y in density_files.values()),
+            *sketch.values(),
+        ], engine=engine)
+        genre_frames, delta_states = frames[:len(genre_plans)], frames[len(genre_plans):]
+        states = {
+            name: merge_gold_state(pl.read_parquet(state_files[name]), delta, GOLD_STATES[name]["key"])
+            for name, delta in zip(state_plans, delta_states)
+        }
+        delta_states = delta_states[len(state_plans):]
+        densities = {
+            density_file: merge_gold_state(pl.read_parquet(density_file), delta, ["genre", *axes])
+            for (density_file, axes), delta in zip(density_files.items(), delta_states)
+        }
+        if sketches:
+            delta_sketch = sketch_state(dict(zip(sketch, delta_states[len(density_files):])))
+            sketch = merge_sketch_state(pl.read_parquet(sketch_file), delta_sketch)
+
+        # Las muestras se rehacen solo en los géneros afectados (lectura de sus particiones), y
+        # el HyperLogLog, que no admite retracciones, en los géneros con claves eliminadas
+        samples = {}
+        if by_genre:
+            genres, deleted = (frame.to_series() for frame in genre_frames)
+            silver_genres = pl.scan_parquet(silver_file).filter(pl.col("genre").cast(pl.String).is_in(genres.implode()))
+            rebuild_hll = sketches and not deleted.is_empty()
+            fresh = pl.collect_all([
+                *(sample_plan(silver_genres, columns) for columns in sample_files.values()),
+                *([sketch_plans(silver_genres.filter(pl.col("genre").cast(pl.String).is_in(deleted.implode())))["hll"]]
+                  if rebuild_hll else []),
+            ], engine=engine)
+            if rebuild_hll:
+                sketch = replace_sketch(sketch, "hll", fresh.pop(), deleted)
+            samples = {
+                sample_file: pl.concat([
+                    pl.read_parquet(sample_file).filter(~pl.col("genre").is_in(genres.implode())),
+                    sample,
+                ], how="vertical_relaxed").sort("genre", maintain_order=True)
+                for sample_file, sample in zip(sample_files, fresh)
+            }
+    else:
+        # 5️⃣ Recalcular todo desde Silver: estados, muestras y grillas en un único scan
+        inputs = [silver_file]
+        silver_lf = scan_handoff([silver_file], handoff)
+        state_plans = {name: plan for name, plan in gold_state_plans(silver_lf).items() if name in state_files}
+        sketch = sketch_plans(silver_lf) if sketches else {}
+        frames = pl.collect_all([
+            *state_plans.values(),
+            *(sample_plan(silver_lf, c) for c in sample_files.values()),
+            *(density_plan(silver_lf, x, y) for x, y in density_files.values()),
+            *sketch.values(),
+        ], engine=engine)
+        states = dict(zip(state_plans, frames))
+        frames = frames[len(state_plans):]
+        samples = dict(zip(sample_files, frames[:len(sample_files)]))
+        frames = frames[len(sample_files):]
+        densities = dict(zip(density_files, frames[:len(density_files)]))
+        if sketches:
+            sketch = sketch_state(dict(zip(sketch, frames[len(density_files):])))
+
+    # 6️⃣ Tablas de GOLD_SPECS: proyecciones sobre los estados, sin volver a leer Silver
+    tables = pl.collect_all(gold_table_plans({name: state.lazy() for name, state in states.items()}, specs).values())
+
+    # 7️⃣ Escribir estados, tablas, muestras, grillas y sketches en paralelo (más sus copias Arrow IPC)
+    published = {**dict(zip(table_files.values(), tables)), **samples, **densities}
+    write_gold_outputs({
+        **{state_files[name]: (state, gold_parquet_options(f"{name}.parquet", GOLD_STATES[name]["key"], layout))
+           for name, state in states.items()},
+        **{table_files[file_name]: (table, gold_parquet_options(file_name, GOLD_STATES[specs[file_name]["state"]]["key"], layout))
+           for file_name, table in zip(specs, tables)},
+        **{f: (df, gold_parquet_options(os.path.basename(f), "genre", layout)) for f, df in {**samples, **densities}.items()},
+        **{gold_ipc_file(gold_path, os.path.basename(f)): (df, {"compression": "uncompressed"}) for f, df in published.items()},
+        **(gold_sketch_outputs(gold_path, sketch, layout) if sketches else {}),
+    })
+    if by_genre and not sketches:
+        # Sin el tier, sus archivos quedarían desfasados: al reactivarlo se recalcula completo
+        for f in [sketch_file, os.path.join(gold_path, GOLD_SKETCH_TABLE), gold_ipc_file(gold_path, GOLD_SKETCH_TABLE)]:
+            if os.path.exists(f):
+                os.remove(f)
+    for name in state_files:
+        save_gold_manifest(gold_path, name, silver_file, batch_ids)
+
+    mode = f"incremental ({len(pending)} lotes Silver)" if incremental else "completo"
+    print(f"✅ Gold generado y guardado en: {gold_path} [{mode}]")
+    return {
+        "mode": "incremental" if incremental else "full",
+        "inputs": inputs,
+        "rows_in": scan_handoff(inputs, handoff).select(pl.len()).collect().item(),
+        "rows_out": sum(state.height for state in states.values()),
+    }
@@ -0,0 +1,213 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+import psutil
+
+
+# ------------------------------
+# 📊 Métricas por etapa: tiempos, filas, bytes y memoria
+# ------------------------------
+class RssSampler:
+    """Muestrea en segundo plano el RSS del proceso y guarda el máximo observado."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.process.memory_info().rss)
+
+    def start(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> int:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, self.process.memory_info().rss)
+        return self.peak
+
+
+def path_size(paths: list[str] | None) -> int:
+    """
+    Suma el tamaño en bytes de archivos y carpetas (recursivo).
+
+    Args:
+        paths (list[str] | None): Archivos o carpetas.
+
+    Returns:
+        int: Bytes totales de los que existen.
+    """
+    total = 0
+    for path in paths or []:
+        if os.path.isfile(path):
+            total += os.path.getsize(path)
+        elif os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                total += sum(os.path.getsize(os.path.join(root, f)) for f in files)
+    return total
+
+
+def snapshot_files(paths: list[str] | None) -> dict:
+    """
+    Toma una foto (tamaño, mtime) de los archivos bajo las rutas indicadas.
+
+    Args:
+        paths (list[str] | None): Carpetas o archivos de salida de una etapa.
+
+    Returns:
+        dict: {ruta: (size, mtime_ns)}.
+    """
+    snapshot = {}
+    for path in paths or []:
+        files = [path] if os.path.isfile(path) else [
+            os.path.join(root, f) for root, _, names in os.walk(path) for f in names
+        ]
+        for f in files:
+            stat = os.stat(f)
+            snapshot[f] = (stat.st_size, stat.st_mtime_ns)
+    return snapshot
+
+
+def new_run_metrics(mode: str | None = None) -> dict:
+    """
+    Crea el registro de métricas de una ejecución del pipeline.
+
+    Args:
+        mode (str | None): Modo de la ejecución ('eager' o 'streaming').
+
+    Returns:
+        dict: Registro con run_id, mode, started_at y la lista (vacía) de etapas.
+    """
+    now = datetime.now()
+    return {"run_id": now.strftime("%Y%m%dT%H%M%S%f"), "mode": mode, "started_at": now.isoformat(), "stages": []}
+
+
+def record_skipped_stage(run_metrics: dict, stage: str, status: str, seconds: float = 0.0) -> dict:
+    """
+    Registra una etapa que no se ejecutó: 'cached' (el DAG usó su salida anterior) o
+    'blocked' (falló una etapa de la que depende). No lee ni escribe datos.
+
+    Args:
+        run_metrics (dict): Registro de la ejecución (ver new_run_metrics).
+        stage (str): Nombre de la etapa.
+        status (str): 'cached' o 'blocked'.
+        seconds (float): Tiempo que llevó decidirlo (p. ej. el hash de las entradas).
+
+    Returns:
+        dict: Registro de la etapa.
+    """
+    record = {"stage": stage, "status": status, "rows_in": None, "rows_out": None,
+              "bytes_read": 0, "bytes_written": 0, "seconds": seconds, "peak_rss_bytes": None}
+    run_metrics["stages"].append(record)
+    return record
+
+
+@contextmanager
+def track_stage(run_metrics: dict, stage: str,
+                inputs: list[str] | None = None, outputs: list[str] | None = None):
+    """
+    Mide una etapa del pipeline: duración, pico de RSS, bytes leídos y escritos.
+
+    Los bytes leídos se estiman con el tamaño de `inputs`; los escritos, con
+    los archivos nuevos o modificados bajo `outputs`. Dentro del bloque se
+    pueden completar rows_in, rows_out o corregir bytes_read en el registro.
+
+    Args:
+        run_metrics (dict): Registro de la ejecución (ver new_run_metrics).
+        stage (str): Nombre de la etapa.
+        inputs (list[str] | None): Archivos o carpetas que lee la etapa.
+        outputs (list[str] | None): Carpetas o archivos que escribe la etapa.
+
+    Yields:
+        dict: Registro de la etapa.
+    """
+    record = {"stage": stage, "status": "running", "rows_in": None, "rows_out": None,
+              "bytes_read": path_size(inputs), "bytes_written": 0}
+    before = snapshot_files(outputs)
+    sampler = RssSampler().start()
+    start = time.perf_counter()
+    try:
+        yield record
+        record["status"] = "ok"
+    except Exception as e:
+        record["status"] = "failed"
+        record["error"] = repr(e)
+        raise
+    finally:
+        record["seconds"] = time.perf_counter() - start
+        record["peak_rss_bytes"] = sampler.stop()
+        after = snapshot_files(outputs)
+        record["bytes_written"] = sum(size for f, (size, mtime) in after.items() if before.get(f) != (size, mtime))
+        run_metrics["stages"].append(record)
+        print(f"📊 [{stage}] {record['seconds']:.2f}s, filas {record['rows_in']} -> {record['rows_out']}, "
+              f"leídos {record['bytes_read']:,} B, escritos {record['bytes_written']:,} B, "
+              f"pico RSS {record['peak_rss_bytes'] / 2**20:.0f} MiB")
+
+
+def export_metrics(run_metrics: dict, metrics_path: str,
+                   pushgateway: str | None = None, job: str = "spotify_medallion") -> str:
+    """
+    Exporta las métricas de una ejecución como reporte JSON y para Prometheus.
+
+    Siempre escribe `run-<run_id>.json` y el archivo `spotify_etl.prom` para el
+    textfile collector de node_exporter; si se indica `pushgateway`, además
+    envía las métricas a ese Pushgateway. El grupo del Pushgateway es estable
+    (job y modo): cada ejecución reemplaza a la anterior en lugar de crear un
+    grupo nuevo, y el run_id va como etiqueta de spotify_etl_run_info.
+
+    Args:
+        run_metrics (dict): Registro de la ejecución.
+        metrics_path (str): Carpeta donde se guardan los reportes.
+        pushgateway (str | None): Dirección del Pushgateway (p. ej. 'localhost:9091').
+        job (str): Nombre del job en Prometheus.
+
+    Returns:
+        str: Ruta del reporte JSON.
+    """
+    os.makedirs(metrics_path, exist_ok=True)
+    run_metrics["finished_at"] = datetime.now().isoformat()
+    report_file = os.path.join(metrics_path, f"run-{run_metrics['run_id']}.json")
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(run_metrics, f, indent=2, ensure_ascii=False)
+
+    # prometheus_client solo se importa al exportar
+    from prometheus_client import CollectorRegistry, Gauge, Info, push_to_gateway, write_to_textfile
+
+    registry = CollectorRegistry()
+    gauges = {
+        "seconds": Gauge("spotify_etl_stage_duration_seconds", "Duración de la etapa", ["stage"], registry=registry),
+        "rows_in": Gauge("spotify_etl_stage_rows_in", "Filas leídas por la etapa", ["stage"], registry=registry),
+        "rows_out": Gauge("spotify_etl_stage_rows_out", "Filas escritas por la etapa", ["stage"], registry=registry),
+        "bytes_read": Gauge("spotify_etl_stage_bytes_read", "Bytes leídos por la etapa", ["stage"], registry=registry),
+        "bytes_written": Gauge("spotify_etl_stage_bytes_written", "Bytes escritos por la etapa", ["stage"], registry=registry),
+        "peak_rss_bytes": Gauge("spotify_etl_stage_peak_rss_bytes", "Pico de RSS durante la etapa", ["stage"], registry=registry),
+    }
+    success = Gauge("spotify_etl_stage_success", "1 si la etapa terminó bien (o se usó su salida cacheada)",
+                    ["stage"], registry=registry)
+    cached = Gauge("spotify_etl_stage_cached", "1 si el DAG usó la salida anterior de la etapa", ["stage"], registry=registry)
+    last_run = Gauge("spotify_etl_last_run_timestamp_seconds", "Fin de la última ejecución", registry=registry)
+    run_info = Info("spotify_etl_run", "Ejecución del pipeline", registry=registry)
+    for record in run_metrics["stages"]:
+        for key, gauge in gauges.items():
+            if record.get(key) is not None:
+                gauge.labels(stage=record["stage"]).set(record[key])
+        success.labels(stage=record["stage"]).set(1 if record["status"] in ("ok", "cached") else 0)
+        cached.labels(stage=record["stage"]).set(1 if record["status"] == "cached" else 0)
+    last_run.set_to_current_time()
+    mode = run_metrics.get("mode") or "default"
+    run_info.info({"run_id": run_metrics["run_id"], "mode": mode})
+
+    write_to_textfile(os.path.join(metrics_path, "spotify_etl.prom"), registry)
+    if pushgateway:
+        push_to_gateway(pushgateway, job=job, registry=registry, grouping_key={"mode": mode})
+
+    print(f"📊 Reporte de métricas guardado en: {report_file}")
+    return report_file
@@ -0,0 +1,221 @@
+import os
+import polars as pl
+from .extract import extract_to_raw, iter_raw_files, raw_root
+from .bronze import current_bronze_parts, ingest_bronze_parallel
+from .silver import (
+    SILVER_SCHEMA_VERSION,
+    load_silver_state,
+    pending_bronze_parts,
+    scan_handoff,
+    transform_silver,
+)
+from .gold import (
+    GOLD_SKETCHES,
+    GOLD_STATES,
+    GOLD_STATE_VERSION,
+    aggregate_gold,
+    gold_outputs,
+)
+from .similarity import (
+    ARTIST_INDEX_DIR,
+    ARTIST_SIMILAR_FILE,
+    ARTIST_SIMILAR_K,
+    aggregate_artist_similarity,
+)
+from .metrics import export_metrics, new_run_metrics, path_size
+from .streaming import run_pipeline_streaming
+from .dag import DAG_STATE_FILE, Stage, run_dag
+
+
+# ------------------------------
+# Ejecución del Pipeline
+# ------------------------------
+def run_pipeline(eager: bool = True, max_workers: int | None = None, pushgateway: str | None = None,
+                 base_path: str | None = None, csv_files: list[str] | None = None, source=None,
+                 in_process: bool = True):
+    """
+    Ejecuta todo el pipeline ETL de Spotify: raw -> bronze -> silver -> gold
+    Validando carpetas y archivos en cada paso.
+
+    Cada etapa se mide con track_stage y, al terminar (incluso con error), las
+    métricas se guardan en data/metrics como reporte JSON y archivo .prom.
+
+    Args:
+        eager (bool): Si es True (por defecto), ejecuta cada etapa con DataFrames
+            completos que pasan en memoria a la siguiente. Si es False, usa el modo
+            streaming (run_pipeline_streaming): la memoria queda acotada por el
+            género más grande de Silver en lugar del dataset, a costa de releer
+            Parquet entre etapas (ver benchmark.py).
+        max_workers (int | None): Workers para la ingesta paralela de Bronze en
+            modo eager. Si None, min(archivos, núcleos).
+        pushgateway (str | None): Pushgateway de Prometheus al que enviar las métricas.
+        base_path (str | None): Raíz del proyecto (contiene data/). Si None, se determina automáticamente.
+        csv_files (list[str] | None): CSVs de entrada. Si se indican, se omite la
+            extracción (uso offline, p. ej. benchmarks).
+        source: Fuente de extract_to_raw ('kaggle', 'local:<carpeta>',
+            'mirror:<carpeta>' u objeto fuente). Si None, SPOTIFY_SOURCE o Kaggle.
+            En modo eager, Bronze empieza a convertir cada CSV apenas está disponible.
+        in_process (bool): En modo eager, pasar los DataFrames de cada etapa a la
+            siguiente en memoria (ver scan_handoff) en lugar de releer Parquet.
+
+    Returns:
+        tuple: En modo eager, los DataFrames finales de Bronze (None si ningún
+            CSV cambió desde la última ingesta) y Silver. En modo streaming,
+            scans lazy (pl.LazyFrame) de Bronze y Silver.
+    """
+    # ------------------------------
+    # 1️⃣ Determinar base_path
+    # ------------------------------
+    if base_path is None:
+        try:
+            base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        except NameError:
+            # Modo notebook
+            base_path = os.path.abspath(os.path.join(os.getcwd(), ".."))
+
+    run_metrics = new_run_metrics("eager" if eager else "streaming")
+    try:
+        return _run_pipeline(base_path, run_metrics, eager, max_workers, csv_files, source, in_process)
+    finally:
+        export_metrics(run_metrics, os.path.join(base_path, "data", "metrics"), pushgateway)
+
+
+def _run_pipeline(base_path: str, run_metrics: dict, eager: bool, max_workers: int | None,
+                  csv_files: list[str] | None, source, in_process: bool = True):
+    """Cuerpo de run_pipeline: arma el DAG de etapas y lo ejecuta (ver run_pipeline)."""
+    # ------------------------------
+    # 2️⃣ Definir rutas de carpetas
+    # ------------------------------
+    raw_path = os.path.join(base_path, "data", "raw")
+    bronze_path = os.path.join(base_path, "data", "bronze")
+    silver_path = os.path.join(base_path, "data", "silver")
+    gold_path = os.path.join(base_path, "data", "gold")
+
+    # Crear carpetas si no existen
+    for p in [raw_path, bronze_path, silver_path, gold_path]:
+        os.makedirs(p, exist_ok=True)
+
+    silver_file = os.path.join(silver_path, "SpotifyFeatures_silver")
+    similarity_outputs = [os.path.join(gold_path, ARTIST_SIMILAR_FILE), os.path.join(gold_path, ARTIST_INDEX_DIR)]
+    # Los CSV de la fuente se registran en Bronze por su ruta relativa (ver bronze_key);
+    # una lista explícita de CSV se registra por nombre de archivo
+    source_root = None if csv_files is not None else raw_root(raw_path, source)
+
+    # En proceso (modo eager), cada etapa deja en handoff los DataFrames (Arrow) que escribió y la
+    # siguiente los usa sin releer los archivos; el disco sigue siendo la fuente para reanudar o cachear
+    handoff = {} if in_process and eager else None
+
+    # ------------------------------
+    # 6️⃣ Gold: una etapa por estado de GOLD_STATES (genre y artist), independientes entre sí
+    #    y dependientes solo de Silver (solo se ejecutan si cambió Silver)
+    # ------------------------------
+    def gold_stage(state_name: str):
+        engine = "auto" if eager else "streaming"
+
+        def run(record, results, previous):
+            summary = aggregate_gold(silver_file, gold_path, handoff=handoff, engine=engine, state_names=[state_name])
+            if summary["mode"] == "skipped" and previous is not None:
+                # Silver cambió sin un lote registrado (p. ej. archivos reescritos a mano): recalcular todo
+                summary = aggregate_gold(silver_file, gold_path, full=True, engine=engine, state_names=[state_name])
+            record["bytes_read"] = path_size(summary["inputs"])
+            record["rows_in"], record["rows_out"] = summary["rows_in"], summary["rows_out"]
+        return run
+
+    def gold_stages(silver_stage_name: str) -> list[Stage]:
+        return [
+            Stage(f"aggregate_gold_{name}", gold_stage(name), inputs=[silver_path],
+                  outputs=gold_outputs(gold_path, [name]), deps=[silver_stage_name],
+                  params={"state_version": GOLD_STATE_VERSION, "sketches": GOLD_SKETCHES})
+            for name in GOLD_STATES
+        ]
+
+    # Etapa final de ambos modos: índice de artistas y tabla de similares (solo lee artist_features)
+    def similarity_stage(record, results, previous):
+        summary = aggregate_artist_similarity(gold_path)
+        record["bytes_read"] = path_size(summary["inputs"])
+        record["rows_in"], record["rows_out"] = summary["rows_in"], summary["rows_out"]
+
+    similarity = Stage("artist_similarity", similarity_stage, inputs=[os.path.join(gold_path, "artist_features.parquet")],
+                       outputs=similarity_outputs, deps=["aggregate_gold_artist"], params={"k": ARTIST_SIMILAR_K})
+
+    # ------------------------------
+    # Modo streaming: Bronze -> Silver -> Gold con memoria acotada
+    # ------------------------------
+    if not eager:
+        # 3️⃣ Extraer datos a raw (la fuente decide si hay una versión nueva)
+        def extract_stage(record, results, previous):
+            files = csv_files if csv_files is not None else extract_to_raw(base_path, source)
+            if not files:
+                raise FileNotFoundError("No se encontraron CSVs en raw.")
+            record["rows_out"] = len(files)
+            return files
+
+        # 4️⃣ + 5️⃣ Bronze -> Silver, cacheado por el contenido de los CSV (Gold va en sus propias etapas)
+        def streaming_stage(record, results, previous):
+            df_bronze, df_silver = run_pipeline_streaming(results["extract_to_raw"], bronze_path, silver_path, gold_path,
+                                                          root=source_root, gold=False)
+            record["rows_out"] = df_silver.select(pl.len()).collect().item()
+
+        stages = [
+            Stage("extract_to_raw", extract_stage, outputs=[raw_path], cache=False),
+            Stage("bronze_silver_streaming", streaming_stage, inputs=lambda results: results["extract_to_raw"],
+                  outputs=[bronze_path, silver_path], deps=["extract_to_raw"],
+                  params={"schema_version": SILVER_SCHEMA_VERSION}),
+            *gold_stages("bronze_silver_streaming"),
+            similarity,
+        ]
+        outcome = run_dag(stages, os.path.join(base_path, "data", DAG_STATE_FILE), run_metrics, base_path=base_path)
+        if outcome["bronze_silver_streaming"]["status"] not in ("ok", "cached"):
+            return None, None
+        bronze_files = [os.path.join(bronze_path, part) for part in current_bronze_parts(bronze_path)]
+        return pl.scan_parquet(bronze_files, hive_partitioning=False), pl.scan_parquet(silver_file)
+
+    # ------------------------------
+    # 3️⃣ + 4️⃣ Extraer a raw y cargar Bronze: cada CSV se convierte en cuanto está disponible
+    # ------------------------------
+    def bronze_stage(record, results, previous):
+        files = csv_files if csv_files is not None else iter_raw_files(raw_path, source)
+        report = ingest_bronze_parallel(files, bronze_path, max_workers=max_workers, handoff=handoff, root=source_root)
+        ingested = [r for r in report["files"] if r["status"] == "ingested"]
+        record["bytes_read"] = sum(r["fingerprint"]["size"] for r in ingested)
+        record["rows_in"] = record["rows_out"] = sum(r["rows"] for r in ingested)
+        if not report["files"]:
+            raise FileNotFoundError("No se encontraron CSVs en raw.")
+        if not current_bronze_parts(bronze_path):
+            raise FileNotFoundError("No se pudo cargar ningún archivo en Bronze.")
+        return report["ingested"]
+
+    # ------------------------------
+    # 5️⃣ Transformar Silver (solo si cambió Bronze)
+    # ------------------------------
+    def silver_stage(record, results, previous):
+        pending = [
+            os.path.join(bronze_path, part)
+            for part in pending_bronze_parts(bronze_path, load_silver_state(silver_path, "SpotifyFeatures_silver"))
+        ]
+        record["bytes_read"] = path_size(pending)
+        df_silver = transform_silver(silver_path=silver_path, bronze_path=bronze_path, handoff=handoff)
+        record["rows_in"] = scan_handoff(pending, handoff).select(pl.len()).collect().item() if pending else 0
+        record["rows_out"] = 0 if df_silver is None else len(df_silver)
+        return df_silver
+
+    stages = [
+        Stage("extract_load_bronze", bronze_stage, outputs=[raw_path, bronze_path], cache=False),
+        Stage("transform_silver", silver_stage, inputs=[bronze_path], outputs=[silver_path],
+              deps=["extract_load_bronze"], params={"schema_version": SILVER_SCHEMA_VERSION}),
+        *gold_stages("transform_silver"),
+        similarity,
+    ]
+    outcome = run_dag(stages, os.path.join(base_path, "data", DAG_STATE_FILE), run_metrics, base_path=base_path)
+    if outcome["extract_load_bronze"]["status"] != "ok":
+        return None, None
+
+    ingested = outcome["extract_load_bronze"]["value"]
+    df_bronze = None
+    if ingested:
+        paths = [os.path.join(bronze_path, part) for part in ingested]
+        df_bronze = scan_handoff(paths, handoff, hive_partitioning=False).collect()
+    df_silver = outcome["transform_silver"]["value"] if outcome["transform_silver"]["status"] == "ok" else None
+    if all(o["status"] in ("ok", "cached") for o in outcome.values()):
+        print("✅ Pipeline completado.")
+    return df_bronze, df_silver
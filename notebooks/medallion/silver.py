@@ -0,0 +1,825 @@
+import os
+import glob
+import json
+import shutil
+from datetime import datetime
+from urllib.parse import quote, unquote
+import polars as pl
+from .bronze import load_manifest
+
+
+# ------------------------------
+# Transform Silver: limpieza y guardado incremental
+# ------------------------------
+SILVER_KEY = ["track_id", "genre"]
+SILVER_MANIFEST = "_manifest.json"
+SILVER_MAX_FILES = 8
+SILVER_CHANGES_DIR = "_changes"
+SILVER_CHANGES_RETENTION = 48
+# Primera carga en modo streaming: la tabla se arma aquí y se publica solo si pasa la calidad
+SILVER_STAGING_DIR = "_staging"
+# Layout físico de Silver (particionado por genre). Las filas de cada archivo se ordenan por
+# sort_by, así las estadísticas de cada row group permiten saltar grupos al filtrar por artista.
+SILVER_LAYOUT = {
+    "sort_by": ["artist_name", "track_id"],
+    "compression": "zstd",
+    "compression_level": 3,
+    "row_group_size": 50_000,
+    "statistics": "full",
+}
+LAYOUT_METADATA_KEY = "spotify_medallion.layout"
+
+
+KEYS = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+MODES = ["Major", "Minor"]
+TIME_SIGNATURES = ["0/4", "1/4", "3/4", "4/4", "5/4"]
+AUDIO_FEATURES = ["acousticness", "danceability", "energy", "instrumentalness", "liveness",
+                  "loudness", "speechiness", "tempo", "valence"]
+
+# Esquema declarativo de Silver: tipo destino, valor para nulos y normalización por columna.
+# Las columnas categóricas con dominio cerrado son Enum (un valor fuera del dominio pasa a
+# 'N/A'); los features de audio son Float32, que alcanza para su precisión (0-1, dB, BPM).
+SILVER_SCHEMA = {
+    "genre": {"dtype": pl.Categorical, "fill": "N/A", "normalize": "titlecase"},
+    "artist_name": {"dtype": pl.String, "fill": "N/A", "normalize": "titlecase"},
+    "track_name": {"dtype": pl.String, "fill": "N/A", "normalize": "titlecase"},
+    "track_id": {"dtype": pl.String, "fill": "N/A"},
+    "popularity": {"dtype": pl.Float32, "fill": float("nan")},
+    "key": {"dtype": pl.Enum(KEYS + ["N/A"]), "fill": "N/A"},
+    "mode": {"dtype": pl.Enum(MODES + ["N/A"]), "fill": "N/A"},
+    "time_signature": {"dtype": pl.Enum(TIME_SIGNATURES + ["N/A"]), "fill": "N/A"},
+    **{col: {"dtype": pl.Float32, "fill": float("nan")} for col in AUDIO_FEATURES},
+}
+# Cambia cuando Silver deja de ser compatible con lo ya escrito (fuerza una reconstrucción)
+SILVER_SCHEMA_VERSION = 2
+
+# Reglas de calidad declarativas sobre las columnas ya limpias: "between" marca los valores
+# (no NaN) fuera del rango y "not_in" los valores inválidos. Las filas que violan alguna regla
+# van a cuarentena; si una regla supera max_ratio de las filas del lote, la ejecución falla.
+SILVER_QUARANTINE_DIR = "_quarantine"
+SILVER_QUALITY_MAX_RATIO = 0.05
+SILVER_QUALITY_RULES = {
+    "popularity_range": {"columns": ["popularity"], "between": (0, 100)},
+    "feature_range": {"columns": [c for c in AUDIO_FEATURES if c not in ("loudness", "tempo")], "between": (0, 1)},
+    "tempo_range": {"columns": ["tempo"], "between": (1, 300)},
+    "loudness_range": {"columns": ["loudness"], "between": (-60, 5)},
+    "duration_range": {"columns": ["duration_s"], "between": (1, 3 * 3600)},
+    "missing_key": {"columns": SILVER_KEY, "not_in": ["N/A", ""], "max_ratio": 0.01},
+    "unknown_category": {"columns": ["key", "mode", "time_signature"], "not_in": ["N/A"]},
+}
+
+
+class DataQualityError(Exception):
+    """Un lote Silver superó el umbral de violaciones de alguna regla de SILVER_QUALITY_RULES."""
+
+
+def parquet_options(layout: dict, table: str, sort_by: list[str] | None = None,
+                    partition_by: str | None = None) -> dict:
+    """
+    Traduce un layout a los argumentos de write_parquet / sink_parquet.
+
+    El layout elegido queda registrado como metadata clave-valor de cada
+    archivo Parquet (clave LAYOUT_METADATA_KEY), ver read_layout.
+
+    Args:
+        layout (dict): compression, compression_level, row_group_size y statistics.
+        table (str): Nombre de la tabla.
+        sort_by (list[str] | None): Columnas por las que están ordenadas las filas.
+        partition_by (str | None): Columna de partición Hive, si la hay.
+
+    Returns:
+        dict: Argumentos para write_parquet / sink_parquet.
+    """
+    options = {k: layout[k] for k in ("compression", "compression_level", "row_group_size", "statistics")}
+    description = {"table": table, "partition_by": partition_by, "sort_by": sort_by, **options}
+    return {**options, "metadata": {LAYOUT_METADATA_KEY: json.dumps(description)}}
+
+
+def read_layout(path: str) -> dict | None:
+    """
+    Lee el layout registrado en un archivo Parquet (o en el primero de una tabla particionada).
+
+    Args:
+        path (str): Archivo Parquet o carpeta de una tabla.
+
+    Returns:
+        dict | None: Layout, o None si el archivo no lo tiene.
+    """
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, "**", "*.parquet"), recursive=True))
+        if not files:
+            return None
+        path = files[0]
+    layout = pl.read_parquet_metadata(path).get(LAYOUT_METADATA_KEY)
+    return json.loads(layout) if layout else None
+
+
+def scan_handoff(paths: list[str], handoff: dict | None = None, **scan_kwargs) -> pl.LazyFrame:
+    """
+    Plan lazy sobre archivos Parquet, usando la copia en memoria de los que estén en handoff.
+
+    En el modo en proceso (run_pipeline eager) cada etapa deja en handoff los
+    DataFrames que acaba de escribir; la etapa siguiente los usa directamente
+    (son buffers Arrow, no se copian) en lugar de releer y deserializar el archivo.
+
+    Args:
+        paths (list[str]): Archivos o carpetas Parquet.
+        handoff (dict | None): {ruta absoluta: DataFrame} con lo ya escrito en esta ejecución.
+        **scan_kwargs: Argumentos de pl.scan_parquet para los archivos que se leen de disco.
+
+    Returns:
+        pl.LazyFrame: Plan con todas las filas.
+    """
+    handoff = handoff or {}
+    plans = [
+        handoff[os.path.abspath(path)].lazy() if os.path.abspath(path) in handoff
+        else pl.scan_parquet(path, **scan_kwargs)
+        for path in paths
+    ]
+    return pl.concat(plans, how="vertical_relaxed") if len(plans) > 1 else plans[0]
+
+
+def silver_column(col: str, dtype: pl.DataType) -> pl.Expr:
+    """
+    Compila la regla de SILVER_SCHEMA de una columna a una expresión.
+
+    Las columnas que no están en el esquema siguen la regla genérica: los
+    strings se completan con 'N/A' y pasan a title case; los numéricos, a
+    Float64 con NaN en lugar de nulos.
+
+    Args:
+        col (str): Nombre de la columna.
+        dtype (pl.DataType): Tipo de la columna en Bronze.
+
+    Returns:
+        pl.Expr: Expresión con el tipo, los nulos y la normalización de Silver.
+    """
+    rule = SILVER_SCHEMA.get(col)
+    if rule is None:
+        if dtype == pl.String:
+            return pl.col(col).fill_null("N/A").str.to_titlecase()
+        if dtype.is_numeric():
+            return pl.col(col).cast(pl.Float64).fill_null(float("nan"))
+        return pl.col(col)
+
+    target, fill = rule["dtype"], rule["fill"]
+    expr = pl.col(col)
+    if isinstance(target, pl.Enum):
+        # strict=False: los valores fuera del dominio quedan nulos y se completan con fill
+        return expr.cast(pl.String).cast(target, strict=False).fill_null(pl.lit(fill, dtype=target))
+    if target.is_numeric():
+        return expr.cast(target).fill_null(fill)
+    expr = expr.cast(pl.String).fill_null(fill)
+    if rule.get("normalize") == "titlecase":
+        expr = expr.str.to_titlecase()
+    return expr.cast(target)
+
+
+def quality_rule(rule: dict, schema: pl.Schema) -> pl.Expr | None:
+    """
+    Compila una regla de SILVER_QUALITY_RULES a una expresión booleana (True = viola la regla).
+
+    Args:
+        rule (dict): Regla con columns y between o not_in.
+        schema (pl.Schema): Esquema Silver.
+
+    Returns:
+        pl.Expr | None: Expresión de la regla, o None si ninguna de sus columnas existe.
+    """
+    columns = [c for c in rule["columns"] if c in schema]
+    if not columns:
+        return None
+    if "between" in rule:
+        low, high = rule["between"]
+        checks = [pl.col(c).is_not_nan() & ~pl.col(c).is_between(low, high) for c in columns]
+    else:
+        checks = [pl.col(c).cast(pl.String).is_in(rule["not_in"]) for c in columns]
+    return pl.any_horizontal(checks).fill_null(True)
+
+
+def silver_rows(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Proyección Bronze -> Silver fila a fila, sin deduplicar.
+
+    Tipos, nulos, normalización y columnas derivadas se aplican en una única
+    proyección compilada desde SILVER_SCHEMA. No necesita ver todo el lote, así
+    que el motor streaming la ejecuta con memoria acotada.
+
+    Args:
+        lf (pl.LazyFrame): Plan con los datos Bronze.
+
+    Returns:
+        pl.LazyFrame: Plan con las columnas Silver.
+    """
+    schema = lf.collect_schema()
+
+    # Una sola pasada: limpieza por esquema + timestamp + duration_s (sin duration_ms)
+    columns = [silver_column(col, dtype) for col, dtype in schema.items() if col != "duration_ms"]
+    columns.append(pl.lit(datetime.now()).cast(pl.Datetime("us")).alias("processed_timestamp"))
+    if "duration_ms" in schema:
+        columns.append((pl.col("duration_ms") / 1000).cast(pl.Float32).alias("duration_s"))
+    return lf.select(columns)
+
+
+def silver_quality(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Agrega una columna booleana `_dq_<regla>` por cada regla de SILVER_QUALITY_RULES.
+
+    Args:
+        lf (pl.LazyFrame): Plan con columnas Silver.
+
+    Returns:
+        pl.LazyFrame: Plan con las marcas de calidad (ver split_quality).
+    """
+    schema = lf.collect_schema()
+    checks = {name: quality_rule(rule, schema) for name, rule in SILVER_QUALITY_RULES.items()}
+    return lf.with_columns(expr.alias(f"_dq_{name}") for name, expr in checks.items() if expr is not None)
+
+
+def silver_plan(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """
+    Construye el plan lazy de limpieza Bronze -> Silver.
+
+    Es compartido por el modo eager (transform_silver) y el modo streaming
+    (run_pipeline_streaming), de modo que ambos producen el mismo Silver:
+    silver_rows, duplicados por clave y silver_quality.
+
+    Los duplicados se resuelven por orden: `lf` debe concatenar las particiones
+    Bronze en orden de ingesta (ver pending_bronze_parts), así la última fila de
+    cada clave es la de la ingesta más reciente sin ordenar todo el lote.
+
+    Args:
+        lf (pl.LazyFrame): Plan con los datos Bronze.
+
+    Returns:
+        pl.LazyFrame: Plan con las transformaciones Silver y las marcas de calidad.
+    """
+    return silver_quality(silver_rows(lf).unique(subset=SILVER_KEY, keep="last"))
+
+
+def split_quality(lf: pl.LazyFrame) -> tuple[pl.LazyFrame, pl.LazyFrame, pl.LazyFrame]:
+    """
+    Separa un plan de silver_plan en filas válidas, cuarentena y conteo de violaciones.
+
+    Los tres planes comparten el mismo origen; ejecutados juntos con
+    pl.collect_all se calculan en una sola pasada.
+
+    Args:
+        lf (pl.LazyFrame): Plan devuelto por silver_plan.
+
+    Returns:
+        tuple[pl.LazyFrame, pl.LazyFrame, pl.LazyFrame]: Filas válidas (sin marcas),
+            filas en cuarentena (con la lista _violations) y una fila con el total
+            de filas y las violaciones por regla.
+    """
+    flags = [c for c in lf.collect_schema() if c.startswith("_dq_")]
+    invalid = pl.any_horizontal(flags) if flags else pl.lit(False)
+    violations = pl.concat_list(
+        [pl.when(pl.col(f)).then(pl.lit(f[len("_dq_"):])) for f in flags]
+    ).list.drop_nulls() if flags else pl.lit([], dtype=pl.List(pl.String))
+    clean = lf.filter(~invalid).drop(flags)
+    quarantine = lf.filter(invalid).with_columns(violations.alias("_violations")).drop(flags)
+    report = lf.select(pl.len().alias("rows"), *[pl.col(f).sum().alias(f[len("_dq_"):]) for f in flags])
+    return clean, quarantine, report
+
+
+def check_quality(report: pl.DataFrame, silver_path: str, output_name: str, batch_id: str,
+                  quarantine: pl.DataFrame, thresholds: dict | None = None) -> dict:
+    """
+    Guarda la cuarentena y el reporte de violaciones de un lote, y aplica los umbrales.
+
+    Args:
+        report (pl.DataFrame): Conteos devueltos por split_quality.
+        silver_path (str): Carpeta Silver.
+        output_name (str): Nombre de la tabla Silver.
+        batch_id (str): Identificador del lote.
+        quarantine (pl.DataFrame): Filas que violan alguna regla.
+        thresholds (dict | None): max_ratio por regla, sobre el de SILVER_QUALITY_RULES.
+
+    Returns:
+        dict: Reporte con rows, quarantined, violations por regla, quarantine y report
+            (rutas relativas a la carpeta Silver).
+
+    Raises:
+        DataQualityError: Si alguna regla supera su umbral (la cuarentena y el reporte ya quedaron guardados).
+    """
+    counts = report.row(0, named=True)
+    rows = counts.pop("rows")
+    quality_path = os.path.join(SILVER_QUARANTINE_DIR, output_name)
+    os.makedirs(os.path.join(silver_path, quality_path), exist_ok=True)
+    result = {"rows": rows, "quarantined": quarantine.height, "violations": counts, "quarantine": None,
+              "report": os.path.join(quality_path, f"batch-{batch_id}.json")}
+    if quarantine.height:
+        result["quarantine"] = os.path.join(quality_path, f"batch-{batch_id}.parquet")
+        quarantine.write_parquet(os.path.join(silver_path, result["quarantine"]))
+
+    thresholds = thresholds or {}
+    failed = [
+        name for name, count in counts.items()
+        if rows and count / rows > thresholds.get(name, SILVER_QUALITY_RULES[name].get("max_ratio", SILVER_QUALITY_MAX_RATIO))
+    ]
+    result["failed"] = failed
+    with open(os.path.join(silver_path, result["report"]), "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    summary = ", ".join(f"{name}={count}" for name, count in counts.items() if count) or "sin violaciones"
+    print(f"{'❌' if failed else '✅'} Calidad Silver: {quarantine.height} de {rows} filas en cuarentena ({summary})")
+    if failed:
+        raise DataQualityError(f"Reglas sobre el umbral en el lote {batch_id}: {', '.join(failed)} "
+                               f"(ver {os.path.join(silver_path, result['report'])})")
+    return result
+
+
+def load_silver_state(silver_path: str, output_name: str) -> dict:
+    """
+    Lee el estado de una tabla Silver: particiones Bronze ya procesadas y lotes aplicados.
+
+    Args:
+        silver_path (str): Carpeta Silver.
+        output_name (str): Nombre de la tabla Silver.
+
+    Returns:
+        dict: Estado con schema_version, processed_parts y batches. Vacío si la
+            tabla no existe o fue escrita con otra versión de SILVER_SCHEMA.
+    """
+    manifest_file = os.path.join(silver_path, SILVER_MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_file):
+        with open(manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+    empty = {"schema_version": SILVER_SCHEMA_VERSION, "processed_parts": [], "batches": []}
+    state = manifest.get(output_name, empty)
+    # Si la tabla fue borrada a mano, el estado ya no es válido
+    if not os.path.isdir(os.path.join(silver_path, output_name)):
+        state = empty
+    # Una tabla escrita con otro esquema no se puede actualizar con upsert: se reconstruye
+    elif state.get("schema_version", 1) != SILVER_SCHEMA_VERSION:
+        print(f"⚠️ {output_name} usa otra versión del esquema Silver; se reconstruye desde Bronze.")
+        state = empty
+    return state
+
+
+def save_silver_state(silver_path: str, output_name: str, state: dict) -> None:
+    """
+    Guarda el estado de una tabla Silver en el manifiesto de Silver (escritura atómica).
+
+    Args:
+        silver_path (str): Carpeta Silver.
+        output_name (str): Nombre de la tabla Silver.
+        state (dict): Estado a guardar.
+    """
+    manifest_file = os.path.join(silver_path, SILVER_MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_file):
+        with open(manifest_file, encoding="utf-8") as f:
+            manifest = json.load(f)
+    manifest[output_name] = state
+    tmp_file = manifest_file + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, manifest_file)
+
+
+def bronze_entries(bronze_path: str, dataset: str = "SpotifyFeatures_bronze") -> list[dict]:
+    """Entradas del manifiesto de Bronze de un dataset, en orden de ingesta de su partición vigente."""
+    entries = [entry for entry in load_manifest(bronze_path).values() if entry["dataset"] == dataset and entry["parts"]]
+    return sorted(entries, key=lambda entry: entry["ingest_timestamp"])
+
+
+def pending_bronze_parts(bronze_path: str, state: dict, dataset: str = "SpotifyFeatures_bronze") -> list[str]:
+    """
+    Devuelve las particiones Bronze vigentes de un dataset que Silver todavía no procesó.
+
+    Solo cuenta la última partición de cada CSV: las anteriores quedaron
+    reemplazadas por ella, así que una carga completa (o una reconstrucción por
+    cambio de esquema) se arma solo con las particiones vigentes.
+
+    Args:
+        bronze_path (str): Carpeta Bronze.
+        state (dict): Estado de la tabla Silver (ver load_silver_state).
+        dataset (str): Nombre del dataset Bronze.
+
+    Returns:
+        list[str]: Rutas relativas a la carpeta Bronze, en orden de ingesta.
+    """
+    processed = set(state["processed_parts"])
+    return [entry["parts"][-1] for entry in bronze_entries(bronze_path, dataset) if entry["parts"][-1] not in processed]
+
+
+def silver_keys(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Claves Silver (track_id, genre como String) de un plan Bronze, normalizadas como en silver_rows."""
+    schema = lf.collect_schema()
+    return lf.select(silver_column(col, schema[col]).cast(pl.String).alias(col) for col in SILVER_KEY)
+
+
+def silver_retractions(bronze_path: str, state: dict, parts: list[str],
+                       dataset: str = "SpotifyFeatures_bronze",
+                       handoff: dict | None = None) -> tuple[pl.LazyFrame | None, pl.DataFrame]:
+    """
+    Claves que un lote debe retractar de Silver porque su CSV ya no las trae.
+
+    Cuando un CSV cambia, su partición anterior (la última que Silver procesó)
+    deja de estar vigente: las claves que tenía y que la partición nueva ya no
+    trae se eliminan de Silver, igual que en un recálculo desde las particiones
+    vigentes. Si otro CSV vigente tiene la misma clave, su fila vuelve a Silver
+    en lugar de eliminarse.
+
+    Args:
+        bronze_path (str): Carpeta Bronze.
+        state (dict): Estado de la tabla Silver.
+        parts (list[str]): Particiones pendientes del lote (ver pending_bronze_parts).
+        dataset (str): Nombre del dataset Bronze.
+        handoff (dict | None): Datos en memoria de la etapa anterior (ver scan_handoff).
+
+    Returns:
+        tuple[pl.LazyFrame | None, pl.DataFrame]: Plan Bronze con las filas de otros CSV
+            que vuelven a Silver (None si no hay) y claves candidatas a eliminar
+            (ver silver_deletes).
+    """
+    processed = set(state["processed_parts"])
+    entries = bronze_entries(bronze_path, dataset)
+    superseded = [
+        next(part for part in reversed(entry["parts"]) if part in processed)
+        for entry in entries
+        if entry["parts"][-1] in parts and any(part in processed for part in entry["parts"])
+    ]
+    empty = pl.DataFrame(schema={col: pl.String for col in SILVER_KEY})
+    if not superseded:
+        return None, empty
+
+    def scan(paths: list[str]) -> pl.LazyFrame:
+        return scan_handoff([os.path.join(bronze_path, part) for part in paths], handoff, hive_partitioning=False)
+
+    candidates = silver_keys(scan(superseded)).unique().join(silver_keys(scan(parts)), on=SILVER_KEY, how="anti").collect()
+    others = [entry["parts"][-1] for entry in entries if entry["parts"][-1] not in parts]
+    if candidates.is_empty() or not others:
+        return None, candidates
+    others_lf = scan(others)
+    schema = others_lf.collect_schema()
+    revived = others_lf.join(
+        candidates.lazy(),
+        left_on=[silver_column(col, schema[col]).cast(pl.String) for col in SILVER_KEY],
+        right_on=SILVER_KEY,
+        how="semi",
+    )
+    return revived, candidates
+
+
+def silver_deletes(candidates: pl.DataFrame, delta: pl.DataFrame, quarantine: pl.DataFrame) -> pl.DataFrame:
+    """
+    Claves a eliminar de Silver en un lote: las candidatas de silver_retractions y las
+    que llegaron en una versión que fue a cuarentena, salvo las que el delta vuelve a escribir.
+
+    Args:
+        candidates (pl.DataFrame): Claves candidatas (ver silver_retractions).
+        delta (pl.DataFrame): Filas válidas del lote.
+        quarantine (pl.DataFrame): Filas del lote en cuarentena.
+
+    Returns:
+        pl.DataFrame: Claves (track_id, genre como String).
+    """
+    def keys(df: pl.DataFrame) -> pl.DataFrame:
+        return df.select(pl.col(col).cast(pl.String) for col in SILVER_KEY)
+
+    return pl.concat([candidates, keys(quarantine)]).unique().join(keys(delta), on=SILVER_KEY, how="anti")
+
+
+def silver_partition_dir(silver_root: str, genre: str) -> str:
+    """
+    Ruta de la partición Hive de un género.
+
+    Polars y urllib no escapan exactamente los mismos caracteres, así que
+    primero se busca una carpeta existente cuyo valor decodificado coincida.
+
+    Args:
+        silver_root (str): Carpeta de la tabla Silver.
+        genre (str): Valor del género.
+
+    Returns:
+        str: Carpeta 'genre=<valor>' de la partición.
+    """
+    if os.path.isdir(silver_root):
+        for name in os.listdir(silver_root):
+            if name.startswith("genre=") and unquote(name[len("genre="):]) == genre:
+                return os.path.join(silver_root, name)
+    return os.path.join(silver_root, f"genre={quote(genre, safe='')}")
+
+
+def merge_silver(delta: pl.DataFrame, silver_root: str, batch_id: str,
+                 layout: dict | None = None, deletes: pl.DataFrame | None = None) -> tuple[dict, pl.DataFrame]:
+    """
+    Hace upsert de un delta Silver en la tabla particionada por género.
+
+    La clave de negocio (track_id, genre) incluye la columna de partición, así
+    que cada fila del delta solo puede reemplazar filas de su propia partición.
+    Dentro de ella, solo se reescriben los archivos que contienen alguna clave
+    del delta o de deletes (se lee únicamente la columna track_id para detectarlo)
+    y las filas nuevas se agregan como un archivo más. Si una partición acumula
+    más de SILVER_MAX_FILES archivos, se compacta en uno solo. Cada archivo se
+    escribe ordenado y con las opciones del layout.
+
+    Args:
+        delta (pl.DataFrame): Filas Silver nuevas, ya deduplicadas por SILVER_KEY.
+        silver_root (str): Carpeta de la tabla Silver.
+        batch_id (str): Identificador del lote (se usa en el nombre del archivo).
+        layout (dict | None): Cambios sobre SILVER_LAYOUT.
+        deletes (pl.DataFrame | None): Claves (track_id, genre) a eliminar (ver silver_deletes).
+
+    Returns:
+        tuple[dict, pl.DataFrame]: Filas insertadas, reemplazadas y eliminadas y géneros
+            afectados, y las versiones anteriores de las filas reemplazadas o eliminadas.
+    """
+    layout = {**SILVER_LAYOUT, **(layout or {})}
+    options = parquet_options(layout, os.path.basename(silver_root), layout["sort_by"], "genre")
+    stats = {"inserted": 0, "replaced": 0, "deleted": 0, "genres": []}
+    retracted = [delta.clear()]
+    upserts = {genre: df for (genre,), df in delta.partition_by("genre", as_dict=True).items()}
+    removals = {}
+    if deletes is not None and not deletes.is_empty():
+        removals = {genre: df.get_column("track_id")
+                    for (genre,), df in deletes.partition_by("genre", as_dict=True).items()}
+    for genre in sorted(set(upserts) | set(removals)):
+        delta_genre = upserts.get(genre, delta.clear())
+        part_dir = silver_partition_dir(silver_root, genre)
+        replaced = delta_genre.get_column("track_id")
+        keys = pl.concat([replaced, removals.get(genre, replaced.clear())]).unique()
+
+        for existing in sorted(glob.glob(os.path.join(part_dir, "*.parquet"))):
+            hits = (
+                pl.scan_parquet(existing, hive_partitioning=False)
+                  .filter(pl.col("track_id").is_in(keys.implode()))
+                  .select(pl.len())
+                  .collect()
+                  .item()
+            )
+            if hits == 0:
+                continue
+            old = pl.read_parquet(existing, hive_partitioning=False)
+            kept = old.filter(~pl.col("track_id").is_in(keys.implode()))
+            removed = old.filter(pl.col("track_id").is_in(keys.implode()))
+            retracted.append(removed)
+            replaced_hits = removed.filter(pl.col("track_id").is_in(replaced.implode())).height
+            stats["replaced"] += replaced_hits
+            stats["deleted"] += hits - replaced_hits
+            if kept.is_empty():
+                os.remove(existing)
+            else:
+                kept.write_parquet(existing + ".tmp", **options)
+                os.replace(existing + ".tmp", existing)
+
+        if delta_genre.is_empty():
+            # Solo eliminaciones: una partición que queda vacía desaparece
+            if os.path.isdir(part_dir):
+                if not os.listdir(part_dir):
+                    os.rmdir(part_dir)
+                stats["genres"].append(genre)
+            continue
+        os.makedirs(part_dir, exist_ok=True)
+        delta_genre.sort(layout["sort_by"]).write_parquet(os.path.join(part_dir, f"part-{batch_id}.parquet"), **options)
+        stats["inserted"] += len(delta_genre)
+        stats["genres"].append(genre)
+
+        # Compactar particiones con demasiados archivos pequeños
+        files = sorted(glob.glob(os.path.join(part_dir, "*.parquet")))
+        if len(files) > SILVER_MAX_FILES:
+            compacted = pl.read_parquet(files, hive_partitioning=False).sort(layout["sort_by"])
+            compacted_file = os.path.join(part_dir, f"part-{batch_id}-compacted.parquet")
+            compacted.write_parquet(compacted_file, **options)
+            for f in files:
+                os.remove(f)
+
+    stats["inserted"] -= stats["replaced"]
+    return stats, pl.concat(retracted, how="vertical_relaxed")
+
+
+def write_silver_changes(silver_path: str, output_name: str, batch_id: str,
+                         delta: pl.DataFrame, retracted: pl.DataFrame, handoff: dict | None = None) -> str:
+    """
+    Guarda el changelog de un lote Silver para que Gold lo pueda plegar en O(delta).
+
+    Las filas nuevas llevan _sign = +1 y las versiones reemplazadas o eliminadas _sign = -1.
+
+    Args:
+        silver_path (str): Carpeta Silver.
+        output_name (str): Nombre de la tabla Silver.
+        batch_id (str): Identificador del lote.
+        delta (pl.DataFrame): Filas integradas en Silver.
+        retracted (pl.DataFrame): Filas reemplazadas o eliminadas (devueltas por merge_silver).
+        handoff (dict | None): Si se indica, el changelog queda también en memoria para Gold.
+
+    Returns:
+        str: Ruta del changelog, relativa a la carpeta Silver.
+    """
+    changes = pl.concat([
+        delta.with_columns(pl.lit(1, pl.Int8).alias("_sign")),
+        retracted.select(delta.columns).with_columns(pl.lit(-1, pl.Int8).alias("_sign")),
+    ], how="vertical_relaxed")
+    changes_file = os.path.join(SILVER_CHANGES_DIR, output_name, f"batch-{batch_id}.parquet")
+    changes.write_parquet(os.path.join(silver_path, changes_file), mkdir=True)
+    if handoff is not None:
+        handoff[os.path.abspath(os.path.join(silver_path, changes_file))] = changes
+    return changes_file
+
+
+def prune_silver_changes(silver_path: str, state: dict) -> None:
+    """
+    Elimina los changelogs más antiguos que SILVER_CHANGES_RETENTION lotes.
+
+    Un consumidor que quede más atrasado que la retención recalcula desde Silver.
+
+    Args:
+        silver_path (str): Carpeta Silver.
+        state (dict): Estado de la tabla Silver (se modifica en sitio).
+    """
+    for batch in state["batches"][:-SILVER_CHANGES_RETENTION]:
+        if batch.get("changes"):
+            changes_file = os.path.join(silver_path, batch["changes"])
+            if os.path.exists(changes_file):
+                os.remove(changes_file)
+            batch["changes"] = None
+
+
+def record_silver_batch(state: dict, batch_id: str, parts: list[str], stats: dict,
+                        changes: str | None = None, quality: dict | None = None) -> None:
+    """
+    Registra un lote aplicado en el estado de Silver.
+
+    Args:
+        state (dict): Estado de la tabla Silver (se modifica en sitio).
+        batch_id (str): Identificador del lote.
+        parts (list[str]): Particiones Bronze procesadas (rutas relativas).
+        stats (dict): Resultado de merge_silver.
+        changes (str | None): Changelog del lote (ver write_silver_changes). None en cargas completas.
+        quality (dict | None): Reporte de calidad del lote (ver check_quality).
+    """
+    state["processed_parts"].extend(p for p in parts if p not in state["processed_parts"])
+    state["batches"].append({"batch_id": batch_id, "bronze_parts": parts, "changes": changes, **stats,
+                             "quality": quality})
+
+
+def transform_silver(bronze_file: str | list[str] | None = None,
+                     silver_path: str | None = None,
+                     output_name: str = "SpotifyFeatures_silver",
+                     bronze_path: str | None = None,
+                     layout: dict | None = None,
+                     quality_thresholds: dict | None = None,
+                     handoff: dict | None = None) -> pl.DataFrame | None:
+    """
+    Limpieza y transformación incremental de Bronze a Silver.
+
+    Solo se procesan las particiones Bronze que Silver todavía no vio. El delta
+    se deduplica por la clave de negocio (track_id, genre), conservando la
+    ingesta más reciente, y se integra con upsert en la tabla Silver
+    particionada por género (`<output_name>/genre=<valor>/*.parquet`). Las
+    claves que un CSV modificado ya no trae se eliminan (ver silver_retractions),
+    así Silver coincide con un recálculo desde las particiones vigentes. El costo
+    depende del tamaño del delta, no del histórico.
+
+    En la misma pasada se evalúan las reglas de SILVER_QUALITY_RULES: las filas
+    que violan alguna van a `_quarantine/<output_name>/batch-<id>.parquet` junto
+    con un reporte de violaciones por regla. Si alguna regla supera su umbral,
+    se lanza DataQualityError antes de tocar la tabla Silver.
+
+    Args:
+        bronze_file (str | list[str] | None): Particiones Bronze a procesar (solo upsert, sin
+            eliminaciones). Si None, se usan las pendientes según el manifiesto de Bronze.
+        silver_path (str | None): Carpeta donde se guardará Silver. Si None, se determina automáticamente.
+        output_name (str): Nombre de la tabla Silver a guardar.
+        bronze_path (str | None): Carpeta Bronze. Si None, se determina automáticamente.
+        layout (dict | None): Cambios sobre SILVER_LAYOUT (orden, compresión, row groups, estadísticas).
+        quality_thresholds (dict | None): max_ratio por regla de calidad, sobre los de SILVER_QUALITY_RULES.
+        handoff (dict | None): Datos en memoria de la etapa anterior (ver scan_handoff). Las
+            particiones Bronze que estén ahí no se releen; el changelog (o, en la primera
+            carga, la tabla completa) se agrega para Gold.
+
+    Returns:
+        pl.DataFrame | None: Delta integrado en Silver, o None si no había particiones pendientes.
+
+    Raises:
+        DataQualityError: Si el lote supera el umbral de alguna regla de calidad.
+    """
+    # Determinar base_path si es necesario
+    if bronze_path is None or silver_path is None:
+        try:
+            base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        except NameError:
+            # Modo notebook
+            base_path = os.path.abspath(os.path.join(os.getcwd(), ".."))
+        if bronze_path is None:
+            bronze_path = os.path.join(base_path, "data", "bronze")
+        if silver_path is None:
+            silver_path = os.path.join(base_path, "data", "silver")
+
+    # 1️⃣ Determinar las particiones Bronze pendientes
+    state = load_silver_state(silver_path, output_name)
+    if bronze_file is None:
+        parts = pending_bronze_parts(bronze_path, state)
+    else:
+        parts = [bronze_file] if isinstance(bronze_file, str) else list(bronze_file)
+        parts = [os.path.relpath(part, bronze_path) for part in parts]
+    if not parts:
+        print("✅ Silver al día, no hay particiones Bronze nuevas.")
+        return None
+
+    # 2️⃣ Leer solo el delta desde Bronze (la columna de partición ingest_date no forma parte de los datos),
+    #    precedido por las filas de otros CSV que vuelven a Silver al retractarse una clave
+    lf = scan_handoff([os.path.join(bronze_path, part) for part in parts], handoff, hive_partitioning=False)
+    revived, candidates = silver_retractions(bronze_path, state, parts, handoff=handoff) \
+        if bronze_file is None and state["batches"] else (None, None)
+    if revived is not None:
+        lf = pl.concat([revived, lf], how="vertical_relaxed")
+
+    # 3️⃣ Limpieza según SILVER_SCHEMA (tipos, nulos, title case, duplicados por clave, duration_s)
+    #    y reglas de calidad, en la misma pasada
+    batch_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    df, quarantine, report = pl.collect_all(split_quality(silver_plan(lf)))
+    quality = check_quality(report, silver_path, output_name, batch_id, quarantine, quality_thresholds)
+
+    # 4️⃣ Upsert en la tabla Silver particionada (una primera carga parte de una tabla vacía)
+    silver_root = os.path.join(silver_path, output_name)
+    if not state["batches"]:
+        shutil.rmtree(silver_root, ignore_errors=True)
+    os.makedirs(silver_root, exist_ok=True)
+    deletes = silver_deletes(candidates, df, quarantine) if candidates is not None else None
+    stats, retracted = merge_silver(df, silver_root, batch_id, layout, deletes)
+
+    # 5️⃣ Changelog para Gold (la primera carga no lo necesita: Gold la calcula completa)
+    changes = write_silver_changes(silver_path, output_name, batch_id, df, retracted, handoff) if state["batches"] else None
+    if handoff is not None and not state["batches"]:
+        handoff[os.path.abspath(silver_root)] = df
+    record_silver_batch(state, batch_id, parts, stats, changes, quality)
+    prune_silver_changes(silver_path, state)
+    save_silver_state(silver_path, output_name, state)
+
+    print(f"✅ Transformación a Silver completada: {silver_root} "
+          f"({stats['inserted']} filas nuevas, {stats['replaced']} actualizadas, {stats['deleted']} eliminadas)")
+    return df
+
+
+def load_silver_streaming(lf: pl.LazyFrame, silver_path: str, output_name: str, batch_id: str,
+                          layout: dict | None = None, quality_thresholds: dict | None = None) -> tuple[dict, dict]:
+    """
+    Primera carga de Silver con memoria acotada (modo streaming de run_pipeline).
+
+    1. El motor streaming aplica silver_rows y reparte las filas por género en
+       `_staging/` (PartitionByKey conserva el orden, es decir, el de ingesta).
+    2. Cada género se deduplica por clave, se evalúa con las reglas de calidad y
+       se escribe ordenado según el layout: la memoria queda acotada por el género
+       más grande, no por el dataset. La clave incluye genre, así que el resultado
+       es el mismo que el de silver_plan sobre todo el lote.
+    3. check_quality se aplica sobre el total y recién entonces la tabla armada
+       reemplaza a la anterior: un lote que no pasa la calidad no publica nada.
+
+    Args:
+        lf (pl.LazyFrame): Particiones Bronze del lote, en orden de ingesta.
+        silver_path (str): Carpeta Silver.
+        output_name (str): Nombre de la tabla Silver.
+        batch_id (str): Identificador del lote.
+        layout (dict | None): Cambios sobre SILVER_LAYOUT.
+        quality_thresholds (dict | None): max_ratio por regla de calidad (ver transform_silver).
+
+    Returns:
+        tuple[dict, dict]: Estadísticas al estilo de merge_silver y reporte de calidad.
+
+    Raises:
+        DataQualityError: Si el lote supera el umbral de alguna regla de calidad.
+    """
+    layout = {**SILVER_LAYOUT, **(layout or {})}
+    options = parquet_options(layout, output_name, layout["sort_by"], "genre")
+    staging = os.path.join(silver_path, SILVER_STAGING_DIR, output_name)
+    rows_dir, table_dir = os.path.join(staging, "rows"), os.path.join(staging, "table")
+    shutil.rmtree(staging, ignore_errors=True)
+    try:
+        silver_rows(lf).sink_parquet(pl.PartitionByKey(rows_dir, by="genre"), mkdir=True)
+
+        stats = {"inserted": 0, "replaced": 0, "deleted": 0, "genres": []}
+        quarantines, reports = [], []
+        for genre_dir in sorted(glob.glob(os.path.join(rows_dir, "genre=*"))):
+            genre_lf = pl.scan_parquet(genre_dir, hive_partitioning=False).unique(subset=SILVER_KEY, keep="last")
+            clean, quarantine, report = pl.collect_all(split_quality(silver_quality(genre_lf)))
+            quarantines.append(quarantine)
+            reports.append(report)
+            if clean.is_empty():
+                continue
+            genre = clean.get_column("genre").cast(pl.String)[0]
+            part_dir = silver_partition_dir(table_dir, genre)
+            os.makedirs(part_dir, exist_ok=True)
+            clean.sort(layout["sort_by"]).write_parquet(os.path.join(part_dir, f"part-{batch_id}.parquet"), **options)
+            stats["inserted"] += clean.height
+            stats["genres"].append(genre)
+
+        if reports:
+            report = pl.concat(reports).sum()
+            quarantine = pl.concat(quarantines, how="vertical_relaxed")
+        else:
+            # Lote vacío: el reporte sale igual del plan completo
+            _, quarantine, report = pl.collect_all(split_quality(silver_plan(lf)))
+        quality = check_quality(report, silver_path, output_name, batch_id, quarantine, quality_thresholds)
+
+        silver_root = os.path.join(silver_path, output_name)
+        shutil.rmtree(silver_root, ignore_errors=True)
+        os.makedirs(table_dir, exist_ok=True)
+        os.replace(table_dir, silver_root)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return stats, quality
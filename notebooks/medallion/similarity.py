@@ -0,0 +1,218 @@
+import os
+import json
+import numpy as np
+import polars as pl
+from .gold import FEATURES_COLS, GOLD_STATES, gold_parquet_options
+
+
+# ------------------------------
+# 🎯 Artistas similares: índice kNN sobre artist_features
+# ------------------------------
+ARTIST_INDEX_DIR = "_artist_index"
+ARTIST_SIMILAR_FILE = "artist_similar.parquet"
+ARTIST_SIMILAR_K = 10
+# Memoria máxima de cada bloque de similitudes en el modo batch (bloque x artistas, float32)
+ARTIST_BATCH_BYTES = 64 * 2**20
+
+
+def artist_index_files(gold_path: str) -> dict:
+    """Rutas del índice de artistas dentro de Gold: matriz, nombres y metadata."""
+    index_path = os.path.join(gold_path, ARTIST_INDEX_DIR)
+    return {
+        "matrix": os.path.join(index_path, "features.npy"),
+        "artists": os.path.join(index_path, "artists.parquet"),
+        "meta": os.path.join(index_path, "meta.json"),
+    }
+
+
+def build_artist_index(gold_path: str | None = None,
+                       artist_file_name: str = "artist_features.parquet") -> dict:
+    """
+    Construye la matriz de features normalizada de artist_features y la guarda como .npy.
+
+    Cada feature se estandariza (z-score, NaN = media) y cada fila se normaliza
+    a norma 1, de modo que el producto punto entre dos filas es la similitud
+    coseno. La matriz se guarda en float32 para abrirla con mmap desde ArtistIndex.
+    Si artist_features no cambió desde la última construcción, no se hace nada.
+
+    Args:
+        gold_path (str | None): Carpeta Gold. Si None, se determina automáticamente.
+        artist_file_name (str): Nombre del archivo de características por artista.
+
+    Returns:
+        dict: Metadata del índice (source, columns, mean, std, artists).
+    """
+    if gold_path is None:
+        try:
+            base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        except NameError:
+            base_path = os.path.abspath(os.path.join(os.getcwd(), ".."))
+        gold_path = os.path.join(base_path, "data", "gold")
+
+    artist_file = os.path.join(gold_path, artist_file_name)
+    files = artist_index_files(gold_path)
+    stat = os.stat(artist_file)
+    source = {"file": artist_file_name, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    if os.path.exists(files["meta"]) and os.path.exists(files["matrix"]):
+        with open(files["meta"], encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("source") == source:
+            print("✅ Índice de artistas al día.")
+            return meta
+
+    # 1️⃣ Estandarizar y normalizar con expresiones vectorizadas de Polars
+    columns = [f"avg_{col}" for col in FEATURES_COLS]
+    features = pl.scan_parquet(artist_file).select("artist_name", *columns).collect()
+    stats = features.select(
+        *[pl.col(c).fill_nan(None).mean().alias(f"mean_{c}") for c in columns],
+        *[pl.col(c).fill_nan(None).std().alias(f"std_{c}") for c in columns],
+    ).row(0, named=True)
+    mean = [stats[f"mean_{c}"] or 0.0 for c in columns]
+    std = [stats[f"std_{c}"] or 1.0 for c in columns]
+    z = [((pl.col(c).fill_nan(None) - m) / s).fill_null(0.0).alias(c) for c, m, s in zip(columns, mean, std)]
+    norm = pl.sum_horizontal([pl.col(c) ** 2 for c in columns]).sqrt()
+    matrix = (
+        features.select(z)
+        .select([pl.when(norm > 0).then(pl.col(c) / norm).otherwise(0.0).cast(pl.Float32) for c in columns])
+        .to_numpy(order="c")
+    )
+
+    # 2️⃣ Guardar matriz, nombres (misma fila) y metadata; la metadata va última
+    os.makedirs(os.path.dirname(files["matrix"]), exist_ok=True)
+    tmp_matrix = files["matrix"] + ".tmp.npy"
+    np.save(tmp_matrix, matrix)
+    os.replace(tmp_matrix, files["matrix"])
+    features.select("artist_name").write_parquet(files["artists"])
+    meta = {"source": source, "columns": columns, "mean": mean, "std": std, "artists": features.height}
+    tmp_meta = files["meta"] + ".tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_meta, files["meta"])
+    print(f"✅ Índice de artistas generado: {features.height} artistas x {len(columns)} features")
+    return meta
+
+
+class ArtistIndex:
+    """
+    Índice kNN exacto de artistas por similitud coseno sobre la matriz de build_artist_index.
+
+    La matriz se abre con mmap (np.load(mmap_mode="r")), así que abrir el índice
+    no la copia a memoria. Con pocas dimensiones, una consulta es un producto
+    matriz-vector más np.argpartition: milisegundos aun con cientos de miles de artistas.
+
+    Args:
+        gold_path (str): Carpeta Gold con el índice (_artist_index).
+    """
+
+    def __init__(self, gold_path: str):
+        files = artist_index_files(gold_path)
+        self.matrix = np.load(files["matrix"], mmap_mode="r")
+        self.artists = pl.read_parquet(files["artists"]).to_series()
+        self._rows = None
+
+    def row(self, artist_name: str) -> int:
+        """Fila de la matriz de un artista (KeyError si no existe)."""
+        if self._rows is None:
+            self._rows = {name: i for i, name in enumerate(self.artists.to_list())}
+        return self._rows[artist_name]
+
+    def top_k(self, scores: np.ndarray, k: int) -> np.ndarray:
+        """Posiciones de los k mayores puntajes de cada fila, ordenadas de mayor a menor."""
+        k = min(k, scores.shape[-1])
+        top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1, kind="stable")
+        return np.take_along_axis(top, order, axis=-1)
+
+    def similar(self, artist_name: str, k: int = ARTIST_SIMILAR_K) -> pl.DataFrame:
+        """
+        Artistas más parecidos a artist_name.
+
+        Args:
+            artist_name (str): Artista de referencia.
+            k (int): Cantidad de vecinos.
+
+        Returns:
+            pl.DataFrame: similar_artist y similarity (coseno), de mayor a menor.
+        """
+        i = self.row(artist_name)
+        scores = np.asarray(self.matrix @ self.matrix[i])
+        scores[i] = -np.inf
+        top = self.top_k(scores, k)
+        return pl.DataFrame({
+            "similar_artist": self.artists.gather(top),
+            "similarity": pl.Series(scores[top], dtype=pl.Float32),
+        })
+
+    def batch_top_k(self, k: int = ARTIST_SIMILAR_K) -> pl.DataFrame:
+        """
+        Top-k de artistas similares para todos los artistas.
+
+        Las similitudes se calculan por bloques de filas para que cada bloque
+        ocupe a lo sumo ARTIST_BATCH_BYTES.
+
+        Args:
+            k (int): Cantidad de vecinos por artista.
+
+        Returns:
+            pl.DataFrame: artist_name, rank, similar_artist y similarity.
+        """
+        n = self.matrix.shape[0]
+        k = max(min(k, n - 1), 0)
+        block = max(1, ARTIST_BATCH_BYTES // (4 * max(n, 1)))
+        neighbours, similarity = [], []
+        for start in range(0, n if k else 0, block):
+            stop = min(start + block, n)
+            scores = np.asarray(self.matrix[start:stop]) @ self.matrix.T
+            scores[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+            top = self.top_k(scores, k)
+            neighbours.append(top)
+            similarity.append(np.take_along_axis(scores, top, axis=-1))
+        neighbours = np.concatenate(neighbours) if neighbours else np.empty((0, k), dtype=np.int64)
+        similarity = np.concatenate(similarity) if similarity else np.empty((0, k), dtype=np.float32)
+        return pl.DataFrame({
+            "artist_name": self.artists.gather(np.repeat(np.arange(n), k)),
+            "rank": pl.Series(np.tile(np.arange(1, k + 1), n), dtype=pl.UInt8),
+            "similar_artist": self.artists.gather(neighbours.ravel()),
+            "similarity": pl.Series(similarity.ravel(), dtype=pl.Float32),
+        })
+
+
+def aggregate_artist_similarity(gold_path: str | None = None,
+                                artist_file_name: str = "artist_features.parquet",
+                                k: int = ARTIST_SIMILAR_K,
+                                layout: dict | None = None) -> dict:
+    """
+    Actualiza el índice de artistas y publica el top-k de similares como tabla Gold (ARTIST_SIMILAR_FILE).
+
+    Args:
+        gold_path (str | None): Carpeta Gold. Si None, se determina automáticamente.
+        artist_file_name (str): Nombre del archivo de características por artista.
+        k (int): Vecinos por artista.
+        layout (dict | None): Cambios sobre GOLD_LAYOUT.
+
+    Returns:
+        dict: Resumen con mode ('skipped' o 'full'), inputs, rows_in y rows_out.
+    """
+    if gold_path is None:
+        try:
+            base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+        except NameError:
+            base_path = os.path.abspath(os.path.join(os.getcwd(), ".."))
+        gold_path = os.path.join(base_path, "data", "gold")
+
+    files = artist_index_files(gold_path)
+    similar_file = os.path.join(gold_path, ARTIST_SIMILAR_FILE)
+    # La metadata guarda el k publicado; un índice recién construido no lo tiene
+    meta = build_artist_index(gold_path, artist_file_name)
+    if meta.get("k") == k and os.path.exists(similar_file):
+        return {"mode": "skipped", "inputs": [], "rows_in": 0, "rows_out": 0}
+
+    similar = ArtistIndex(gold_path).batch_top_k(k)
+    similar.write_parquet(similar_file, **gold_parquet_options(ARTIST_SIMILAR_FILE, GOLD_STATES["artist"]["key"], layout))
+    meta["k"] = k
+    tmp_meta = files["meta"] + ".tmp"
+    with open(tmp_meta, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_meta, files["meta"])
+    print(f"✅ Artistas similares guardados en: {similar_file} (top-{k})")
+    return {"mode": "full", "inputs": [files["matrix"]], "rows_in": meta["artists"], "rows_out": similar.height}
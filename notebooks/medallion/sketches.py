@@ -0,0 +1,339 @@
+import numpy as np
+import polars as pl
+
+
+# ------------------------------
+# 🧮 Sketches mergeables: HyperLogLog, histogramas de cuantiles y heavy hitters
+# ------------------------------
+# HyperLogLog de track_id: 2**SKETCH_HLL_P registros de 1 byte (error relativo ~1.04 / sqrt(2**P), 0.8% con P=14)
+SKETCH_HLL_P = 14
+SKETCH_HLL_SEED = 7
+# Histogramas de cuantiles: (inicio, fin, bins) por métrica. Los rangos son los de
+# SILVER_QUALITY_RULES; el error de un percentil es como máximo el ancho de un bin.
+# popularity es entera: sus bins están centrados en cada valor.
+SKETCH_HISTOGRAMS = {
+    "popularity": (-0.5, 100.5, 101),
+    "tempo": (0.0, 300.0, 600),
+    "loudness": (-60.0, 5.0, 260),
+}
+# Heavy hitters de artist_name: los SKETCH_CANDIDATES artistas con más tracks de cada grupo
+# (con su conteo) más un Count-Min (SKETCH_CMS_DEPTH filas x SKETCH_CMS_WIDTH contadores)
+# que acota el conteo de los que no están en la lista al combinar estados
+SKETCH_CMS_DEPTH = 4
+SKETCH_CMS_WIDTH = 2048
+SKETCH_CMS_SEED = 11
+SKETCH_CANDIDATES = 64
+SKETCH_CANDIDATES_DTYPE = pl.List(pl.Struct({"artist_name": pl.String, "count": pl.Int64}))
+
+
+def sketch_plans(lf: pl.LazyFrame, key: str = "genre", sign: pl.Expr | None = None) -> dict[str, pl.LazyFrame]:
+    """
+    Planes de los sketches de cada grupo, en formato largo (una fila por registro, bin o contador).
+
+    Parten del mismo plan que los estados Gold, así que ejecutados en el mismo
+    pl.collect_all no agregan lecturas de Silver. Los histogramas y el Count-Min
+    usan el peso de cada fila, por lo que un changelog los actualiza con
+    retracciones; el HyperLogLog solo ve las inserciones (un upsert no quita
+    track_ids de Silver, solo reemplaza la fila). Si un lote elimina claves,
+    el HyperLogLog de esos grupos se recalcula con replace_sketch.
+
+    Args:
+        lf (pl.LazyFrame): Filas Silver (o un changelog Silver).
+        key (str): Columna de agrupación.
+        sign (pl.Expr | None): Peso de cada fila. Si None, todas suman +1.
+
+    Returns:
+        dict[str, pl.LazyFrame]: Planes count, hll, hist_<métrica>, cms y candidates.
+    """
+    lf = lf.with_columns(
+        pl.col(key).cast(pl.String),
+        (pl.lit(1) if sign is None else sign).cast(pl.Int64).alias("_weight"),
+    )
+    weight = pl.col("_weight")
+    p = SKETCH_HLL_P
+    track_hash = pl.col("track_id").hash(SKETCH_HLL_SEED)
+    plans = {
+        "count": lf.group_by(key).agg(weight.sum().alias("count")),
+        # Registro = primeros P bits del hash; rango = posición del primer 1 en los bits restantes
+        "hll": lf.filter(weight > 0).select(
+            key,
+            (track_hash // 2 ** (64 - p)).cast(pl.UInt32).alias("cell"),
+            ((track_hash % 2 ** (64 - p)).bitwise_leading_zeros() - (p - 1)).cast(pl.UInt8).alias("value"),
+        ).group_by(key, "cell").agg(pl.col("value").max()),
+    }
+    for col, (lo, hi, bins) in SKETCH_HISTOGRAMS.items():
+        value = pl.col(col).cast(pl.Float64)
+        cell = ((value - lo) / ((hi - lo) / bins)).floor().clip(0, bins - 1).cast(pl.UInt32)
+        plans[f"hist_{col}"] = (
+            lf.filter(value.is_not_nan())
+              .select(key, cell.alias("cell"), weight)
+              .group_by(key, "cell").agg(weight.sum().alias("value"))
+        )
+    # Cada fila del Count-Min usa otra semilla; las celdas se numeran fila * ancho + columna
+    plans["cms"] = (
+        lf.select(key, weight, pl.concat_list([
+            (pl.col("artist_name").hash(SKETCH_CMS_SEED + d) % SKETCH_CMS_WIDTH + d * SKETCH_CMS_WIDTH)
+            for d in range(SKETCH_CMS_DEPTH)
+        ]).alias("cell"))
+        .explode("cell")
+        .group_by(key, "cell").agg(weight.sum().alias("value"))
+    )
+    # Candidatos a heavy hitter del lote: los de mayor conteo neto dentro de cada grupo
+    # (empates por nombre, para que el resultado no dependa del orden de las filas)
+    plans["candidates"] = (
+        lf.group_by(key, "artist_name").agg(weight.sum().alias("count"))
+          .filter(pl.col("count") > 0)
+          .sort(key, "count", "artist_name", descending=[False, True, False])
+          .group_by(key, maintain_order=True).head(SKETCH_CANDIDATES)
+          .group_by(key, maintain_order=True).agg(pl.struct("artist_name", "count").alias("candidates"))
+    )
+    return plans
+
+
+def sketch_shapes() -> dict[str, tuple[np.dtype, int]]:
+    """Tipo y cantidad de celdas de cada columna binaria del estado de sketches."""
+    return {
+        "hll": (np.dtype(np.uint8), 2 ** SKETCH_HLL_P),
+        **{f"hist_{col}": (np.dtype(np.int64), bins) for col, (_, _, bins) in SKETCH_HISTOGRAMS.items()},
+        "cms": (np.dtype(np.int64), SKETCH_CMS_DEPTH * SKETCH_CMS_WIDTH),
+    }
+
+
+def decode_sketch(state: pl.DataFrame, column: str) -> np.ndarray:
+    """Columna binaria del estado de sketches como matriz (grupos x celdas)."""
+    dtype, cells = sketch_shapes()[column]
+    if state.height == 0:
+        return np.zeros((0, cells), dtype=dtype)
+    return np.frombuffer(b"".join(state[column].to_list()), dtype=dtype).reshape(state.height, cells)
+
+
+def encode_sketch(matrix: np.ndarray) -> pl.Series:
+    """Matriz (grupos x celdas) como columna binaria: un blob por grupo."""
+    return pl.Series([row.tobytes() for row in matrix], dtype=pl.Binary)
+
+
+def cms_estimate(cms: np.ndarray, names: list[str]) -> np.ndarray:
+    """
+    Conteo estimado de cada artista en una matriz Count-Min: el mínimo entre sus filas.
+
+    Args:
+        cms (np.ndarray): Contadores de un grupo (SKETCH_CMS_DEPTH * SKETCH_CMS_WIDTH).
+        names (list[str]): Artistas a estimar.
+
+    Returns:
+        np.ndarray: Conteo estimado por artista (nunca menor que el real).
+    """
+    names = pl.Series(names, dtype=pl.String)
+    cells = np.stack([
+        (names.hash(SKETCH_CMS_SEED + d) % SKETCH_CMS_WIDTH).to_numpy().astype(np.int64) + d * SKETCH_CMS_WIDTH
+        for d in range(SKETCH_CMS_DEPTH)
+    ])
+    return cms[cells].min(axis=0)
+
+
+def candidate_counts(candidates: list[dict], cms: np.ndarray, names: list[str]) -> np.ndarray:
+    """
+    Conteo de cada artista según un estado: el de la lista de candidatos si está en ella;
+    si no, una cota con el Count-Min.
+
+    Si la lista no está llena contiene a todos los artistas con conteo positivo, así que
+    un ausente aporta como máximo 0; si está llena, como máximo el último candidato.
+
+    Args:
+        candidates (list[dict]): Candidatos del estado (artist_name, count), de mayor a menor.
+        cms (np.ndarray): Count-Min del mismo grupo.
+        names (list[str]): Artistas a contar.
+
+    Returns:
+        np.ndarray: Conteo por artista.
+    """
+    known = {c["artist_name"]: c["count"] for c in candidates}
+    bound = candidates[-1]["count"] if len(candidates) >= SKETCH_CANDIDATES else 0
+    estimates = np.minimum(cms_estimate(cms, names), bound)
+    return np.array([known.get(name, estimate) for name, estimate in zip(names, estimates)], dtype=np.int64)
+
+
+def top_candidates(names: list[str], counts: np.ndarray) -> list[dict]:
+    """Los SKETCH_CANDIDATES artistas con mayor conteo positivo, de mayor a menor (empates por nombre)."""
+    ranked = sorted((-int(count), name) for name, count in zip(names, counts) if count > 0)
+    return [{"artist_name": name, "count": -count} for count, name in ranked[:SKETCH_CANDIDATES]]
+
+
+def sketch_state(frames: dict[str, pl.DataFrame], key: str = "genre") -> pl.DataFrame:
+    """
+    Convierte los planes de sketch_plans ya ejecutados en el estado de sketches: una fila
+    por grupo con su cantidad de filas, una columna binaria por sketch y los candidatos.
+
+    Args:
+        frames (dict[str, pl.DataFrame]): Resultado de cada plan de sketch_plans.
+        key (str): Columna de agrupación.
+
+    Returns:
+        pl.DataFrame: Estado de sketches, ordenado por la clave.
+    """
+    state = frames["count"].sort(key)
+    keys = state[key]
+    columns = {}
+    for column, (dtype, cells) in sketch_shapes().items():
+        long = frames[column].filter(pl.col(key).is_in(keys.implode()))
+        matrix = np.zeros((state.height, cells), dtype=dtype)
+        rows = long[key].replace_strict(keys, range(state.height), return_dtype=pl.Int64).to_numpy()
+        matrix[rows, long["cell"].to_numpy()] = long["value"].to_numpy()
+        columns[column] = encode_sketch(matrix)
+    candidates = state.select(key).join(frames["candidates"], on=key, how="left")["candidates"]
+    columns["candidates"] = candidates.fill_null([]).cast(SKETCH_CANDIDATES_DTYPE)
+    return state.with_columns(**columns)
+
+
+def merge_sketch_state(old: pl.DataFrame, delta: pl.DataFrame, key: str = "genre") -> pl.DataFrame:
+    """
+    Combina dos estados de sketches: máximo por registro en el HyperLogLog, suma en
+    histogramas y Count-Min, y unión de candidatos re-estimados con el Count-Min combinado.
+
+    Args:
+        old (pl.DataFrame): Estado actual.
+        delta (pl.DataFrame): Estado de un lote o de otra partición (puede tener pesos negativos).
+        key (str): Columna de agrupación.
+
+    Returns:
+        pl.DataFrame: Estado combinado, sin los grupos que quedan vacíos.
+    """
+    keys = pl.concat([old[key], delta[key]]).unique().sort()
+    aligned = [
+        pl.DataFrame({key: keys}).join(df, on=key, how="left").with_columns(
+            pl.col("count").fill_null(0),
+            *[pl.col(c).fill_null(bytes(cells * dtype.itemsize)) for c, (dtype, cells) in sketch_shapes().items()],
+            pl.col("candidates").fill_null([]),
+        )
+        for df in (old, delta)
+    ]
+    columns = {}
+    for column in sketch_shapes():
+        a, b = (decode_sketch(df, column) for df in aligned)
+        columns[column] = encode_sketch(np.maximum(a, b) if column == "hll" else a + b)
+    # Candidatos: conteo de cada lado (exacto si estaba en su lista, cota Count-Min si no)
+    old_cms, delta_cms = (decode_sketch(df, "cms") for df in aligned)
+    merged = []
+    for i, (a, b) in enumerate(zip(aligned[0]["candidates"].to_list(), aligned[1]["candidates"].to_list())):
+        names = sorted({c["artist_name"] for c in [*a, *b]})
+        counts = candidate_counts(a, old_cms[i], names) + candidate_counts(b, delta_cms[i], names) if names else []
+        merged.append(top_candidates(names, counts))
+    columns["candidates"] = pl.Series(merged, dtype=SKETCH_CANDIDATES_DTYPE)
+    return (
+        pl.DataFrame({key: keys, "count": aligned[0]["count"] + aligned[1]["count"]})
+          .with_columns(**columns)
+          .filter(pl.col("count") > 0)
+    )
+
+
+def replace_sketch(state: pl.DataFrame, column: str, frame: pl.DataFrame, groups: pl.Series,
+                   key: str = "genre") -> pl.DataFrame:
+    """
+    Reemplaza una columna binaria del estado de sketches en algunos grupos por una recalculada
+    (p. ej. el HyperLogLog, que no admite retracciones, cuando un lote elimina filas).
+
+    Args:
+        state (pl.DataFrame): Estado de sketches.
+        column (str): Columna a reemplazar (ver sketch_shapes).
+        frame (pl.DataFrame): Resultado del plan de esa columna (sketch_plans) sobre las
+            filas vigentes de los grupos.
+        groups (pl.Series): Grupos a reemplazar.
+        key (str): Columna de agrupación.
+
+    Returns:
+        pl.DataFrame: Estado con la columna recalculada en esos grupos.
+    """
+    keys = state[key]
+    matrix = decode_sketch(state, column).copy()
+    matrix[keys.is_in(groups.implode()).to_numpy()] = 0
+    long = frame.filter(pl.col(key).is_in(keys.implode()) & pl.col(key).is_in(groups.implode()))
+    rows = long[key].replace_strict(keys, range(state.height), return_dtype=pl.Int64).to_numpy()
+    matrix[rows, long["cell"].to_numpy()] = long["value"].to_numpy()
+    return state.with_columns(encode_sketch(matrix).alias(column))
+
+
+def hll_estimate(registers: np.ndarray) -> np.ndarray:
+    """
+    Cantidad de distintos estimada por HyperLogLog (con la corrección para cardinalidades chicas).
+
+    Args:
+        registers (np.ndarray): Registros (grupos x 2**SKETCH_HLL_P).
+
+    Returns:
+        np.ndarray: Estimación por grupo.
+    """
+    m = registers.shape[-1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.exp2(-registers.astype(np.float64)).sum(axis=-1)
+    zeros = (registers == 0).sum(axis=-1)
+    small = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), small, raw)
+
+
+def histogram_quantiles(counts: np.ndarray, col: str, quantiles: list[float]) -> np.ndarray:
+    """
+    Percentiles a partir de los histogramas de una métrica, interpolando dentro del bin.
+
+    Args:
+        counts (np.ndarray): Histogramas (grupos x bins).
+        col (str): Métrica de SKETCH_HISTOGRAMS.
+        quantiles (list[float]): Cuantiles entre 0 y 1.
+
+    Returns:
+        np.ndarray: Percentiles (grupos x cuantiles); NaN si el grupo no tiene valores.
+    """
+    lo, hi, bins = SKETCH_HISTOGRAMS[col]
+    width = (hi - lo) / bins
+    cumulative = counts.cumsum(axis=-1)
+    result = np.full((counts.shape[0], len(quantiles)), np.nan)
+    for g, (row, cum) in enumerate(zip(counts, cumulative)):
+        if cum[-1] <= 0:
+            continue
+        for j, q in enumerate(quantiles):
+            target = q * cum[-1]
+            i = min(int(np.searchsorted(cum, target, side="left")), bins - 1)
+            frac = (target - (cum[i] - row[i])) / row[i] if row[i] > 0 else 0.0
+            result[g, j] = lo + (i + frac) * width
+    return result
+
+
+def sketch_distinct(state: pl.DataFrame, key: str = "genre") -> pl.DataFrame:
+    """Tracks distintos (estimados) por grupo a partir del estado de sketches."""
+    estimate = hll_estimate(decode_sketch(state, "hll"))
+    return state.select(key, pl.Series("distinct_tracks", np.rint(estimate).astype(np.int64)))
+
+
+def sketch_quantiles(state: pl.DataFrame, col: str, quantiles: list[float], key: str = "genre") -> pl.DataFrame:
+    """Percentiles de una métrica por grupo: columnas <col>_p<q> (p. ej. popularity_p50)."""
+    values = histogram_quantiles(decode_sketch(state, f"hist_{col}"), col, quantiles)
+    return state.select(key, *[
+        pl.Series(f"{col}_p{round(q * 100)}", values[:, j]) for j, q in enumerate(quantiles)
+    ])
+
+
+def sketch_top(state: pl.DataFrame, n: int = 10, key: str = "genre") -> pl.DataFrame:
+    """
+    Top-N de artistas por cantidad de tracks en cada grupo.
+
+    Args:
+        state (pl.DataFrame): Estado de sketches.
+        n (int): Artistas por grupo (como máximo SKETCH_CANDIDATES).
+        key (str): Columna de agrupación.
+
+    Returns:
+        pl.DataFrame: key, rank, artist_name y track_count. El conteo es exacto tras un
+            cálculo completo; después de combinar estados puede sobreestimar a los
+            artistas que entraron a la lista con una cota del Count-Min.
+    """
+    return (
+        state.select(key, pl.col("candidates").list.head(n))
+          .explode("candidates")
+          .drop_nulls("candidates")
+          .unnest("candidates")
+          .select(
+              key,
+              pl.int_range(1, pl.len() + 1).over(key).alias("rank"),
+              "artist_name",
+              pl.col("count").alias("track_count"),
+          )
+    )
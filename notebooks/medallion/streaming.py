@@ -0,0 +1,119 @@
+import os
+from datetime import datetime
+import polars as pl
+from .bronze import current_bronze_parts, ingest_bronze_parallel
+from .silver import (
+    check_quality,
+    load_silver_state,
+    load_silver_streaming,
+    merge_silver,
+    pending_bronze_parts,
+    prune_silver_changes,
+    record_silver_batch,
+    save_silver_state,
+    silver_deletes,
+    silver_plan,
+    silver_retractions,
+    split_quality,
+    write_silver_changes,
+)
+from .gold import GOLD_SKETCHES, aggregate_gold
+
+
+# ------------------------------
+# Modo streaming: Bronze -> Silver -> Gold con memoria acotada
+# ------------------------------
+def run_pipeline_streaming(csv_files: list[str],
+                           bronze_path: str,
+                           silver_path: str,
+                           gold_path: str,
+                           silver_name: str = "SpotifyFeatures_silver",
+                           genre_file_name: str = "genre_popularity.parquet",
+                           artist_file_name: str = "artist_features.parquet",
+                           silver_layout: dict | None = None,
+                           gold_layout: dict | None = None,
+                           quality_thresholds: dict | None = None,
+                           sketches: bool | None = None,
+                           root: str | None = None,
+                           gold: bool = True) -> tuple[pl.LazyFrame, pl.LazyFrame]:
+    """
+    Ejecuta Bronze -> Silver -> Gold sin materializar el dataset completo en memoria.
+
+    - Bronze: cada CSV nuevo o modificado se convierte por bloques (ingest_bronze_parallel,
+      igual que en modo eager), así las dos variantes tienen los mismos rechazos.
+    - Silver: en la primera carga, load_silver_streaming reparte las filas por
+      género con el motor streaming y deduplica, evalúa la calidad y ordena cada
+      género por separado; la tabla se publica solo si el lote pasa la calidad.
+      En las siguientes, el delta de particiones Bronze pendientes (chico) se
+      evalúa y se integra con merge_silver, que también elimina las claves que
+      un CSV modificado ya no trae (ver silver_retractions).
+    - Gold: aggregate_gold con el motor streaming (los group_by mantienen solo
+      el estado por grupo), en modo incremental si Silver registró un changelog.
+
+    Args:
+        csv_files (list[str]): CSV disponibles en raw.
+        bronze_path (str): Carpeta Bronze.
+        silver_path (str): Carpeta Silver.
+        gold_path (str): Carpeta Gold.
+        silver_name (str): Nombre de la tabla Silver a guardar.
+        genre_file_name (str): Nombre del archivo de popularidad por género.
+        artist_file_name (str): Nombre del archivo de características por artista.
+        silver_layout (dict | None): Cambios sobre SILVER_LAYOUT.
+        gold_layout (dict | None): Cambios sobre GOLD_LAYOUT.
+        quality_thresholds (dict | None): max_ratio por regla de calidad (ver transform_silver).
+        sketches (bool | None): Calcular el tier de sketches de Gold. Si None, GOLD_SKETCHES.
+        root (str | None): Carpeta raíz de la fuente para las claves del manifiesto de Bronze (ver bronze_key).
+        gold (bool): Si es False, termina en Silver (run_pipeline agrega Gold en etapas
+            separadas del DAG, una por estado de GOLD_STATES).
+
+    Returns:
+        tuple[pl.LazyFrame, pl.LazyFrame]: Scans lazy de Bronze y Silver ya escritos.
+
+    Raises:
+        DataQualityError: Si el lote supera el umbral de alguna regla de calidad. Ni
+            Silver ni Gold cambian; las particiones Bronze quedan pendientes.
+    """
+    for p in [bronze_path, silver_path, gold_path]:
+        os.makedirs(p, exist_ok=True)
+
+    # 1️⃣ Bronze: solo los CSV nuevos o modificados generan una nueva partición
+    dataset = "SpotifyFeatures_bronze"
+    report = ingest_bronze_parallel(csv_files, bronze_path, dataset, root=root)
+    if not current_bronze_parts(bronze_path, dataset):
+        raise FileNotFoundError(f"No hay particiones Bronze de {dataset} para: {csv_files}")
+
+    # 2️⃣ Silver: primera carga completa o delta de particiones pendientes (en orden de ingesta)
+    silver_root = os.path.join(silver_path, silver_name)
+    state = load_silver_state(silver_path, silver_name)
+    pending = pending_bronze_parts(bronze_path, state, dataset)
+    batch_id = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    if pending:
+        bronze_lf = pl.scan_parquet([os.path.join(bronze_path, part) for part in pending], hive_partitioning=False)
+        if not state["batches"]:
+            stats, quality = load_silver_streaming(bronze_lf, silver_path, silver_name, batch_id,
+                                                   silver_layout, quality_thresholds)
+            record_silver_batch(state, batch_id, pending, stats, quality=quality)
+        else:
+            revived, candidates = silver_retractions(bronze_path, state, pending, dataset)
+            if revived is not None:
+                bronze_lf = pl.concat([revived, bronze_lf], how="vertical_relaxed")
+            delta, quarantine, quality_report = pl.collect_all(split_quality(silver_plan(bronze_lf)), engine="streaming")
+            quality = check_quality(quality_report, silver_path, silver_name, batch_id, quarantine, quality_thresholds)
+            stats, retracted = merge_silver(delta, silver_root, batch_id, silver_layout,
+                                            silver_deletes(candidates, delta, quarantine))
+            changes = write_silver_changes(silver_path, silver_name, batch_id, delta, retracted)
+            record_silver_batch(state, batch_id, pending, stats, changes, quality)
+            prune_silver_changes(silver_path, state)
+        save_silver_state(silver_path, silver_name, state)
+        print(f"✅ Silver actualizado: {stats['inserted']} filas nuevas, {stats['replaced']} actualizadas, "
+              f"{stats['deleted']} eliminadas")
+
+    # 3️⃣ Gold: se pliega el changelog del lote sobre el estado mergeable (o se recalcula completo)
+    if gold:
+        sketches = GOLD_SKETCHES if sketches is None else sketches
+        aggregate_gold(silver_root, gold_path, genre_file_name, artist_file_name, gold_layout,
+                       sketches=sketches, engine="streaming")
+
+    bronze_files = current_bronze_parts(bronze_path, dataset)
+    print(f"✅ Pipeline streaming completado: {len(report['ingested'])} particiones Bronze nuevas -> {silver_root} -> {gold_path}")
+    return pl.scan_parquet(bronze_files, hive_partitioning=False), pl.scan_parquet(silver_root)
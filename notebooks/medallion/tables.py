@@ -0,0 +1,35 @@
+import os
+import glob
+
+# ------------------------------
+# Ubicación y versión de las tablas del proyecto, compartidas por los lectores
+# (CLI, query_medallion.py y el dashboard). Solo usa os: no carga polars
+# ------------------------------
+NOTEBOOKS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def default_base_path() -> str:
+    """Raíz del proyecto (carpeta padre de notebooks/)."""
+    return os.path.abspath(os.path.join(NOTEBOOKS_DIR, ".."))
+
+
+def table_version(paths: str | list[str]) -> tuple:
+    """
+    Versión de una tabla: tamaño y mtime de cada archivo que la compone.
+
+    Cambia en cuanto el pipeline reescribe la tabla, sin necesidad de leerla.
+
+    Args:
+        paths (str | list[str]): Archivos de la tabla. Una carpeta cuenta con todos
+            sus Parquet (p. ej. la tabla Silver particionada); los que no existen se omiten.
+
+    Returns:
+        tuple: (ruta, tamaño, mtime_ns) de cada archivo.
+    """
+    files = []
+    for path in [paths] if isinstance(paths, str) else paths:
+        if os.path.isdir(path):
+            files.extend(sorted(glob.glob(os.path.join(path, "**", "*.parquet"), recursive=True)))
+        elif os.path.exists(path):
+            files.append(path)
+    return tuple((f, os.stat(f).st_size, os.stat(f).st_mtime_ns) for f in files)
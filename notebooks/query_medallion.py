@@ -0,0 +1,198 @@
+import os
+import re
+import sys
+import glob
+import time
+import argparse
+import threading
+from collections import OrderedDict
+import polars as pl
+from medallion.bronze import current_bronze_parts
+from medallion.gold import gold_read_file
+from medallion.tables import default_base_path, table_version
+
+# ------------------------------
+# Consultas SQL sobre Bronze, Silver y Gold: cada capa se registra como scan lazy
+# en un pl.SQLContext, así los filtros y proyecciones de la consulta llegan al scan
+# (solo se leen las particiones, archivos y row groups necesarios)
+# ------------------------------
+SILVER_TABLE = "SpotifyFeatures_silver"
+# Presupuesto de memoria del cache de resultados (MB)
+QUERY_CACHE_MB = int(os.environ.get("QUERY_CACHE_MB", "256"))
+
+
+def medallion_tables(base_path: str) -> dict[str, tuple[list[str], pl.LazyFrame]]:
+    """
+    Tablas consultables de las tres capas, con sus archivos y su scan lazy.
+
+      - bronze: la partición vigente de cada CSV (según el manifiesto de Bronze);
+      - silver: la tabla Silver particionada por género;
+      - una tabla por cada Parquet de Gold, con el nombre del archivo sin extensión
+        (se lee su copia Arrow IPC si está al día).
+
+    Args:
+        base_path (str): Raíz del proyecto (contiene data/).
+
+    Returns:
+        dict[str, tuple[list[str], pl.LazyFrame]]: Nombre -> (archivos, scan).
+    """
+    data_path = os.path.join(base_path, "data")
+    tables = {}
+
+    parts = current_bronze_parts(os.path.join(data_path, "bronze"))
+    if parts:
+        tables["bronze"] = (parts, pl.scan_parquet(parts, hive_partitioning=False))
+
+    silver_root = os.path.join(data_path, "silver", SILVER_TABLE)
+    silver_files = sorted(glob.glob(os.path.join(silver_root, "**", "*.parquet"), recursive=True))
+    if silver_files:
+        tables["silver"] = (silver_files, pl.scan_parquet(silver_root, hive_partitioning=True))
+
+    gold_path = os.path.join(data_path, "gold")
+    for parquet in sorted(glob.glob(os.path.join(gold_path, "*.parquet"))):
+        name = os.path.basename(parquet).removesuffix(".parquet")
+        path = gold_read_file(gold_path, os.path.basename(parquet))
+        scan = pl.scan_ipc(path, memory_map=True) if path.endswith(".arrow") else pl.scan_parquet(path)
+        tables[name] = ([path], scan)
+    return tables
+
+
+class MedallionQuery:
+    """
+    Punto de entrada de consultas SQL sobre las capas del pipeline, con cache de resultados.
+
+    Las tablas se vuelven a listar en cada consulta (solo metadata), así una
+    partición Bronze nueva o una tabla Gold reescrita se ven sin reiniciar. Los
+    resultados se cachean por texto de la consulta y versión de las tablas que
+    menciona (table_version): si el pipeline reescribe una de ellas, la consulta
+    se vuelve a ejecutar. Cuando el total supera max_bytes se descartan los
+    resultados usados hace más tiempo.
+
+    Args:
+        base_path (str | None): Raíz del proyecto. Si None, se determina automáticamente.
+        max_bytes (int | None): Presupuesto del cache (según DataFrame.estimated_size).
+            Si None, QUERY_CACHE_MB.
+    """
+
+    def __init__(self, base_path: str | None = None, max_bytes: int | None = None):
+        self.base_path = base_path or default_base_path()
+        self.max_bytes = QUERY_CACHE_MB * 2**20 if max_bytes is None else max_bytes
+        self.entries = OrderedDict()  # (consulta, versiones) -> (DataFrame, bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return sum(nbytes for _, nbytes in self.entries.values())
+
+    def tables(self) -> dict[str, pl.Schema]:
+        """Tablas registradas y su esquema."""
+        return {name: lf.collect_schema() for name, (_, lf) in medallion_tables(self.base_path).items()}
+
+    def _context(self, query: str) -> tuple[pl.SQLContext, tuple]:
+        """SQLContext con todas las tablas y la versión de las que aparecen en la consulta."""
+        tables = medallion_tables(self.base_path)
+        ctx = pl.SQLContext({name: lf for name, (_, lf) in tables.items()})
+        used = [name for name in tables if re.search(rf"\b{re.escape(name)}\b", query, re.IGNORECASE)]
+        return ctx, tuple((name, table_version(tables[name][0])) for name in used)
+
+    def lazy(self, query: str) -> pl.LazyFrame:
+        """Plan lazy de una consulta (sin ejecutarla ni cachearla)."""
+        ctx, _ = self._context(query)
+        return ctx.execute(query, eager=False)
+
+    def sql(self, query: str) -> pl.DataFrame:
+        """
+        Ejecuta una consulta SQL y devuelve su resultado, desde el cache si las tablas no cambiaron.
+
+        Args:
+            query (str): Consulta SQL sobre bronze, silver o las tablas Gold.
+
+        Returns:
+            pl.DataFrame: Resultado de la consulta.
+        """
+        ctx, versions = self._context(query)
+        key = (query.strip(), versions)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        df = ctx.execute(query, eager=False).collect(engine="streaming")
+        nbytes = df.estimated_size()
+        with self._lock:
+            # Un resultado más grande que todo el presupuesto no se cachea
+            if nbytes <= self.max_bytes:
+                self.entries[key] = (df, nbytes)
+                self.entries.move_to_end(key)
+                while self.size > self.max_bytes:
+                    self.entries.popitem(last=False)
+        return df
+
+    def export(self, query: str, output: str) -> str:
+        """
+        Escribe el resultado de una consulta a Parquet o CSV con el motor streaming,
+        sin materializarlo completo en memoria (no pasa por el cache).
+
+        Args:
+            query (str): Consulta SQL.
+            output (str): Archivo de salida (.parquet o .csv).
+
+        Returns:
+            str: Ruta del archivo escrito.
+        """
+        lf = self.lazy(query)
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        if output.endswith(".csv"):
+            lf.sink_csv(output)
+        elif output.endswith(".parquet"):
+            lf.sink_parquet(output, compression="zstd")
+        else:
+            raise ValueError(f"Formato de salida no soportado (usar .parquet o .csv): {output}")
+        return output
+
+
+def run_query(service: MedallionQuery, query: str, output: str | None = None) -> None:
+    """Ejecuta una consulta desde la CLI: la muestra en consola o la exporta a un archivo."""
+    start = time.perf_counter()
+    if output:
+        service.export(query, output)
+        print(f"✅ Resultado exportado a: {output} ({time.perf_counter() - start:.2f}s)")
+        return
+    hits = service.hits
+    df = service.sql(query)
+    origin = "cache" if service.hits > hits else "ejecutada"
+    print(df)
+    print(f"📊 {df.height} filas en {(time.perf_counter() - start) * 1e3:.1f} ms ({origin})")
+
+
+# ------------------------------
+# 🚀 CLI: una consulta, o una sesión interactiva que comparte el cache
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consultas SQL sobre las capas Bronze, Silver y Gold.")
+    parser.add_argument("query", nargs="?", default=None,
+                        help="Consulta SQL. Si se omite, abre una sesión interactiva (una consulta por línea).")
+    parser.add_argument("--output", "-o", default=None, help="Exportar el resultado a un .parquet o .csv.")
+    parser.add_argument("--base-path", default=None, help="Raíz del proyecto (por defecto, la carpeta padre de notebooks/).")
+    parser.add_argument("--tables", action="store_true", help="Listar las tablas disponibles y sus columnas.")
+    args = parser.parse_args()
+
+    service = MedallionQuery(args.base_path)
+    if args.tables:
+        for name, schema in service.tables().items():
+            print(f"🗂️ {name}: {', '.join(schema.names())}")
+    elif args.query:
+        run_query(service, args.query, args.output)
+    else:
+        print("🔎 Sesión SQL (tablas: " + ", ".join(service.tables()) + "). Salir con Ctrl+D.")
+        for line in sys.stdin:
+            if line.strip():
+                try:
+                    run_query(service, line)
+                except Exception as e:
+                    print(f"❌ Error en la consulta: {e}")
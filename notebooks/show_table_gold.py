@@ -1,13 +1,28 @@
 import os
 import polars as pl
+from medallion.gold import gold_read_file
 
-def show_gold_tables(gold_path: str | None = None):
+
+def scan_gold(gold_path: str, file_name: str) -> pl.LazyFrame:
+    """Scan de una tabla Gold: su copia Arrow IPC con memory map si está al día, si no el Parquet."""
+    path = gold_read_file(gold_path, file_name)
+    return pl.scan_ipc(path, memory_map=True) if path.endswith(".arrow") else pl.scan_parquet(path)
+
+
+def show_gold_tables(gold_path: str | None = None, genre: str | None = None, artist: str | None = None):
     """
     Lee y muestra en consola las tablas Gold: genre_popularity y artist_features.
 
+    Los filtros se aplican sobre un scan lazy: si la copia Arrow IPC está al día se
+    abre con memory map (sin copiar la tabla); si no, como el Parquet está
+    ordenado por su clave y tiene estadísticas por row group, solo se leen los
+    grupos necesarios.
+
     Args:
         gold_path (str | None): Carpeta donde se encuentran los archivos Gold. 
                                 Si es None, se determina automáticamente.
+        genre (str | None): Mostrar solo este género.
+        artist (str | None): Mostrar solo este artista.
     """
     # Determinar base_path
     if gold_path is None:
@@ -27,12 +42,16 @@ def show_gold_tables(gold_path: str | None = None):
 
     # Leer y mostrar las tablas
     print("🎵 Popularidad por género:")
-    df_genre = pl.read_parquet(genre_file)
-    print(df_genre)
+    lf_genre = scan_gold(gold_path, "genre_popularity.parquet")
+    if genre is not None:
+        lf_genre = lf_genre.filter(pl.col("genre") == genre)
+    print(lf_genre.collect())
 
     print("\n🎤 Promedio de características por artista:")
-    df_artist = pl.read_parquet(artist_file)
-    print(df_artist)
+    lf_artist = scan_gold(gold_path, "artist_features.parquet")
+    if artist is not None:
+        lf_artist = lf_artist.filter(pl.col("artist_name") == artist)
+    print(lf_artist.collect())
 
 
 # Ejecutar si se corre como script
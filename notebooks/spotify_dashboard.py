@@ -1,17 +1,199 @@
 import os
+import sys
+import threading
+from collections import OrderedDict
 import polars as pl
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
+from medallion.gold import GOLD_DENSITY_BINS, GOLD_SAMPLE_SIZE, gold_read_file
+from medallion.tables import default_base_path, table_version
 
 # ------------------------------
-# Cargar datos
+# Capa de consultas: el dashboard solo lee Gold. Cada gráfico tiene su mart
+# precalculado por aggregate_gold, así que la carga no depende del tamaño de Silver
 # ------------------------------
-@st.cache_data
-def load_data(base_path):
-    silver = pl.read_parquet(os.path.join(base_path, "data/silver/SpotifyFeatures_silver.parquet")).to_pandas()
-    genre_gold = pl.read_parquet(os.path.join(base_path, "data/gold/genre_popularity.parquet")).to_pandas()
-    artist_gold = pl.read_parquet(os.path.join(base_path, "data/gold/artist_features.parquet")).to_pandas()
-    return silver, genre_gold, artist_gold
+GENRE_GOLD = "data/gold/genre_popularity.parquet"
+ARTIST_GOLD = "data/gold/artist_features.parquet"
+TEMPO_LOUDNESS_MART = "data/gold/genre_tempo_loudness.parquet"
+INSTRUMENTAL_MART = "data/gold/genre_instrumental.parquet"
+DANCE_ENERGY_SAMPLE = "data/gold/sample_danceability_energy.parquet"
+VALENCE_MODE_SAMPLE = "data/gold/sample_valence_mode.parquet"
+DANCE_ENERGY_DENSITY = "data/gold/density_danceability_energy.parquet"
+VALENCE_MODE_DENSITY = "data/gold/density_valence_mode.parquet"
+# Máximo de puntos de la muestra Gold en la ventana de zoom para pasar del heatmap a la vista de puntos
+DENSITY_MAX_POINTS = 5000
+# Presupuesto de memoria del cache de tablas (MB)
+CACHE_BUDGET_MB = int(os.environ.get("DASHBOARD_CACHE_MB", "256"))
+
+
+def gold_source(base_path: str, table: str) -> str:
+    """
+    Archivo a leer para una tabla Gold: su copia Arrow IPC si existe y está al día, si no el Parquet.
+    """
+    folder, name = os.path.split(os.path.join(base_path, table))
+    return gold_read_file(folder, name)
+
+
+def scan_gold(path: str) -> pl.LazyFrame:
+    """Scan lazy de una tabla Gold: Arrow IPC con memory map (sin copia) o Parquet."""
+    return pl.scan_ipc(path, memory_map=True) if path.endswith(".arrow") else pl.scan_parquet(path)
+
+
+class TableCache:
+    """
+    Cache LRU de resultados de consultas, versionado por tabla.
+
+    Cada entrada guarda la versión de su tabla (table_version); si el pipeline
+    reescribe esa tabla, solo esa entrada se recarga. Cuando el total supera
+    max_bytes se descartan las entradas usadas hace más tiempo.
+
+    Args:
+        max_bytes (int): Presupuesto de memoria (según DataFrame.estimated_size).
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # nombre -> (versión, DataFrame, bytes)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        return sum(nbytes for _, _, nbytes in self.entries.values())
+
+    def get(self, name: str, path: str, loader) -> pl.DataFrame:
+        """
+        Devuelve el resultado cacheado de `name` si la tabla en `path` no cambió;
+        si cambió (o no está), lo recalcula con loader().
+        """
+        version = table_version(path)
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry is not None and entry[0] == version:
+                self.entries.move_to_end(name)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        df = loader()
+        with self._lock:
+            self.entries[name] = (version, df, df.estimated_size())
+            self.entries.move_to_end(name)
+            while self.size > self.max_bytes and len(self.entries) > 1:
+                self.entries.popitem(last=False)
+        return df
+
+
+@st.cache_resource
+def get_table_cache() -> TableCache:
+    """Cache compartido por todas las sesiones del servidor de Streamlit."""
+    return TableCache(CACHE_BUDGET_MB * 2**20)
+
+
+def query_genre_popularity(base_path: str) -> pl.DataFrame:
+    """Gráfico 1: popularidad promedio por género, ordenada de mayor a menor."""
+    path = gold_source(base_path, GENRE_GOLD)
+    return get_table_cache().get(
+        "genre_popularity", path,
+        lambda: scan_gold(path).sort("avg_popularity", descending=True).collect(),
+    )
+
+
+def query_artist_features(base_path: str) -> pl.DataFrame:
+    """Gráfico 2: energía, valencia y danceability promedio por artista."""
+    path = gold_source(base_path, ARTIST_GOLD)
+    return get_table_cache().get(
+        "artist_features", path,
+        lambda: scan_gold(path).select("artist_name", "avg_energy", "avg_valence", "avg_danceability").collect(),
+    )
+
+
+def query_mart(base_path: str, table: str) -> pl.DataFrame:
+    """Gráficos 3 a 6: mart Gold completo (agregado por género, grilla de densidad o muestra de tamaño fijo)."""
+    path = gold_source(base_path, table)
+    return get_table_cache().get(table, path, lambda: scan_gold(path).collect())
+
+
+def density_window(density: pl.DataFrame, x: str, y: str, genres: list, x_range: tuple, y_range: tuple | None) -> pl.DataFrame:
+    """
+    Celdas de una grilla de densidad dentro de la ventana de zoom, sumadas sobre los géneros elegidos.
+
+    El resultado tiene a lo sumo GOLD_DENSITY_BINS x GOLD_DENSITY_BINS filas, sin importar
+    cuántos tracks tenga Silver.
+
+    Args:
+        density (pl.DataFrame): Mart de densidad (genre, x, y, count).
+        x (str): Columna del eje x (inicio del bin).
+        y (str): Columna del eje y (inicio del bin, o categoría si y_range es None).
+        genres (list): Géneros a incluir; vacío = todos.
+        x_range (tuple): Ventana (mín, máx) sobre x.
+        y_range (tuple | None): Ventana sobre y; None si el eje y es categórico.
+
+    Returns:
+        pl.DataFrame: Columnas x, y y count.
+    """
+    width = 1 / GOLD_DENSITY_BINS
+    filters = [pl.col(x) + width > x_range[0], pl.col(x) < x_range[1]]
+    if y_range is not None:
+        filters += [pl.col(y) + width > y_range[0], pl.col(y) < y_range[1]]
+    if genres:
+        filters.append(pl.col("genre").is_in(genres))
+    return density.filter(*filters).group_by(x, y).agg(pl.col("count").sum()).sort(x, y)
+
+
+def density_chart(base_path: str, density_table: str, sample_table: str, x: str, y: str, title: str, key: str):
+    """
+    Gráficos 3 y 4: heatmap de la grilla de densidad, con vista de puntos al hacer zoom.
+
+    Mientras la muestra Gold (GOLD_SAMPLE_SIZE tracks por género) tenga más de
+    DENSITY_MAX_POINTS puntos en la ventana solo se envía al navegador la grilla
+    agregada; por debajo de ese umbral se muestran esos puntos, rotulados como
+    muestra cuando la ventana tiene más tracks que ella.
+    """
+    density = query_mart(base_path, density_table)
+    categorical_y = not density.schema[y].is_numeric()
+    full = (0.0, 1.0)
+    step = 1 / GOLD_DENSITY_BINS
+
+    c1, c2, c3 = st.columns(3)
+    genres = c1.multiselect("Géneros", sorted(density["genre"].unique().to_list()), key=f"{key}_genres")
+    x_range = c2.slider(f"Zoom {x}", *full, value=full, step=step, key=f"{key}_x")
+    y_range = None if categorical_y else c3.slider(f"Zoom {y}", *full, value=full, step=step, key=f"{key}_y")
+
+    cells = density_window(density, x, y, genres, x_range, y_range)
+    in_window = cells["count"].sum()
+    filters = [pl.col(x).is_between(*x_range)]
+    if y_range is not None:
+        filters.append(pl.col(y).is_between(*y_range))
+    if genres:
+        filters.append(pl.col("genre").cast(pl.String).is_in(genres))
+    points = query_mart(base_path, sample_table).filter(*filters)
+    if points.height > DENSITY_MAX_POINTS:
+        fig = go.Figure(go.Heatmap(
+            x=(cells[x] + step / 2).to_list(),
+            y=cells[y].to_list() if categorical_y else (cells[y] + step / 2).to_list(),
+            z=cells["count"].to_list(),
+            colorscale="Viridis",
+            colorbar={"title": "tracks"},
+        ))
+        fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"🔎 {in_window:,} tracks en la ventana ({cells.height} celdas). "
+                   f"Acerca el zoom hasta que la muestra Gold tenga a lo sumo {DENSITY_MAX_POINTS:,} puntos "
+                   f"en la ventana (ahora {points.height:,}) para ver los puntos.")
+        return
+
+    sampled = points.height < in_window
+    fig = px.scatter(points, x=x, y=y, color="genre", hover_name="track_name",
+                     title=f"{title} (muestra Gold)" if sampled else title)
+    st.plotly_chart(fig, use_container_width=True)
+    if sampled:
+        st.caption(f"🔎 Muestra: {points.height:,} de los {in_window:,} tracks de la ventana "
+                   f"(hasta {GOLD_SAMPLE_SIZE:,} por género).")
+    else:
+        st.caption(f"🔎 Todos los {in_window:,} tracks de la ventana.")
 
 
 # ------------------------------
@@ -22,14 +204,13 @@ def launch_dashboard(base_path):
     st.title("🎧 Dashboard Spotify - Silver + Gold")
     st.markdown("Análisis combinado entre niveles Silver (tracks) y Gold (agregaciones por género y artista).")
 
-    silver, genre_gold, artist_gold = load_data(base_path)
-
     # ============================
     # 1️⃣ Distribución por género
     # ============================
     st.subheader("Popularidad promedio por género (Gold)")
+    genre_gold = query_genre_popularity(base_path)
     fig1 = px.bar(
-        genre_gold.sort_values("avg_popularity", ascending=False),
+        genre_gold,
         x="genre",
         y="avg_popularity",
         color="avg_popularity",
@@ -37,7 +218,7 @@ def launch_dashboard(base_path):
         title="Popularidad promedio por género"
     )
     st.plotly_chart(fig1, use_container_width=True)
-    top_genre = genre_gold.loc[genre_gold['avg_popularity'].idxmax(), 'genre']
+    top_genre = genre_gold["genre"][0]
     st.caption(f"🎯 **Conclusión:** El género más popular en promedio es **{top_genre}**.")
 
     # ============================
@@ -45,7 +226,7 @@ def launch_dashboard(base_path):
     # ============================
     st.subheader("Energía vs Valencia por Artista (Gold)")
     fig2 = px.scatter(
-        artist_gold,
+        query_artist_features(base_path),
         x="avg_energy",
         y="avg_valence",
         hover_name="artist_name",
@@ -60,40 +241,26 @@ def launch_dashboard(base_path):
     # ============================
     # 3️⃣ Canciones más movidas
     # ============================
-    st.subheader("Danceability vs Energy (Silver)")
-    fig3 = px.scatter(
-        silver.sample(frac=0.2, random_state=42),  # muestreo para rendimiento
-        x="danceability",
-        y="energy",
-        color="genre",
-        hover_name="track_name",
-        title="Relación Danceability vs Energy"
-    )
-    st.plotly_chart(fig3, use_container_width=True)
+    st.subheader("Danceability vs Energy (densidad de Silver)")
+    density_chart(base_path, DANCE_ENERGY_DENSITY, DANCE_ENERGY_SAMPLE, "danceability", "energy",
+                  "Relación Danceability vs Energy", key="dance_energy")
     st.caption("💃 **Conclusión:** Las canciones con alta energía y danceability son las más adecuadas para playlists activas o de fiesta.")
 
     # ============================
     # 4️⃣ Canciones felices vs tristes
     # ============================
-    st.subheader("Distribución de canciones por valence y mode (Silver)")
-    fig4 = px.scatter(
-        silver.sample(frac=0.15, random_state=42),
-        x="valence",
-        y="mode",
-        color="genre",
-        hover_name="track_name",
-        title="Felices (alta valence) vs Tristes (baja valence)"
-    )
-    st.plotly_chart(fig4, use_container_width=True)
+    st.subheader("Distribución de canciones por valence y mode (densidad de Silver)")
+    density_chart(base_path, VALENCE_MODE_DENSITY, VALENCE_MODE_SAMPLE, "valence", "mode",
+                  "Felices (alta valence) vs Tristes (baja valence)", key="valence_mode")
     st.caption("😊 **Conclusión:** Las canciones con valence alto y mode = 1 suelen ser más alegres, mientras que las de valence bajo y mode = 0 tienden a ser melancólicas.")
 
     # ============================
     # 5️⃣ Comparación por género
     # ============================
-    st.subheader("Promedio de Tempo y Loudness por Género (Silver)")
-    agg = silver.groupby("genre")[["tempo", "loudness"]].mean().reset_index()
+    st.subheader("Promedio de Tempo y Loudness por Género (Gold)")
+    agg = query_mart(base_path, TEMPO_LOUDNESS_MART).rename({"avg_tempo": "tempo", "avg_loudness": "loudness"})
     fig5 = px.bar(
-        agg.melt(id_vars="genre", var_name="Métrica", value_name="Valor"),
+        agg.unpivot(index="genre", variable_name="Métrica", value_name="Valor"),
         x="genre",
         y="Valor",
         color="Métrica",
@@ -107,19 +274,24 @@ def launch_dashboard(base_path):
     # 6️⃣ Canciones instrumentales
     # ============================
     st.subheader("Canciones instrumentales (instrumentalness > 0.8)")
-    inst = silver[silver["instrumentalness"] > 0.8]
-    fig6 = px.histogram(
+    inst = query_mart(base_path, INSTRUMENTAL_MART)
+    fig6 = px.bar(
         inst,
         x="genre",
+        y="instrumental_count",
         title="Distribución de canciones instrumentales por género",
         color_discrete_sequence=["teal"]
     )
     st.plotly_chart(fig6, use_container_width=True)
-    st.caption(f"🎧 **Conclusión:** Se detectaron {len(inst)} canciones instrumentales, ideales para concentración o estudio.")
+    st.caption(f"🎧 **Conclusión:** Se detectaron {inst['instrumental_count'].sum()} canciones instrumentales, ideales para concentración o estudio.")
+
+    cache = get_table_cache()
+    st.sidebar.caption(f"🗄️ Cache: {len(cache.entries)} tablas, {cache.size / 2**20:.1f} MB "
+                       f"de {cache.max_bytes / 2**20:.0f} MB ({cache.hits} aciertos, {cache.misses} recargas)")
 
 # ------------------------------
 # Ejecutar Streamlit
+# (streamlit run spotify_dashboard.py [-- <raíz del proyecto>])
 # ------------------------------
 if __name__ == "__main__":
-    base_path = r"C:\Users\germa\Desktop\Carpetas\Data_Engineer_Specialist\Spotify_Medallon"
-    launch_dashboard(base_path)
\ No newline at end of file
+    launch_dashboard(sys.argv[1] if len(sys.argv) > 1 else default_base_path())
\ No newline at end of file
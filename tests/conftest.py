@@ -0,0 +1,57 @@
+import os
+import sys
+
+import polars as pl
+import pytest
+
+NOTEBOOKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "notebooks")
+sys.path.insert(0, os.path.abspath(NOTEBOOKS_DIR))
+
+from benchmark import synthetic_chunk  # noqa: E402
+
+SILVER_TABLE = "SpotifyFeatures_silver"
+
+
+def spotify_rows(rows: int, start: int = 0, seed: int = 7) -> pl.DataFrame:
+    """Filas sintéticas con el esquema de SpotifyFeatures.csv (ver benchmark.synthetic_chunk)."""
+    return synthetic_chunk(start, rows, n_tracks=int(rows * 1.8), n_artists=max(rows // 16, 1), seed=seed)
+
+
+def write_csv(path, df: pl.DataFrame) -> str:
+    os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+    df.write_csv(str(path))
+    return str(path)
+
+
+def read_silver(base_path) -> pl.DataFrame:
+    """Tabla Silver sin los timestamps, ordenada por clave (para comparar ejecuciones)."""
+    return (
+        pl.read_parquet(os.path.join(str(base_path), "data", "silver", SILVER_TABLE), hive_partitioning=True)
+          .drop("ingest_timestamp", "processed_timestamp")
+          .with_columns(pl.col("genre").cast(pl.String))
+          .sort("track_id", "genre")
+    )
+
+
+def assert_frames_close(left: pl.DataFrame, right: pl.DataFrame, sort_by=None):
+    from polars.testing import assert_frame_equal
+
+    if sort_by is not None:
+        left, right = left.sort(sort_by), right.sort(sort_by)
+    assert_frame_equal(left, right, check_dtypes=False, check_exact=False, rel_tol=1e-6, abs_tol=1e-6)
+
+
+@pytest.fixture
+def csv_dir(tmp_path):
+    """Carpeta fuente (fuera de la raíz del proyecto de prueba) para los CSV de entrada."""
+    path = tmp_path / "source"
+    path.mkdir()
+    return path
+
+
+@pytest.fixture
+def base_path(tmp_path):
+    """Raíz de un proyecto vacío (data/ se crea al ejecutar el pipeline)."""
+    path = tmp_path / "project"
+    path.mkdir()
+    return path
@@ -0,0 +1,98 @@
+import os
+
+import polars as pl
+import pytest
+
+import medallion.bronze as bronze
+from conftest import read_silver, spotify_rows, write_csv
+from medallion.bronze import ingest_bronze_parallel, load_bronze, load_manifest
+from medallion.pipeline import run_pipeline
+from medallion.silver import transform_silver
+
+DATASET = "SpotifyFeatures_bronze"
+
+
+def test_invalid_number_in_sample_is_rejected_not_widened(csv_dir, base_path):
+    rows = spotify_rows(1_000).with_columns(pl.col("popularity").cast(pl.String))
+    rows = rows.with_columns(pl.when(pl.int_range(pl.len()) == 3).then(pl.lit("abc")).otherwise("popularity")
+                               .alias("popularity"))
+    csv_file = write_csv(csv_dir / "SpotifyFeatures.csv", rows)
+    bronze_path = os.path.join(str(base_path), "data", "bronze")
+
+    df = load_bronze(csv_file, bronze_path, dataset=DATASET)
+    assert df.schema["popularity"].is_numeric()
+    assert df.height == rows.height - 1
+    entry = load_manifest(bronze_path)["SpotifyFeatures.csv"]
+    assert entry["rejected"] == 1
+    rejects = pl.read_parquet(os.path.join(bronze_path, bronze.BRONZE_REJECTS_DIR, entry["parts"][-1]))
+    assert "popularity" in rejects.item(0, "reason") and "abc" in rejects.item(0, "text")
+
+    # Silver convierte la columna sin errores (el cast estricto ya no ve texto)
+    silver = transform_silver(silver_path=os.path.join(str(base_path), "data", "silver"), bronze_path=bronze_path)
+    assert silver.height == rows.unique(["track_id", "genre"]).height - 1
+
+
+def test_quoted_newlines_survive_block_cuts(csv_dir, base_path, monkeypatch):
+    rows = spotify_rows(600).with_columns(
+        pl.when(pl.int_range(pl.len()) % 7 == 0)
+          .then(pl.col("track_name") + pl.lit('\n"live",\nremaster'))
+          .otherwise("track_name")
+          .alias("track_name")
+    )
+    csv_file = write_csv(csv_dir / "SpotifyFeatures.csv", rows)
+    # Bloques chicos: varios cortes caen dentro de un campo entre comillas
+    monkeypatch.setattr(bronze, "BRONZE_BLOCK_BYTES", 997)
+    monkeypatch.setattr(bronze, "BRONZE_SAMPLE_BYTES", 1_501)
+
+    df = load_bronze(csv_file, os.path.join(str(base_path), "data", "bronze"), dataset=DATASET)
+    assert load_manifest(os.path.join(str(base_path), "data", "bronze"))["SpotifyFeatures.csv"]["rejected"] == 0
+    assert df.get_column("track_name").to_list() == rows.get_column("track_name").to_list()
+
+
+@pytest.mark.parametrize("kind,eager", [("local", True), ("local", False), ("mirror", True)])
+def test_same_named_shards_keep_their_own_manifest_entry(csv_dir, base_path, kind, eager):
+    shards = {"a/part.csv": spotify_rows(1_500), "b/part.csv": spotify_rows(1_000, start=1_500, seed=3)}
+    for name, df in shards.items():
+        write_csv(csv_dir / name, df)
+    bronze_path = os.path.join(str(base_path), "data", "bronze")
+
+    def run():
+        run_pipeline(eager=eager, base_path=str(base_path), source=f"{kind}:{csv_dir}")
+        return load_manifest(bronze_path)
+
+    manifest = run()
+    assert sorted(manifest) == sorted(shards)
+    assert all(len(entry["parts"]) == 1 for entry in manifest.values())
+    expected = pl.concat(shards.values()).unique(["track_id", "genre"]).height
+    assert read_silver(base_path).height == expected
+
+    # Sin cambios no se reingiere ningún shard; al cambiar uno, solo ese
+    assert run() == manifest
+    shards["a/part.csv"] = shards["a/part.csv"].head(1_200)
+    write_csv(csv_dir / "a" / "part.csv", shards["a/part.csv"])
+    manifest = run()
+    assert {name: len(entry["parts"]) for name, entry in manifest.items()} == {"a/part.csv": 2, "b/part.csv": 1}
+
+
+def test_identical_shards_get_their_own_part(csv_dir, base_path):
+    rows = spotify_rows(1_500)
+    files = [write_csv(csv_dir / name / "part.csv", rows) for name in ("a", "b")]
+    bronze_path = os.path.join(str(base_path), "data", "bronze")
+    silver_path = os.path.join(str(base_path), "data", "silver")
+
+    report = ingest_bronze_parallel(files, bronze_path, dataset=DATASET, max_workers=2, root=str(csv_dir))
+    assert report["failed"] == [] and len(set(report["ingested"])) == 2
+    assert report["duplicates"] == [{"file": files[1], "same_as": "a/part.csv"}]
+    manifest = load_manifest(bronze_path)
+    assert sorted(manifest) == ["a/part.csv", "b/part.csv"]
+    assert manifest["a/part.csv"]["parts"] != manifest["b/part.csv"]["parts"]
+    transform_silver(silver_path=silver_path, bronze_path=bronze_path)
+    assert read_silver(base_path).height == rows.unique(["track_id", "genre"]).height
+
+    # Sin cambios ninguno se reingiere; si a pierde filas, b las sigue aportando a Silver
+    report = ingest_bronze_parallel(files, bronze_path, dataset=DATASET, max_workers=2, root=str(csv_dir))
+    assert sorted(report["skipped"]) == files and report["duplicates"] == []
+    write_csv(files[0], rows.head(500))
+    ingest_bronze_parallel(files, bronze_path, dataset=DATASET, max_workers=2, root=str(csv_dir))
+    transform_silver(silver_path=silver_path, bronze_path=bronze_path)
+    assert read_silver(base_path).height == rows.unique(["track_id", "genre"]).height
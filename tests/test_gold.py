@@ -0,0 +1,107 @@
+import os
+
+import polars as pl
+
+from conftest import SILVER_TABLE, assert_frames_close, spotify_rows, write_csv
+from medallion.bronze import load_bronze
+from medallion.gold import (
+    GOLD_DENSITY,
+    GOLD_INSTRUMENTAL_THRESHOLD,
+    GOLD_SAMPLES,
+    GOLD_SPECS,
+    GOLD_STATE_DIR,
+    GOLD_STATES,
+    aggregate_gold,
+    gold_ipc_file,
+    gold_read_file,
+    load_gold_sketches,
+)
+from medallion.silver import transform_silver
+from medallion.sketches import SKETCH_HISTOGRAMS
+
+
+def run_batch(csv_file: str, base_path) -> dict:
+    data = os.path.join(str(base_path), "data")
+    load_bronze(csv_file, os.path.join(data, "bronze"), dataset="SpotifyFeatures_bronze")
+    transform_silver(silver_path=os.path.join(data, "silver"), bronze_path=os.path.join(data, "bronze"))
+    return aggregate_gold(os.path.join(data, "silver", SILVER_TABLE), os.path.join(data, "gold"))
+
+
+def assert_gold_equal(gold_path: str, expected_path: str) -> None:
+    """Compara estados, tablas, muestras, grillas y sketches de dos carpetas Gold."""
+    for name, spec in GOLD_STATES.items():
+        state = os.path.join(GOLD_STATE_DIR, f"{name}.parquet")
+        assert_frames_close(pl.read_parquet(os.path.join(gold_path, state)),
+                            pl.read_parquet(os.path.join(expected_path, state)), sort_by=spec["key"])
+    for file_name in [*GOLD_SPECS, *GOLD_SAMPLES, *GOLD_DENSITY]:
+        assert_frames_close(pl.read_parquet(os.path.join(gold_path, file_name)),
+                            pl.read_parquet(os.path.join(expected_path, file_name)))
+
+    sketches, expected = load_gold_sketches(gold_path), load_gold_sketches(expected_path)
+    exact = ["genre", "count", "hll", "cms", *(f"hist_{col}" for col in SKETCH_HISTOGRAMS)]
+    assert sketches.select(exact).equals(expected.select(exact))
+
+
+def test_incremental_gold_matches_full_recompute(csv_dir, base_path, tmp_path):
+    first = spotify_rows(6_000)
+    csv_file = write_csv(csv_dir / "SpotifyFeatures.csv", first)
+    assert run_batch(csv_file, base_path)["mode"] == "full"
+
+    # Segunda versión del CSV: filas con otros valores (upsert), filas eliminadas y tracks nuevos
+    changed = first.head(1_500).with_columns(pl.col("popularity") // 2, pl.col("energy") / 3)
+    second = pl.concat([changed, first.slice(1_500, 3_500), spotify_rows(2_000, start=6_000)])
+    write_csv(csv_dir / "SpotifyFeatures.csv", second)
+    assert run_batch(csv_file, base_path)["mode"] == "incremental"
+
+    gold_path = os.path.join(str(base_path), "data", "gold")
+    full_path = str(tmp_path / "gold_full")
+    summary = aggregate_gold(os.path.join(str(base_path), "data", "silver", SILVER_TABLE), full_path, full=True)
+    assert summary["mode"] == "full"
+    assert_gold_equal(gold_path, full_path)
+
+
+def test_gold_skips_when_silver_has_no_new_batches(csv_dir, base_path):
+    csv_file = write_csv(csv_dir / "SpotifyFeatures.csv", spotify_rows(2_000))
+    run_batch(csv_file, base_path)
+    assert run_batch(csv_file, base_path)["mode"] == "skipped"
+
+
+def expected_instrumental(df: pl.DataFrame) -> pl.DataFrame:
+    return (
+        df.unique(["track_id", "genre"], keep="last")
+          .group_by(pl.col("genre").str.to_titlecase())
+          .agg((pl.col("instrumentalness") > GOLD_INSTRUMENTAL_THRESHOLD).sum().alias("instrumental_count"))
+          .sort("genre")
+    )
+
+
+def test_instrumental_count_skips_missing_values(csv_dir, base_path):
+    rows = spotify_rows(3_000).with_columns(
+        # Los valores faltantes llegan a Silver como NaN y no deben contarse como instrumentales
+        pl.when(pl.int_range(pl.len()) % 50 == 0).then(None).otherwise(pl.col("instrumentalness")).alias("instrumentalness")
+    )
+    csv_file = write_csv(csv_dir / "SpotifyFeatures.csv", rows)
+    run_batch(csv_file, base_path)
+    gold_file = os.path.join(str(base_path), "data", "gold", "genre_instrumental.parquet")
+    assert_frames_close(pl.read_parquet(gold_file), expected_instrumental(rows))
+
+    # Incremental: tracks que pasan a no tener dato (retracción de una fila contada)
+    changed = rows.with_columns(
+        pl.when(pl.int_range(pl.len()) < 300).then(None).otherwise(pl.col("instrumentalness")).alias("instrumentalness")
+    )
+    write_csv(csv_dir / "SpotifyFeatures.csv", changed)
+    assert run_batch(csv_file, base_path)["mode"] == "incremental"
+    assert_frames_close(pl.read_parquet(gold_file), expected_instrumental(changed))
+
+
+def test_stale_ipc_copy_is_not_read(csv_dir, base_path):
+    csv_file = write_csv(csv_dir / "SpotifyFeatures.csv", spotify_rows(2_000))
+    run_batch(csv_file, base_path)
+    gold_path = os.path.join(str(base_path), "data", "gold")
+    ipc = gold_ipc_file(gold_path, "genre_popularity.parquet")
+    assert gold_read_file(gold_path, "genre_popularity.parquet") == ipc
+
+    # Un Parquet reescrito después de su copia (p. ej. una ejecución cortada) se lee directamente
+    parquet = os.path.join(gold_path, "genre_popularity.parquet")
+    os.utime(ipc, ns=(os.stat(parquet).st_mtime_ns - 10**9,) * 2)
+    assert gold_read_file(gold_path, "genre_popularity.parquet") == parquet
@@ -0,0 +1,44 @@
+import glob
+import json
+import os
+
+import prometheus_client
+
+from conftest import spotify_rows, write_csv
+from medallion.pipeline import run_pipeline
+
+
+def last_report(base_path) -> dict:
+    reports = sorted(glob.glob(os.path.join(str(base_path), "data", "metrics", "run-*.json")))
+    with open(reports[-1], encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_cached_stages_are_reported(csv_dir, base_path):
+    csv_file = write_csv(csv_dir / "SpotifyFeatures.csv", spotify_rows(2_000))
+    run_pipeline(base_path=str(base_path), csv_files=[csv_file])
+    stages = {record["stage"] for record in last_report(base_path)["stages"]}
+
+    # Sin cambios, todas las etapas cacheadas siguen en el reporte y en el .prom
+    run_pipeline(base_path=str(base_path), csv_files=[csv_file])
+    report = last_report(base_path)
+    assert {record["stage"] for record in report["stages"]} == stages
+    status = {record["stage"]: record["status"] for record in report["stages"]}
+    assert status["extract_load_bronze"] == "ok"
+    assert {status[stage] for stage in stages - {"extract_load_bronze"}} == {"cached"}
+
+    with open(os.path.join(str(base_path), "data", "metrics", "spotify_etl.prom"), encoding="utf-8") as f:
+        prom = f.read()
+    assert 'spotify_etl_stage_success{stage="aggregate_gold_genre"} 1.0' in prom
+    assert 'spotify_etl_stage_cached{stage="aggregate_gold_genre"} 1.0' in prom
+    assert f'run_id="{report["run_id"]}"' in prom
+
+
+def test_pushgateway_group_is_stable_across_runs(csv_dir, base_path, monkeypatch):
+    pushes = []
+    monkeypatch.setattr(prometheus_client, "push_to_gateway",
+                        lambda gateway, job, registry, grouping_key=None: pushes.append((job, grouping_key)))
+    csv_file = write_csv(csv_dir / "SpotifyFeatures.csv", spotify_rows(1_000))
+    for _ in range(2):
+        run_pipeline(base_path=str(base_path), csv_files=[csv_file], pushgateway="localhost:9091")
+    assert pushes == [("spotify_medallion", {"mode": "eager"})] * 2